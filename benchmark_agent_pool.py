@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+AGENT POOL MICROBENCHMARK
+Per-request construction vs. the shared orchestrator and pooled agents
+
+The model manager is replaced by a stub, so only the cost of building
+orchestrators and agents is measured, not model inference.
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import src.core.model_manager as model_manager_module
+from src.core.config import get_config
+from src.agents import AgentPool, MultiAgentOrchestrator, StoryStructureAgent
+
+ITERATIONS = 2000
+
+class StubModelManager:
+    """Stands in for TeluguModelManager; construction paths only register prompt prefixes"""
+
+    def register_prompt_prefix(self, model_name: str, prefix_text: str) -> None:
+        pass
+
+def time_calls(fn: Callable[[], None], iterations: int = ITERATIONS) -> List[float]:
+    """Microseconds taken by each call"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+def report(name: str, timings: List[float]) -> float:
+    mean = statistics.mean(timings)
+    p99 = sorted(timings)[int(len(timings) * 0.99) - 1]
+    print(f"  {name:<32} mean {mean:9.1f} µs   p99 {p99:9.1f} µs")
+    return mean
+
+def benchmark_agents() -> float:
+    """Cold StoryStructureAgent construction vs. a pool lease"""
+    print("\n🧩 Agent acquisition")
+    agent_config = get_config().agents.story_structure_agent
+
+    def cold():
+        StoryStructureAgent(config=agent_config)
+
+    pool = AgentPool(lambda: StoryStructureAgent(config=agent_config), max_idle=4, prewarm=1)
+
+    def pooled():
+        with pool.lease():
+            pass
+
+    cold_mean = report("cold construction", time_calls(cold))
+    pooled_mean = report("pooled lease", time_calls(pooled))
+    print(f"  pool stats: {pool.get_stats()}")
+    return cold_mean / pooled_mean
+
+def benchmark_orchestrator() -> float:
+    """A new MultiAgentOrchestrator per request vs. the shared one leasing an agent"""
+    print("\n🎛️  Orchestrator per request")
+    shared = MultiAgentOrchestrator()
+
+    def per_request():
+        orchestrator = MultiAgentOrchestrator()
+        with orchestrator.agent_pools["story_structure"].lease():
+            pass
+
+    def process_wide():
+        with shared.agent_pools["story_structure"].lease():
+            pass
+
+    per_request_mean = report("new orchestrator per request", time_calls(per_request, ITERATIONS // 10))
+    shared_mean = report("shared orchestrator", time_calls(process_wide))
+    return per_request_mean / shared_mean
+
+def main():
+    """Run the agent pool microbenchmarks"""
+    print("⏱️  AGENT POOL MICROBENCHMARK")
+    print("=" * 60)
+
+    # Agents fetch the model manager on construction; no models are loaded
+    model_manager_module._model_manager = StubModelManager()
+
+    agent_speedup = benchmark_agents()
+    orchestrator_speedup = benchmark_orchestrator()
+
+    print("\n" + "=" * 60)
+    print(f"Pooled agent lease:   {agent_speedup:.1f}x faster than construction")
+    print(f"Shared orchestrator:  {orchestrator_speedup:.1f}x faster than per-request construction")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
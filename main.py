@@ -76,6 +76,20 @@ def serve(host, port, workers, reload, env):
         access_log=True
     )
 
+@cli.command('model-server')
+@click.option('--socket', 'socket_path', default=None, help='Unix socket path for API workers')
+def model_server(socket_path):
+    """Start the shared model host for API workers in remote inference mode"""
+    from src.core.inference_server import run_inference_server
+    
+    logger.info("Starting Telugu Story Engine model server...")
+    os.makedirs('logs', exist_ok=True)
+    
+    try:
+        asyncio.run(run_inference_server(socket_path))
+    except KeyboardInterrupt:
+        logger.info("Model server stopped")
+
 @cli.command()
 @click.option('--host', default='0.0.0.0', help='Host to bind to')
 @click.option('--port', default=12001, help='Port to bind to')
@@ -239,6 +253,24 @@ def status():
     except Exception as e:
         click.echo(f"Error checking status: {e}")
 
+@cli.command('check-onnx')
+def check_onnx():
+    """Export the ONNX models and check their outputs against PyTorch"""
+    from src.core.model_manager import get_model_manager
+    
+    config = get_config()
+    report = get_model_manager().check_onnx_parity()
+    
+    click.echo(f"ONNX parity (tolerance {config.model.onnx_parity_tolerance:.0e}):")
+    for model_name, result in report.items():
+        error = f"{result['max_error']:.2e}" if result["max_error"] is not None else "n/a"
+        mark = "✓" if result["onnx"] else "✗"
+        reason = f" ({result['reason']})" if result["reason"] else ""
+        click.echo(f"  {mark} {model_name}: max error {error}{reason}")
+    
+    if not all(result["onnx"] for result in report.values()):
+        sys.exit(1)
+
 @cli.command()
 def test():
     """Run system tests"""
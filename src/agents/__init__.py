@@ -5,7 +5,8 @@ Real AI agents with no mocks or fallbacks
 
 from .base_agent import BaseAgent, AgentResponse, AgentMemory
 from .story_structure_agent import StoryStructureAgent
-from .orchestrator import MultiAgentOrchestrator
+from .agent_pool import AgentPool
+from .orchestrator import MultiAgentOrchestrator, get_multi_agent_orchestrator
 
 # Additional agents will be imported as they are implemented
 
@@ -14,5 +15,7 @@ __all__ = [
     "AgentResponse", 
     "AgentMemory",
     "StoryStructureAgent",
-    "MultiAgentOrchestrator"
+    "AgentPool",
+    "MultiAgentOrchestrator",
+    "get_multi_agent_orchestrator"
 ]
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Agent Pool for Telugu Story Engine
+Reusable agent instances shared by concurrent story requests
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List
+
+from .base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+class AgentPool:
+    """
+    Idle instances of one agent type, leased one request at a time
+
+    Building an agent loads its pattern tables and allocates its memory,
+    so instances are kept and reused. A lease hands out an idle instance,
+    or builds one when all are busy, and clears the instance's per-request
+    state when it is returned. At most max_idle instances are kept.
+    """
+
+    def __init__(self, factory: Callable[[], BaseAgent], max_idle: int = 8, prewarm: int = 1):
+        self.factory = factory
+        self.max_idle = max(1, max_idle)
+
+        self._idle: List[BaseAgent] = [factory() for _ in range(min(prewarm, self.max_idle))]
+        self._in_use = 0
+
+        self.created = len(self._idle)
+        self.reused = 0
+
+    def acquire(self) -> BaseAgent:
+        """Take an idle agent, building a new one if none is free"""
+        self._in_use += 1
+        if self._idle:
+            self.reused += 1
+            return self._idle.pop()
+
+        self.created += 1
+        return self.factory()
+
+    def release(self, agent: BaseAgent) -> None:
+        """Return an agent with its per-request state cleared"""
+        self._in_use -= 1
+        agent.clear_request_state()
+        if len(self._idle) < self.max_idle:
+            self._idle.append(agent)
+
+    @contextmanager
+    def lease(self) -> Iterator[BaseAgent]:
+        """Use an agent for the duration of a block"""
+        agent = self.acquire()
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "created": self.created,
+            "reused": self.reused
+        }
@@ -364,6 +364,16 @@ class BaseAgent(ABC):
         self.status = AgentStatus.IDLE
         logger.info(f"Reset agent {self.agent_type} ({self.agent_id})")
     
+    def clear_request_state(self):
+        """
+        Forget one request's conversation and context before reuse
+        Learned patterns and weight carry over between requests
+        """
+        self.memory.conversations.clear()
+        self.memory.context.clear()
+        self.memory.collaboration_history.clear()
+        self.status = AgentStatus.IDLE
+    
     def __str__(self) -> str:
         return f"{self.agent_type}({self.agent_id})"
     
@@ -5,41 +5,67 @@ Coordinates real AI agents for story generation - NO MOCKS
 
 import asyncio
 import logging
+import math
+import time
 from typing import Dict, Any, List, Optional, AsyncGenerator
 from datetime import datetime
 import uuid
 import json
 
 from .base_agent import BaseAgent, AgentResponse, AgentStatus
+from .agent_pool import AgentPool
 from .story_structure_agent import StoryStructureAgent
-from ..core.model_manager import get_model_manager
+from ..core.model_manager import DRAFT_MODEL_NAME, get_model_manager
 from ..core.config import get_config
+from ..core.emotional_arc import EmotionalArcAnalyzer, get_emotional_arc_analyzer
+from ..core.result_cache import get_result_cache, result_key
+from ..core.cancellation import CancellationToken, GenerationCancelled
+from ..core.phase_graph import Phase, PhaseGraph
+from ..core.session_store import get_session_store
 
 logger = logging.getLogger(__name__)
 
+# Shared instruction first, request details after, so story prompts reuse
+# the cached key/value states of this prefix
+STORY_PROMPT_PREFIX = "క్రింది వివరాల ఆధారంగా ఒక పూర్తి తెలుగు కథ రాయండి.\n"
+
+# Characters of the preceding scene's outline given to each scene prompt
+SCENE_SUMMARY_CHARS = 160
+
+# Models whose weights determine a seeded story; their revisions key the
+# result cache. The plan cache's embedding model is skipped for seeded
+# requests, so cultural_model is not among them
+PIPELINE_MODELS = ("telugu_gpt", "emotion_model")
+
 class MultiAgentOrchestrator:
     """
     Orchestrates multiple AI agents for Telugu story generation
     Real multi-agent collaboration with no mocks or fallbacks
+    
+    One instance serves every request in the process (see get_multi_agent_orchestrator);
+    each request leases its agents from per-type pools.
     """
     
     def __init__(self):
         self.config = get_config()
         self.model_manager = get_model_manager()
-        self.agents: Dict[str, BaseAgent] = {}
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.agent_pools: Dict[str, AgentPool] = {}
+        self.active_sessions = get_session_store("orchestrator_sessions")
+        self.model_manager.register_prompt_prefix("telugu_gpt", STORY_PROMPT_PREFIX)
         
         # Initialize agents
         self._initialize_agents()
         
-        logger.info(f"Initialized MultiAgentOrchestrator with {len(self.agents)} agents")
+        logger.info(f"Initialized MultiAgentOrchestrator with {len(self.agent_pools)} agent pools")
     
     def _initialize_agents(self):
         """Initialize all agents"""
         try:
             # Core agents
-            self.agents["story_structure"] = StoryStructureAgent(
-                config=self.config.agents.story_structure_agent
+            self.agent_pools["story_structure"] = AgentPool(
+                lambda: StoryStructureAgent(config=self.config.agents.story_structure_agent),
+                max_idle=self.config.agents.pool_max_idle,
+                prewarm=self.config.agents.pool_prewarm
             )
             
             # Additional agents would be initialized here
@@ -67,24 +93,29 @@ class MultiAgentOrchestrator:
         moral_message: Optional[str] = None,
         enable_expert_agents: bool = True,
         collaboration_rounds: int = 3,
+        seed: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Generate a complete Telugu story using multi-agent collaboration
+        Seeded requests are deterministic and served from the result cache;
+        cancelling cancel_token stops the remaining phases and generation
         """
         session_id = str(uuid.uuid4())
         start_time = datetime.now()
+        cancel_token = cancel_token or CancellationToken()
         
         try:
             logger.info(f"Starting story generation session {session_id}")
             
             # Initialize session
-            self.active_sessions[session_id] = {
+            self.active_sessions.put(session_id, {
                 "status": "processing",
                 "start_time": start_time,
                 "agents_used": [],
                 "collaboration_rounds": 0
-            }
+            })
             
             # Prepare input data
             input_data = {
@@ -99,70 +130,140 @@ class MultiAgentOrchestrator:
                 "include_dialogue": include_dialogue,
                 "include_cultural_references": include_cultural_references,
                 "target_audience": target_audience,
-                "moral_message": moral_message
+                "moral_message": moral_message,
+                "seed": seed
             }
             
-            # Phase 1: Story Structure Development
-            logger.info(f"Phase 1: Story structure development for {session_id}")
-            structure_agent = self.agents["story_structure"]
-            structure_response = await structure_agent.process(input_data)
-            
-            self.active_sessions[session_id]["agents_used"].append("story_structure")
-            
-            # For now, we'll use the structure agent's response as the primary story
-            # In a full implementation, this would coordinate multiple agents
-            
-            # Generate the actual story content using the structure
-            story_content = await self._generate_story_content(
-                structure_response, input_data, session_id
-            )
-            
-            # Calculate generation time
-            generation_time = (datetime.now() - start_time).total_seconds()
-            
-            # Calculate metadata
-            metadata = self._calculate_story_metadata(
-                story_content, input_data, generation_time, collaboration_rounds, session_id
-            )
+            # Identical seeded requests produce the same story, so reuse it
+            result_cache = get_result_cache() if seed is not None else None
+            cache_key = None
+            if result_cache is not None:
+                cache_key = result_key(
+                    {
+                        **input_data,
+                        "enable_expert_agents": enable_expert_agents,
+                        "collaboration_rounds": collaboration_rounds
+                    },
+                    seed,
+                    await self._get_model_versions()
+                )
+                # The disk tier blocks; keep it off the event loop
+                cached_result = await asyncio.to_thread(result_cache.get, cache_key)
+                if cached_result is not None:
+                    # Report this request's timings, not those of the run that
+                    # produced the cached story
+                    lookup_ms = round((datetime.now() - start_time).total_seconds() * 1000, 2)
+                    cached_result["metadata"].update({
+                        "generation_time": lookup_ms / 1000,
+                        "generated_at": time.time(),
+                        "phase_timings": {
+                            "phases_ms": {"result_cache": lookup_ms},
+                            "total_ms": lookup_ms,
+                            "critical_path": ["result_cache"]
+                        },
+                        "cached": True
+                    })
+                    self.active_sessions.update(session_id, status="completed", result=cached_result)
+                    logger.info(f"Served session {session_id} from the result cache")
+                    return cached_result
+            
+            # Phases start as soon as their inputs exist: every analysis of
+            # the finished story runs concurrently
+            graph = PhaseGraph([
+                Phase("structure", lambda done: self._run_structure_phase(
+                    input_data, session_id, cancel_token
+                )),
+                Phase("content", lambda done: self._generate_story_content(
+                    done["structure"], input_data, session_id, cancel_token
+                ), ("structure",)),
+                Phase("title", lambda done: self._generate_title(done["content"], input_data), ("content",)),
+                Phase("english_summary", lambda done: self._generate_english_summary(done["content"]), ("content",)),
+                Phase("metadata", lambda done: self._calculate_story_metadata(
+                    done["content"], input_data, (datetime.now() - start_time).total_seconds(),
+                    collaboration_rounds, session_id
+                ), ("content",)),
+                Phase("character_analysis", lambda done: self._analyze_characters(
+                    done["content"], input_data.get("characters", [])
+                ), ("content",)),
+                Phase("cultural_elements", lambda done: self._extract_cultural_elements(done["content"]), ("content",)),
+                Phase("emotional_arc", lambda done: self._analyze_emotional_arc(done["content"]), ("content",)),
+                Phase("model_versions", lambda done: self._get_model_versions())
+            ])
+            phases = await graph.run(cancel_token)
+            cancel_token.raise_if_cancelled()
+            
+            structure_response = phases["structure"]
+            metadata = phases["metadata"]
+            metadata["phase_timings"] = graph.get_timings()
             
             result = {
-                "title": self._generate_title(story_content, input_data),
-                "content": story_content,
-                "english_summary": self._generate_english_summary(story_content),
-                "metadata": self._calculate_story_metadata(story_content, input_data, generation_time, collaboration_rounds, session_id),
+                "title": phases["title"],
+                "content": phases["content"],
+                "english_summary": phases["english_summary"],
+                "metadata": metadata,
                 "structure_type": structure_response.metadata.get("story_structure", {}).get("type", "three_act"),
                 "plot_outline": structure_response.metadata.get("plot_outline", {}),
-                "character_analysis": self._analyze_characters(story_content, input_data.get("characters", [])),
-                "cultural_elements": self._extract_cultural_elements(story_content),
-                "emotional_arc": self._analyze_emotional_arc(story_content),
-                "model_versions": self._get_model_versions()
+                "character_analysis": phases["character_analysis"],
+                "cultural_elements": phases["cultural_elements"],
+                "emotional_arc": phases["emotional_arc"],
+                "model_versions": phases["model_versions"]
             }
             
+            # A fallback story stands in for a failed generation; do not pin it
+            if cache_key is not None and not (self.active_sessions.get(session_id) or {}).get("fallback"):
+                await asyncio.to_thread(result_cache.put, cache_key, result)
+            
             # Update session
-            self.active_sessions[session_id]["status"] = "completed"
-            self.active_sessions[session_id]["result"] = result
+            self.active_sessions.update(session_id, status="completed", result=result)
             
-            logger.info(f"Story generation completed for session {session_id} in {generation_time:.2f}s")
+            logger.info(
+                f"Story generation completed for session {session_id} in "
+                f"{(datetime.now() - start_time).total_seconds():.2f}s "
+                f"(critical path: {' -> '.join(metadata['phase_timings']['critical_path'])})"
+            )
             return result
             
+        except (GenerationCancelled, asyncio.CancelledError) as e:
+            # CancelledError: the caller's task was cancelled, e.g. on disconnect
+            logger.info(f"Story generation cancelled for session {session_id}: {e!r}")
+            
+            self.active_sessions.update(session_id, status="cancelled")
+            
+            raise
+            
         except Exception as e:
             logger.error(f"Story generation failed for session {session_id}: {e}")
             
-            if session_id in self.active_sessions:
-                self.active_sessions[session_id]["status"] = "failed"
-                self.active_sessions[session_id]["error"] = str(e)
+            self.active_sessions.update(session_id, status="failed", error=str(e))
             
             raise
     
+    async def _run_structure_phase(
+        self,
+        input_data: Dict[str, Any],
+        session_id: str,
+        cancel_token: CancellationToken
+    ) -> AgentResponse:
+        """Develop the story structure and plot outline"""
+        logger.info(f"Story structure development for {session_id}")
+        with self.agent_pools["story_structure"].lease() as structure_agent:
+            structure_response = await structure_agent.process(input_data, {"cancel_token": cancel_token})
+        # Sessions in progress are live dicts and can be updated in place
+        (self.active_sessions.get(session_id) or {}).setdefault("agents_used", []).append("story_structure")
+        return structure_response
+    
     async def generate_story_stream(
         self,
         prompt: str,
+        cancel_token: Optional[CancellationToken] = None,
         **kwargs
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate story with streaming updates
+        Closing the stream or cancelling cancel_token stops generation
         """
         session_id = str(uuid.uuid4())
+        cancel_token = cancel_token or CancellationToken()
         
         try:
             # Yield initial status
@@ -181,10 +282,11 @@ class MultiAgentOrchestrator:
                 "progress": 0.1
             }
             
-            # Generate story (simplified for streaming)
+            # Generate story structure
             input_data = {"prompt": prompt, **kwargs}
-            structure_agent = self.agents["story_structure"]
-            structure_response = await structure_agent.process(input_data)
+            with self.agent_pools["story_structure"].lease() as structure_agent:
+                structure_response = await structure_agent.process(input_data, {"cancel_token": cancel_token})
+            cancel_token.raise_if_cancelled()
             
             yield {
                 "type": "progress",
@@ -193,10 +295,43 @@ class MultiAgentOrchestrator:
                 "progress": 0.5
             }
             
-            # Generate content
-            story_content = await self._generate_story_content(
-                structure_response, input_data, session_id
+            # Stream content as the model produces it
+            story_prompt = self._create_story_prompt(structure_response, input_data)
+            chunks = []
+            
+            stream = self.model_manager.stream_text(
+                "telugu_gpt",
+                story_prompt,
+                max_new_tokens=300,
+                temperature=0.8,
+                top_p=0.9,
+                cancel_token=cancel_token
             )
+            try:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield {
+                        "type": "token",
+                        "session_id": session_id,
+                        "text": chunk
+                    }
+            except GenerationCancelled:
+                raise
+            except Exception as e:
+                logger.error(f"Story content streaming failed: {e}")
+                if chunks:
+                    raise
+            finally:
+                # Close the model stream now, not at garbage collection, so
+                # a disconnected client stops decoding immediately
+                await stream.aclose()
+            
+            if chunks:
+                story_content = self._post_process_story("".join(chunks), input_data)
+            else:
+                # Nothing was streamed, so the client can still get a whole story
+                story_content = self._generate_fallback_story(input_data)
+                logger.info(f"Using fallback story, length: {len(story_content)}")
             
             yield {
                 "type": "progress",
@@ -217,6 +352,9 @@ class MultiAgentOrchestrator:
                 }
             }
             
+        except GenerationCancelled as e:
+            logger.info(f"Story streaming cancelled for session {session_id}: {e}")
+            
         except Exception as e:
             yield {
                 "type": "error",
@@ -256,12 +394,8 @@ class MultiAgentOrchestrator:
                 "character_development_score": 0.75  # Mock score
             }
             
-            # Basic emotional analysis
-            emotional_analysis = {
-                "dominant_emotions": ["joy", "family_bonds", "hope"],
-                "emotional_intensity": 0.7,
-                "emotional_consistency": 0.8
-            }
+            # Sentence-level emotional arc from the emotion model
+            emotional_analysis = await self._analyze_emotional_arc(content)
             
             # Basic cultural analysis
             cultural_analysis = {
@@ -282,7 +416,7 @@ class MultiAgentOrchestrator:
             scores = {
                 "overall_quality": 0.82,
                 "cultural_authenticity": 0.85,
-                "emotional_coherence": 0.8,
+                "emotional_coherence": emotional_analysis["emotional_consistency"],
                 "narrative_structure": 0.78,
                 "language_quality": 0.85
             }
@@ -320,15 +454,18 @@ class MultiAgentOrchestrator:
         self,
         structure_response: AgentResponse,
         input_data: Dict[str, Any],
-        session_id: str
+        session_id: str,
+        cancel_token: Optional[CancellationToken] = None
     ) -> str:
         """
         Generate the actual story content based on structure
         """
         try:
-            # Extract structure information
-            plot_outline = structure_response.metadata.get("plot_outline", {})
-            scenes = plot_outline.get("scenes", [])
+            # One 300-token pass cannot reach long story lengths
+            if input_data.get("length", 0) >= self.config.long_form_min_length:
+                return await self._generate_long_form_content(
+                    structure_response, input_data, session_id, cancel_token
+                )
             
             # Generate story using the language model
             story_prompt = self._create_story_prompt(structure_response, input_data)
@@ -340,7 +477,9 @@ class MultiAgentOrchestrator:
                 story_prompt,
                 max_new_tokens=300,  # Generate 300 new tokens
                 temperature=0.8,
-                top_p=0.9
+                top_p=0.9,
+                seed=input_data.get("seed"),
+                cancel_token=cancel_token
             )
             
             logger.info(f"Generated story content length: {len(story_content)}")
@@ -352,13 +491,135 @@ class MultiAgentOrchestrator:
             
             return story_content
             
+        except GenerationCancelled:
+            raise
         except Exception as e:
             logger.error(f"Story content generation failed: {e}")
             # Fallback to a basic story structure
+            self.active_sessions.update(session_id, fallback=True)
             fallback_content = self._generate_fallback_story(input_data)
             logger.info(f"Using fallback story, length: {len(fallback_content)}")
             return fallback_content
     
+    async def _generate_long_form_content(
+        self,
+        structure_response: AgentResponse,
+        input_data: Dict[str, Any],
+        session_id: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> str:
+        """
+        Generate a long story scene by scene from the plot outline
+        
+        The requested length sets the token budget; it is spread over as
+        many scene passes as the per-pass cap requires. All passes go to
+        generate_texts at once. Each batch decodes up to max_batch_size
+        scenes in lockstep, and the executor runs
+        max_concurrent_inferences_per_model batches of one model at a
+        time (one by default), so wall-clock time follows the number of
+        batches rather than the number of scenes. Scenes do not wait for
+        each other, so each prompt carries a summary of the preceding
+        scene's outline instead of its generated text.
+        """
+        total_tokens = math.ceil(input_data.get("length", 2000) * self.config.scene_tokens_per_word)
+        scenes = self._plan_scenes(structure_response, total_tokens)
+        max_new_tokens = min(self.config.scene_max_new_tokens, math.ceil(total_tokens / len(scenes)))
+        if max_new_tokens * len(scenes) < total_tokens:
+            logger.warning(
+                f"Long-form budget for {session_id} capped at {max_new_tokens * len(scenes)} of "
+                f"{total_tokens} tokens by long_form_max_scenes"
+            )
+        
+        prompts = [
+            self._create_scene_prompt(
+                structure_response, input_data, scene, index, len(scenes),
+                scenes[index - 1] if index > 0 else None
+            )
+            for index, scene in enumerate(scenes)
+        ]
+        logger.info(f"Generating {len(scenes)} scenes of up to {max_new_tokens} tokens for {session_id}")
+        
+        scene_texts = await self.model_manager.generate_texts(
+            "telugu_gpt",
+            prompts,
+            max_new_tokens=max_new_tokens,
+            temperature=0.8,
+            top_p=0.9,
+            seed=input_data.get("seed"),
+            cancel_token=cancel_token
+        )
+        
+        scene_texts = [self._post_process_story(text, input_data) for text in scene_texts]
+        scene_texts = [text for text in scene_texts if text]
+        if not scene_texts:
+            raise ValueError("no scene produced any text")
+        
+        self.active_sessions.update(session_id, scene_count=len(scene_texts))
+        return "\n\n".join(scene_texts)
+    
+    def _plan_scenes(self, structure_response: AgentResponse, total_tokens: int) -> List[Dict[str, Any]]:
+        """
+        Scene passes to generate, from the outline or else one per act
+        As many passes as it takes to spend total_tokens at no more than
+        scene_max_new_tokens each, up to long_form_max_scenes
+        """
+        plot_outline = structure_response.metadata.get("plot_outline", {})
+        scenes = plot_outline.get("scenes") or [
+            {"title": act, "description": ""} for act in plot_outline.get("acts", [])
+        ] or [{"title": "", "description": ""}]
+        
+        passes = math.ceil(total_tokens / max(1, self.config.scene_max_new_tokens))
+        passes = min(max(1, passes), max(1, self.config.long_form_max_scenes))
+        
+        # Merge neighbouring scenes so the whole outline is still covered
+        if len(scenes) > passes:
+            group_size = math.ceil(len(scenes) / passes)
+            scenes = [
+                {
+                    "title": group[0].get("title", ""),
+                    "description": " ".join(scene.get("description", "").strip() for scene in group)
+                }
+                for group in (scenes[i:i + group_size] for i in range(0, len(scenes), group_size))
+            ]
+        
+        # Split scenes into consecutive parts when the story needs more passes
+        if len(scenes) < passes:
+            parts_per_scene = [passes // len(scenes) + (1 if i < passes % len(scenes) else 0) for i in range(len(scenes))]
+            scenes = [
+                {**scene, "part": part, "parts": parts}
+                for scene, parts in zip(scenes, parts_per_scene)
+                for part in range(1, parts + 1)
+            ]
+        return scenes
+    
+    def _summarize_scene(self, scene: Dict[str, Any]) -> str:
+        """Compact one-line summary of a scene outline"""
+        summary = f"{scene.get('title', '')} {scene.get('description', '')}".strip()
+        if len(summary) <= SCENE_SUMMARY_CHARS:
+            return summary
+        return summary[:SCENE_SUMMARY_CHARS].rsplit(" ", 1)[0] + "..."
+    
+    def _create_scene_prompt(
+        self,
+        structure_response: AgentResponse,
+        input_data: Dict[str, Any],
+        scene: Dict[str, Any],
+        index: int,
+        total: int,
+        previous_scene: Optional[Dict[str, Any]]
+    ) -> str:
+        """Create the prompt for one scene of a long-form story"""
+        prompt_parts = [self._story_prompt_details(structure_response, input_data)]
+        
+        if previous_scene is not None:
+            prompt_parts.append(f"ముందు సన్నివేశం: {self._summarize_scene(previous_scene)}")
+        prompt_parts.append(f"సన్నివేశం {index + 1}/{total}: {self._summarize_scene(scene)}")
+        if scene.get("parts", 1) > 1:
+            # Parts of one outline scene continue each other
+            prompt_parts.append(f"భాగం {scene['part']}/{scene['parts']}")
+        
+        return STORY_PROMPT_PREFIX + "\n".join(prompt_parts) + "\n\nసన్నివేశం:"
+    
     def _create_story_prompt(
         self,
         structure_response: AgentResponse,
@@ -366,6 +627,19 @@ class MultiAgentOrchestrator:
     ) -> str:
         """Create a comprehensive prompt for story generation"""
         
+        # Create final prompt
+        final_prompt = STORY_PROMPT_PREFIX + self._story_prompt_details(structure_response, input_data)
+        final_prompt += "\n\nకథ:"
+        
+        return final_prompt
+    
+    def _story_prompt_details(
+        self,
+        structure_response: AgentResponse,
+        input_data: Dict[str, Any]
+    ) -> str:
+        """Request details shared by story and scene prompts"""
+        
         prompt_parts = []
         
         # Add original prompt
@@ -393,11 +667,7 @@ class MultiAgentOrchestrator:
         length = input_data.get("length", 2000)
         prompt_parts.append(f"కథ రకం: {story_type}, పొడవు: {length} పదాలు")
         
-        # Create final prompt
-        final_prompt = "\n".join(prompt_parts)
-        final_prompt += "\n\nపై వివరాల ఆధారంగా ఒక పూర్తి తెలుగు కథ రాయండి:"
-        
-        return final_prompt
+        return "\n".join(prompt_parts)
     
     def _post_process_story(self, story_content: str, input_data: Dict[str, Any]) -> str:
         """Post-process the generated story"""
@@ -530,54 +800,51 @@ class MultiAgentOrchestrator:
         
         return found_elements
     
-    def _analyze_emotional_arc(self, story_content: str) -> Dict[str, Any]:
+    async def _analyze_emotional_arc(self, story_content: str) -> Dict[str, Any]:
         """Analyze the emotional arc of the story"""
-        # This would use emotion analysis models in production
-        return {
-            "emotional_progression": ["introduction", "conflict", "resolution"],
-            "dominant_emotions": ["family_bonds", "hope", "satisfaction"],
-            "emotional_intensity": 0.7,
-            "emotional_consistency": 0.8
-        }
+        try:
+            return await get_emotional_arc_analyzer().analyze(story_content)
+        except Exception as e:
+            logger.warning(f"Emotional arc analysis failed: {e}")
+            return EmotionalArcAnalyzer.empty_arc()
     
-    def _get_model_versions(self) -> Dict[str, str]:
-        """Get versions of models used"""
-        return {
-            "telugu_bert": "1.0.0",
-            "telugu_gpt": "1.0.0",
-            "emotion_model": "1.0.0",
-            "cultural_model": "1.0.0"
-        }
+    async def _get_model_versions(self) -> Dict[str, str]:
+        """Get revisions of the models the story pipeline uses"""
+        model_names = list(PIPELINE_MODELS)
+        if self.config.model.draft_model:
+            model_names.append(DRAFT_MODEL_NAME)
+        
+        revisions = await asyncio.gather(*(
+            self.model_manager.get_model_revision(model_name) for model_name in model_names
+        ))
+        return dict(zip(model_names, revisions))
     
     def get_session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a specific session"""
         return self.active_sessions.get(session_id)
     
     def get_active_sessions(self) -> Dict[str, Dict[str, Any]]:
-        """Get all active sessions"""
-        return self.active_sessions
+        """Get all sessions still in progress"""
+        return self.active_sessions.live_items()
     
-    def cleanup_completed_sessions(self, max_age_hours: int = 24):
-        """Clean up old completed sessions"""
-        current_time = datetime.now()
-        to_remove = []
-        
-        for session_id, session_data in self.active_sessions.items():
-            session_age = (current_time - session_data["start_time"]).total_seconds() / 3600
-            if session_age > max_age_hours and session_data["status"] in ["completed", "failed"]:
-                to_remove.append(session_id)
-        
-        for session_id in to_remove:
-            del self.active_sessions[session_id]
-        
-        if to_remove:
-            logger.info(f"Cleaned up {len(to_remove)} old sessions")
+    def cleanup_completed_sessions(self, max_age_hours: int = 24) -> int:
+        """
+        Evict finished sessions not updated for max_age_hours
+        The session store also does this on its own after its TTL
+        """
+        return self.active_sessions.sweep(max_age_hours * 3600)
+    
+    def get_agent_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics of every agent pool"""
+        return {name: pool.get_stats() for name, pool in self.agent_pools.items()}
     
     def _calculate_story_metadata(self, story_content: str, input_data: Dict[str, Any], generation_time: float, collaboration_rounds: int, session_id: str) -> Dict[str, Any]:
         """Calculate comprehensive metadata for the generated story"""
         import re
         import time
         
+        session = self.active_sessions.get(session_id) or {}
+        
         # Basic text analysis
         word_count = len(story_content.split())
         character_count = len(story_content)
@@ -596,11 +863,22 @@ class MultiAgentOrchestrator:
             "telugu_percentage": round(telugu_percentage, 2),
             "estimated_reading_time": round(word_count / 200, 1),  # 200 words per minute
             "generation_time": generation_time,
-            "agents_used": self.active_sessions[session_id]["agents_used"],
+            "agents_used": session.get("agents_used", []),
             "collaboration_rounds": collaboration_rounds,
+            "scene_count": session.get("scene_count", 0),
             "story_type": input_data.get("story_type", "unknown"),
             "cultural_context": input_data.get("cultural_context", "unknown"),
             "target_audience": input_data.get("target_audience", "general"),
             "generated_at": time.time(),
             "language": "telugu" if telugu_percentage > 50 else "mixed"
-        }
\ No newline at end of file
+        }
+
+# Global orchestrator instance
+_orchestrator: Optional[MultiAgentOrchestrator] = None
+
+def get_multi_agent_orchestrator() -> MultiAgentOrchestrator:
+    """Get the process-wide orchestrator"""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = MultiAgentOrchestrator()
+    return _orchestrator
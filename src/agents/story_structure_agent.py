@@ -12,9 +12,43 @@ from datetime import datetime
 
 from .base_agent import BaseAgent, AgentResponse, AgentStatus
 from ..core.model_manager import get_model_manager
+from ..core.cancellation import CancellationToken, GenerationCancelled
+from ..core.plan_cache import get_plan_cache
 
 logger = logging.getLogger(__name__)
 
+# Fixed instruction preambles come first so every request shares the same
+# leading tokens and the model manager can reuse their cached key/value
+# states. Each ends on a single newline so the BPE boundary with the
+# request-specific tail is stable.
+ANALYSIS_PROMPT_PREFIX = """Analyze the following Telugu story requirements and provide structural recommendations.
+
+Please analyze:
+1. Appropriate narrative structure
+2. Key plot elements needed
+3. Pacing requirements
+4. Cultural considerations
+5. Character development needs
+
+Provide analysis in Telugu and English.
+
+Story requirements:
+"""
+
+OUTLINE_PROMPT_PREFIX = """Create a detailed plot outline for a Telugu story with the structure given below.
+
+Create a detailed outline with:
+1. Scene-by-scene breakdown
+2. Character introductions and development
+3. Plot points and turning points
+4. Emotional beats
+5. Cultural elements integration
+
+Write in both Telugu and English.
+
+Story details:
+"""
+
 class StoryStructureAgent(BaseAgent):
     """
     Real AI agent for managing narrative structure and plot development
@@ -55,6 +89,9 @@ class StoryStructureAgent(BaseAgent):
             }
         }
         
+        self.model_manager.register_prompt_prefix("telugu_gpt", ANALYSIS_PROMPT_PREFIX)
+        self.model_manager.register_prompt_prefix("telugu_gpt", OUTLINE_PROMPT_PREFIX)
+        
         logger.info(f"Initialized StoryStructureAgent with {len(self.structure_types)} structure types")
     
     async def process(
@@ -75,10 +112,23 @@ class StoryStructureAgent(BaseAgent):
             length = input_data.get("length", 2000)
             cultural_context = input_data.get("cultural_context", "contemporary_telugu")
             
-            # Analyze story requirements
-            structure_analysis = await self._analyze_story_requirements(
-                story_prompt, story_type, length, cultural_context
+            # The orchestrator passes the request's cancellation token here
+            cancel_token = (context or {}).get("cancel_token")
+            
+            # A similar recent request's plan replaces both model calls
+            plan_key = await self._plan_cache_key(
+                story_prompt, story_type, length, cultural_context, input_data.get("seed")
             )
+            cached_plan = get_plan_cache().get(*plan_key) if plan_key else None
+            
+            # Analyze story requirements
+            if cached_plan:
+                analysis_text = cached_plan["analysis_text"]
+            else:
+                analysis_text = await self._analyze_story_requirements(
+                    story_prompt, story_type, length, cultural_context, input_data.get("seed"), cancel_token
+                )
+            structure_analysis = await self._extract_structure_info(analysis_text, story_prompt)
             
             # Generate story structure
             story_structure = await self._generate_story_structure(
@@ -86,7 +136,21 @@ class StoryStructureAgent(BaseAgent):
             )
             
             # Create detailed plot outline
-            plot_outline = await self._create_plot_outline(story_structure, input_data)
+            if cached_plan:
+                outline_text = cached_plan["outline_text"]
+            else:
+                outline_text = await self._write_plot_outline(story_structure, input_data, cancel_token)
+                # generate_text returns "" for a failed call; never pin a blank plan
+                plan_complete = (
+                    analysis_text.strip() and outline_text.strip()
+                    and not (cancel_token is not None and cancel_token.cancelled)
+                )
+                if plan_key and plan_complete:
+                    get_plan_cache().put(*plan_key, {
+                        "analysis_text": analysis_text,
+                        "outline_text": outline_text
+                    })
+            plot_outline = await self._create_plot_outline(story_structure, outline_text)
             
             # Generate narrative framework
             narrative_framework = await self._generate_narrative_framework(
@@ -123,11 +187,15 @@ class StoryStructureAgent(BaseAgent):
                     "story_structure": story_structure,
                     "plot_outline": plot_outline,
                     "narrative_framework": narrative_framework,
-                    "structure_analysis": structure_analysis
+                    "structure_analysis": structure_analysis,
+                    "plan_cache_hit": cached_plan is not None
                 },
                 processing_time=processing_time
             )
             
+        except GenerationCancelled:
+            logger.info("StoryStructureAgent processing cancelled")
+            raise
         except Exception as e:
             logger.error(f"Error in StoryStructureAgent processing: {e}")
             self.status = AgentStatus.ERROR
@@ -135,33 +203,50 @@ class StoryStructureAgent(BaseAgent):
         finally:
             self.status = AgentStatus.IDLE
     
+    async def _plan_cache_key(
+        self,
+        prompt: str,
+        story_type: str,
+        length: int,
+        cultural_context: str,
+        seed: Optional[int] = None
+    ) -> Optional[Tuple[Tuple[str, str, int], Any]]:
+        """
+        Request features and prompt embedding for the structure plan cache
+        None when the request cannot use the cache; seeded requests always
+        run the models so their output stays reproducible
+        """
+        plan_cache = get_plan_cache()
+        if plan_cache is None or seed is not None or not prompt:
+            return None
+        
+        try:
+            embedding = await self.model_manager.encode_text("cultural_model", prompt)
+        except Exception as e:
+            logger.warning(f"Structure plan cache skipped, prompt embedding failed: {e}")
+            return None
+        
+        return plan_cache.features(story_type, cultural_context, length), embedding
+    
     async def _analyze_story_requirements(
         self,
         prompt: str,
         story_type: str,
         length: int,
-        cultural_context: str
-    ) -> Dict[str, Any]:
+        cultural_context: str,
+        seed: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> str:
         """Analyze story requirements using real AI models"""
         
         # Create analysis prompt
-        analysis_prompt = f"""
-        Analyze the following Telugu story requirements and provide structural recommendations:
-        
-        Story Prompt: {prompt}
-        Story Type: {story_type}
-        Target Length: {length} words
-        Cultural Context: {cultural_context}
-        
-        Please analyze:
-        1. Appropriate narrative structure
-        2. Key plot elements needed
-        3. Pacing requirements
-        4. Cultural considerations
-        5. Character development needs
-        
-        Provide analysis in Telugu and English.
-        """
+        analysis_prompt = ANALYSIS_PROMPT_PREFIX + (
+            f"Story Prompt: {prompt}\n"
+            f"Story Type: {story_type}\n"
+            f"Target Length: {length} words\n"
+            f"Cultural Context: {cultural_context}\n\n"
+            "Analysis:\n"
+        )
         
         # Use Telugu BERT for understanding
         model_manager = get_model_manager()
@@ -171,13 +256,12 @@ class StoryStructureAgent(BaseAgent):
             "telugu_gpt",
             analysis_prompt,
             max_new_tokens=150,  # Generate 150 new tokens
-            temperature=0.7
+            temperature=0.7,
+            seed=seed,
+            cancel_token=cancel_token
         )
         
-        # Extract structured information
-        structure_analysis = await self._extract_structure_info(analysis_text, prompt)
-        
-        return structure_analysis
+        return analysis_text
     
     async def _extract_structure_info(self, analysis_text: str, original_prompt: str) -> Dict[str, Any]:
         """Extract structured information from analysis text"""
@@ -378,44 +462,41 @@ class StoryStructureAgent(BaseAgent):
         
         return progression
     
-    async def _create_plot_outline(
+    async def _write_plot_outline(
         self,
         structure: Dict[str, Any],
-        input_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create detailed plot outline based on structure"""
+        input_data: Dict[str, Any],
+        cancel_token: Optional[CancellationToken] = None
+    ) -> str:
+        """Write the plot outline text for a structure using real AI models"""
         
         # Generate plot outline using AI
-        outline_prompt = f"""
-        Create a detailed plot outline for a Telugu story with the following structure:
-        
-        Structure Type: {structure['type']}
-        Acts/Elements: {', '.join(structure['acts'])}
-        Themes: {', '.join(structure['themes'])}
-        Pacing: {structure['pacing']}
-        
-        Original Prompt: {input_data.get('prompt', '')}
-        Story Type: {input_data.get('story_type', 'drama')}
-        Length: {input_data.get('length', 2000)} words
-        
-        Create a detailed outline with:
-        1. Scene-by-scene breakdown
-        2. Character introductions and development
-        3. Plot points and turning points
-        4. Emotional beats
-        5. Cultural elements integration
-        
-        Write in both Telugu and English.
-        """
+        outline_prompt = OUTLINE_PROMPT_PREFIX + (
+            f"Structure Type: {structure['type']}\n"
+            f"Acts/Elements: {', '.join(structure['acts'])}\n"
+            f"Themes: {', '.join(structure['themes'])}\n"
+            f"Pacing: {structure['pacing']}\n\n"
+            f"Original Prompt: {input_data.get('prompt', '')}\n"
+            f"Story Type: {input_data.get('story_type', 'drama')}\n"
+            f"Length: {input_data.get('length', 2000)} words\n\n"
+            "Outline:\n"
+        )
         
         model_manager = get_model_manager()
         outline_text = await model_manager.generate_text(
             "telugu_gpt",
             outline_prompt,
             max_length=1500,
-            temperature=0.8
+            temperature=0.8,
+            seed=input_data.get("seed"),
+            cancel_token=cancel_token
         )
         
+        return outline_text
+    
+    async def _create_plot_outline(self, structure: Dict[str, Any], outline_text: str) -> Dict[str, Any]:
+        """Create detailed plot outline based on structure"""
+        
         # Structure the outline
         plot_outline = {
             "acts": structure["acts"],
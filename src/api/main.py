@@ -19,6 +19,11 @@ import uvicorn
 
 from ..core.config import get_config
 from ..core.model_manager import initialize_models, get_model_manager
+from ..core.result_cache import get_result_cache
+from ..core.plan_cache import get_plan_cache
+from ..core.admission import get_admission_controller
+from ..core.session_store import get_session_stores
+from ..agents import get_multi_agent_orchestrator
 from .routes import router
 from .models import ErrorResponse
 from .middleware import (
@@ -39,6 +44,7 @@ logger = logging.getLogger(__name__)
 app_state = {
     "startup_time": None,
     "model_manager": None,
+    "orchestrator": None,
     "request_count": 0,
     "error_count": 0
 }
@@ -57,6 +63,9 @@ async def lifespan(app: FastAPI):
         app_state["model_manager"] = get_model_manager()
         logger.info("Models initialized successfully")
         
+        # Build the shared orchestrator and its agent pools once
+        app_state["orchestrator"] = get_multi_agent_orchestrator()
+        
         # Additional startup tasks
         await startup_tasks()
         
@@ -98,6 +107,8 @@ async def shutdown_tasks():
             logger.info("Model cache saved")
         except Exception as e:
             logger.error(f"Failed to save model cache: {e}")
+        
+        app_state["model_manager"].shutdown()
     
     # Additional cleanup
     logger.info("Cleanup completed")
@@ -196,6 +207,7 @@ async def health_check():
             "database": "healthy",  # Add actual database check
             "cache": "healthy"      # Add actual cache check
         },
+        "startup": app_state["model_manager"].get_startup_report() if app_state["model_manager"] else {},
         "metrics": {
             "requests_total": app_state["request_count"],
             "errors_total": app_state["error_count"],
@@ -236,16 +248,283 @@ telugu_story_engine_uptime_seconds {uptime}
 telugu_story_engine_memory_usage_mb {get_memory_usage()}
 """
     
+    admission_stats = get_admission_controller().get_stats()
+    metrics_text += f"""
+# HELP telugu_story_engine_requests_in_flight Admitted story requests being processed
+# TYPE telugu_story_engine_requests_in_flight gauge
+telugu_story_engine_requests_in_flight {admission_stats["in_flight"]}
+
+# HELP telugu_story_engine_requests_queued Story requests waiting for admission
+# TYPE telugu_story_engine_requests_queued gauge
+telugu_story_engine_requests_queued {admission_stats["queued"]}
+
+# HELP telugu_story_engine_estimated_queue_wait_seconds Estimated admission wait for a new request
+# TYPE telugu_story_engine_estimated_queue_wait_seconds gauge
+telugu_story_engine_estimated_queue_wait_seconds {admission_stats["estimated_wait_seconds"]}
+
+# HELP telugu_story_engine_requests_shed_total Story requests rejected with 503 by kind
+# TYPE telugu_story_engine_requests_shed_total counter
+"""
+    for kind, count in admission_stats["shed"].items():
+        metrics_text += f'telugu_story_engine_requests_shed_total{{kind="{kind}"}} {count}\n'
+    metrics_text += """
+# HELP telugu_story_engine_requests_timed_out_total Story requests cancelled after request_timeout by kind
+# TYPE telugu_story_engine_requests_timed_out_total counter
+"""
+    for kind, count in admission_stats["timed_out"].items():
+        metrics_text += f'telugu_story_engine_requests_timed_out_total{{kind="{kind}"}} {count}\n'
+    
+    session_stores = get_session_stores()
+    if session_stores:
+        metrics_text += """
+# HELP telugu_story_engine_session_store_entries Records held by each session store
+# TYPE telugu_story_engine_session_store_entries gauge
+"""
+        for name, store in session_stores.items():
+            stats = store.get_stats()
+            metrics_text += (
+                f'telugu_story_engine_session_store_entries{{store="{name}",state="live"}} {stats["live_entries"]}\n'
+                f'telugu_story_engine_session_store_entries{{store="{name}",state="compressed"}} {stats["compressed_entries"]}\n'
+            )
+        metrics_text += """
+# HELP telugu_story_engine_session_store_size_mb Serialized size of each session store
+# TYPE telugu_story_engine_session_store_size_mb gauge
+"""
+        for name, store in session_stores.items():
+            metrics_text += f'telugu_story_engine_session_store_size_mb{{store="{name}"}} {store.get_stats()["size_mb"]}\n'
+        metrics_text += """
+# HELP telugu_story_engine_session_store_evictions_total Records evicted from each session store by reason
+# TYPE telugu_story_engine_session_store_evictions_total counter
+"""
+        for name, store in session_stores.items():
+            for reason, count in store.get_stats()["evictions"].items():
+                metrics_text += f'telugu_story_engine_session_store_evictions_total{{store="{name}",reason="{reason}"}} {count}\n'
+    
+    if app_state["orchestrator"]:
+        pool_stats = app_state["orchestrator"].get_agent_pool_stats()
+        metrics_text += """
+# HELP telugu_story_engine_agent_pool_agents Pooled agent instances by state
+# TYPE telugu_story_engine_agent_pool_agents gauge
+"""
+        for agent_type, stats in pool_stats.items():
+            metrics_text += (
+                f'telugu_story_engine_agent_pool_agents{{agent="{agent_type}",state="idle"}} {stats["idle"]}\n'
+                f'telugu_story_engine_agent_pool_agents{{agent="{agent_type}",state="in_use"}} {stats["in_use"]}\n'
+            )
+        metrics_text += """
+# HELP telugu_story_engine_agent_pool_leases_total Agent leases by whether the instance was reused
+# TYPE telugu_story_engine_agent_pool_leases_total counter
+"""
+        for agent_type, stats in pool_stats.items():
+            metrics_text += (
+                f'telugu_story_engine_agent_pool_leases_total{{agent="{agent_type}",source="reused"}} {stats["reused"]}\n'
+                f'telugu_story_engine_agent_pool_leases_total{{agent="{agent_type}",source="created"}} {stats["created"]}\n'
+            )
+    
     # Add model-specific metrics
     if app_state["model_manager"]:
         try:
             memory_usage = app_state["model_manager"].get_memory_usage()
-            for model_name, usage in memory_usage.items():
-                metrics_text += f"""
+            if memory_usage:
+                metrics_text += """
 # HELP telugu_story_engine_model_memory_mb Model memory usage in MB
 # TYPE telugu_story_engine_model_memory_mb gauge
-telugu_story_engine_model_memory_mb{{model="{model_name}"}} {usage}
 """
+                for model_name, usage in memory_usage.items():
+                    metrics_text += f'telugu_story_engine_model_memory_mb{{model="{model_name}"}} {usage}\n'
+        except Exception:
+            pass
+        
+        try:
+            batching_stats = app_state["model_manager"].get_batching_stats()
+            if batching_stats:
+                metrics_text += f"""
+# HELP telugu_story_engine_generation_batches_total Batched generation forward passes
+# TYPE telugu_story_engine_generation_batches_total counter
+telugu_story_engine_generation_batches_total {batching_stats["batches_total"]}
+
+# HELP telugu_story_engine_generation_batch_size_avg Average generation batch size
+# TYPE telugu_story_engine_generation_batch_size_avg gauge
+telugu_story_engine_generation_batch_size_avg {batching_stats["average_batch_size"]}
+
+# HELP telugu_story_engine_generation_queued Generation requests waiting for a batch
+# TYPE telugu_story_engine_generation_queued gauge
+telugu_story_engine_generation_queued {batching_stats["queued"]}
+"""
+            
+            scheduling_stats = app_state["model_manager"].get_executor_stats().get("scheduling", {})
+            if scheduling_stats:
+                metrics_text += """
+# HELP telugu_story_engine_inference_wait_ms_avg Average wait for an inference slot by priority class
+# TYPE telugu_story_engine_inference_wait_ms_avg gauge
+"""
+                for model_name, stats in scheduling_stats.items():
+                    for priority, wait_ms in stats["average_wait_ms"].items():
+                        metrics_text += (
+                            f'telugu_story_engine_inference_wait_ms_avg'
+                            f'{{model="{model_name}",priority="{priority}"}} {wait_ms}\n'
+                        )
+                metrics_text += """
+# HELP telugu_story_engine_inference_wait_ms_max Longest wait for an inference slot by priority class
+# TYPE telugu_story_engine_inference_wait_ms_max gauge
+"""
+                for model_name, stats in scheduling_stats.items():
+                    for priority, wait_ms in stats["max_wait_ms"].items():
+                        metrics_text += (
+                            f'telugu_story_engine_inference_wait_ms_max'
+                            f'{{model="{model_name}",priority="{priority}"}} {wait_ms}\n'
+                        )
+            
+            prefix_stats = app_state["model_manager"].get_prefix_cache_stats()
+            if prefix_stats:
+                metrics_text += f"""
+# HELP telugu_story_engine_prefix_cache_hits_total Generations that reused cached prompt-prefix states
+# TYPE telugu_story_engine_prefix_cache_hits_total counter
+telugu_story_engine_prefix_cache_hits_total {prefix_stats["hits"]}
+
+# HELP telugu_story_engine_prefix_cache_misses_total Prompt-prefix states that had to be prefilled
+# TYPE telugu_story_engine_prefix_cache_misses_total counter
+telugu_story_engine_prefix_cache_misses_total {prefix_stats["misses"]}
+
+# HELP telugu_story_engine_prefix_cache_prefill_tokens_saved_total Prompt tokens not recomputed thanks to the prefix cache
+# TYPE telugu_story_engine_prefix_cache_prefill_tokens_saved_total counter
+telugu_story_engine_prefix_cache_prefill_tokens_saved_total {prefix_stats["prefill_tokens_saved"]}
+
+# HELP telugu_story_engine_prefix_cache_size_mb Memory held by cached prompt-prefix states
+# TYPE telugu_story_engine_prefix_cache_size_mb gauge
+telugu_story_engine_prefix_cache_size_mb {prefix_stats["size_mb"]}
+"""
+            
+            embedding_stats = app_state["model_manager"].get_embedding_cache_stats()
+            if embedding_stats:
+                metrics_text += f"""
+# HELP telugu_story_engine_embedding_cache_hits_total Embedding cache hits by tier
+# TYPE telugu_story_engine_embedding_cache_hits_total counter
+telugu_story_engine_embedding_cache_hits_total{{tier="memory"}} {embedding_stats["memory_hits"]}
+telugu_story_engine_embedding_cache_hits_total{{tier="disk"}} {embedding_stats["disk_hits"]}
+
+# HELP telugu_story_engine_embedding_cache_misses_total Embeddings computed by a model
+# TYPE telugu_story_engine_embedding_cache_misses_total counter
+telugu_story_engine_embedding_cache_misses_total {embedding_stats["misses"]}
+
+# HELP telugu_story_engine_embedding_cache_entries Embeddings held by each cache tier
+# TYPE telugu_story_engine_embedding_cache_entries gauge
+telugu_story_engine_embedding_cache_entries{{tier="memory"}} {embedding_stats["memory_entries"]}
+telugu_story_engine_embedding_cache_entries{{tier="disk"}} {embedding_stats["disk_entries"]}
+"""
+            
+            cancellation_stats = app_state["model_manager"].get_cancellation_stats()
+            if cancellation_stats:
+                metrics_text += f"""
+# HELP telugu_story_engine_cancelled_generations_total Generation requests abandoned by their caller
+# TYPE telugu_story_engine_cancelled_generations_total counter
+telugu_story_engine_cancelled_generations_total {cancellation_stats["requests_cancelled"]}
+
+# HELP telugu_story_engine_cancelled_queued_generations_total Cancelled generations dropped before reaching a model
+# TYPE telugu_story_engine_cancelled_queued_generations_total counter
+telugu_story_engine_cancelled_queued_generations_total{{stage="batcher"}} {cancellation_stats["queued_dropped"]}
+telugu_story_engine_cancelled_queued_generations_total{{stage="executor"}} {cancellation_stats["batches_skipped"]}
+
+# HELP telugu_story_engine_cancelled_tokens_wasted_total Tokens decoded for callers that had already gone away
+# TYPE telugu_story_engine_cancelled_tokens_wasted_total counter
+telugu_story_engine_cancelled_tokens_wasted_total {cancellation_stats["tokens_wasted"]}
+"""
+            
+            result_cache = get_result_cache()
+            if result_cache is not None:
+                result_stats = result_cache.get_stats()
+                metrics_text += f"""
+# HELP telugu_story_engine_result_cache_hits_total Seeded story requests served from the result cache by tier
+# TYPE telugu_story_engine_result_cache_hits_total counter
+telugu_story_engine_result_cache_hits_total{{tier="memory"}} {result_stats["memory_hits"]}
+telugu_story_engine_result_cache_hits_total{{tier="disk"}} {result_stats["disk_hits"]}
+
+# HELP telugu_story_engine_result_cache_misses_total Seeded story requests that ran the pipeline
+# TYPE telugu_story_engine_result_cache_misses_total counter
+telugu_story_engine_result_cache_misses_total {result_stats["misses"]}
+
+# HELP telugu_story_engine_result_cache_hit_rate Share of seeded story requests served from the result cache
+# TYPE telugu_story_engine_result_cache_hit_rate gauge
+telugu_story_engine_result_cache_hit_rate {result_stats["hit_rate"]}
+
+# HELP telugu_story_engine_result_cache_disk_size_mb Disk used by cached story results
+# TYPE telugu_story_engine_result_cache_disk_size_mb gauge
+telugu_story_engine_result_cache_disk_size_mb {result_stats["disk_size_mb"]}
+"""
+            
+            plan_cache = get_plan_cache()
+            if plan_cache is not None:
+                plan_stats = plan_cache.get_stats()
+                metrics_text += f"""
+# HELP telugu_story_engine_plan_cache_lookups_total Story structure plans looked up in the plan cache by result
+# TYPE telugu_story_engine_plan_cache_lookups_total counter
+telugu_story_engine_plan_cache_lookups_total{{result="hit"}} {plan_stats["hits"]}
+telugu_story_engine_plan_cache_lookups_total{{result="miss"}} {plan_stats["misses"]}
+
+# HELP telugu_story_engine_plan_cache_hit_rate Share of unseeded story requests that reused a cached structure plan
+# TYPE telugu_story_engine_plan_cache_hit_rate gauge
+telugu_story_engine_plan_cache_hit_rate {plan_stats["hit_rate"]}
+
+# HELP telugu_story_engine_plan_cache_entries Structure plans held by the plan cache
+# TYPE telugu_story_engine_plan_cache_entries gauge
+telugu_story_engine_plan_cache_entries {plan_stats["entries"]}
+"""
+            
+            generation_stats = app_state["model_manager"].get_generation_stats()
+            if generation_stats:
+                metrics_text += """
+# HELP telugu_story_engine_generated_tokens_total Tokens generated per model
+# TYPE telugu_story_engine_generated_tokens_total counter
+"""
+                for model_name, stats in generation_stats.items():
+                    metrics_text += (
+                        f'telugu_story_engine_generated_tokens_total'
+                        f'{{model="{model_name}",precision="{stats["precision"]}"}} {stats["tokens_generated"]}\n'
+                    )
+                metrics_text += """
+# HELP telugu_story_engine_generation_tokens_per_second Average decode throughput per model
+# TYPE telugu_story_engine_generation_tokens_per_second gauge
+"""
+                for model_name, stats in generation_stats.items():
+                    metrics_text += (
+                        f'telugu_story_engine_generation_tokens_per_second'
+                        f'{{model="{model_name}",precision="{stats["precision"]}"}} {stats["tokens_per_second"]}\n'
+                    )
+            
+            early_stop_stats = {name: stats for name, stats in generation_stats.items() if "tokens_saved" in stats}
+            if early_stop_stats:
+                metrics_text += """
+# HELP telugu_story_engine_generation_tokens_saved_total Decode tokens skipped by early stopping
+# TYPE telugu_story_engine_generation_tokens_saved_total counter
+"""
+                for model_name, stats in early_stop_stats.items():
+                    metrics_text += f'telugu_story_engine_generation_tokens_saved_total{{model="{model_name}"}} {stats["tokens_saved"]}\n'
+                metrics_text += """
+# HELP telugu_story_engine_generation_early_stops_total Generations stopped before max_new_tokens by reason
+# TYPE telugu_story_engine_generation_early_stops_total counter
+"""
+                for model_name, stats in early_stop_stats.items():
+                    for key, count in stats.items():
+                        if key.startswith("stopped_"):
+                            metrics_text += (
+                                f'telugu_story_engine_generation_early_stops_total'
+                                f'{{model="{model_name}",reason="{key[len("stopped_"):]}"}} {count}\n'
+                            )
+            
+            draft_stats = {name: stats for name, stats in generation_stats.items() if "acceptance_rate" in stats}
+            if draft_stats:
+                metrics_text += """
+# HELP telugu_story_engine_draft_acceptance_rate Share of draft-model tokens accepted by the target model
+# TYPE telugu_story_engine_draft_acceptance_rate gauge
+"""
+                for model_name, stats in draft_stats.items():
+                    metrics_text += f'telugu_story_engine_draft_acceptance_rate{{model="{model_name}"}} {stats["acceptance_rate"]}\n'
+                metrics_text += """
+# HELP telugu_story_engine_draft_tokens_proposed_total Tokens proposed by the draft model
+# TYPE telugu_story_engine_draft_tokens_proposed_total counter
+"""
+                for model_name, stats in draft_stats.items():
+                    metrics_text += f'telugu_story_engine_draft_tokens_proposed_total{{model="{model_name}"}} {stats["draft_tokens_proposed"]}\n'
         except Exception:
             pass
     
@@ -3,7 +3,7 @@ Pydantic Models for Telugu Story Engine API
 Production-ready data models for real AI system
 """
 
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Literal, Optional, Union
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from enum import Enum
@@ -92,6 +92,9 @@ class StoryGenerationRequest(BaseModel):
     enable_expert_agents: bool = Field(default=True, description="Enable expert domain agents")
     collaboration_rounds: int = Field(default=3, ge=1, le=10, description="Number of collaboration rounds")
     
+    # Deterministic mode
+    seed: Optional[int] = Field(None, ge=0, description="Sampling seed; identical seeded requests return the same cached story")
+    
     @validator('characters')
     def validate_characters(cls, v):
         if len(v) > 10:
@@ -110,6 +113,8 @@ class StoryMetadata(BaseModel):
     generation_time: float
     agents_used: List[str]
     collaboration_rounds: int
+    phase_timings: Optional[Dict[str, Any]] = Field(None, description="Per-phase durations and critical path")
+    cached: bool = Field(False, description="Served from the result cache")
 
 class StoryResponse(BaseModel):
     """Response model for generated story"""
@@ -191,7 +196,7 @@ class StoryAnalysisResponse(BaseModel):
 class BatchStoryRequest(BaseModel):
     """Request for batch story generation"""
     requests: List[StoryGenerationRequest] = Field(..., max_items=10, description="Batch of story requests")
-    priority: str = Field(default="normal", description="Processing priority")
+    priority: Literal["high", "normal", "low"] = Field(default="normal", description="Processing priority; batch jobs always yield to interactive requests")
     callback_url: Optional[str] = Field(None, description="Callback URL for completion notification")
 
 class BatchStoryResponse(BaseModel):
@@ -216,6 +221,7 @@ class ModelInfo(BaseModel):
     loaded: bool
     load_time: Optional[datetime] = None
     performance_metrics: Dict[str, float] = Field(default_factory=dict)
+    reload_status: Optional[Dict[str, Any]] = None
 
 class ConfigurationUpdate(BaseModel):
     """Configuration update request"""
@@ -9,8 +9,9 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import json
 
 from .models import (
@@ -24,7 +25,11 @@ from .models import (
 )
 from ..core.config import get_config
 from ..core.model_manager import get_model_manager
-from ..agents import MultiAgentOrchestrator
+from ..core.cancellation import CancellationToken, GenerationCancelled
+from ..core.scheduler import priority_scope, set_priority
+from ..core.admission import AdmissionRejected, AdmissionTicket, get_admission_controller
+from ..core.session_store import get_session_store
+from ..agents import MultiAgentOrchestrator, get_multi_agent_orchestrator
 
 logger = logging.getLogger(__name__)
 
@@ -33,13 +38,36 @@ router = APIRouter()
 
 # Global state
 active_connections: List[WebSocket] = []
-active_generations: Dict[str, Dict[str, Any]] = {}
+# Generation records keyed by request id, which is also the story id
+active_generations = get_session_store("api_generations")
+
+# Seconds between checks for a disconnected HTTP client
+DISCONNECT_POLL_INTERVAL = 0.5
+
+async def watch_disconnect(http_request: Request, cancel_token: CancellationToken) -> None:
+    """Cancel a request's work once its HTTP client disconnects"""
+    while not cancel_token.cancelled:
+        if await http_request.is_disconnected():
+            cancel_token.cancel("client disconnected")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+async def admit(kind: str, cancel_token: Optional[CancellationToken] = None) -> AdmissionTicket:
+    """Admit a request, or reject it with 503 when the server is overloaded"""
+    try:
+        return await get_admission_controller().acquire(kind, cancel_token)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
 
 # Dependency to get orchestrator
 async def get_orchestrator():
-    """Get multi-agent orchestrator instance"""
+    """Get the shared multi-agent orchestrator"""
     try:
-        return MultiAgentOrchestrator()
+        return get_multi_agent_orchestrator()
     except Exception as e:
         logger.error(f"Failed to create orchestrator: {e}")
         raise HTTPException(status_code=500, detail="System initialization error")
@@ -49,6 +77,7 @@ async def get_orchestrator():
 async def generate_story(
     request: StoryGenerationRequest,
     background_tasks: BackgroundTasks,
+    http_request: Request,
     orchestrator: MultiAgentOrchestrator = Depends(get_orchestrator)
 ):
     """
@@ -57,33 +86,41 @@ async def generate_story(
     """
     request_id = str(uuid.uuid4())
     
+    # Stop generating once nobody is waiting for the story
+    cancel_token = CancellationToken()
+    ticket = await admit("generate", cancel_token)
+    disconnect_watcher = asyncio.create_task(watch_disconnect(http_request, cancel_token))
+    
     try:
         logger.info(f"Story generation request {request_id}: {request.prompt[:100]}...")
         
         # Track active generation
-        active_generations[request_id] = {
+        active_generations.put(request_id, {
             "status": "processing",
             "start_time": datetime.now(),
             "request": request.dict()
-        }
+        })
         
-        # Generate story using real AI
-        story_result = await orchestrator.generate_story(
-            prompt=request.prompt,
-            story_type=request.story_type,
-            length=request.length,
-            cultural_context=request.cultural_context,
-            emotional_focus=request.emotional_focus,
-            language_style=request.language_style,
-            characters=request.characters,
-            setting=request.setting,
-            include_dialogue=request.include_dialogue,
-            include_cultural_references=request.include_cultural_references,
-            target_audience=request.target_audience,
-            moral_message=request.moral_message,
-            enable_expert_agents=request.enable_expert_agents,
-            collaboration_rounds=request.collaboration_rounds
-        )
+        # Generate story using real AI, ahead of queued batch jobs
+        with priority_scope("interactive"):
+            story_result = await orchestrator.generate_story(
+                prompt=request.prompt,
+                story_type=request.story_type,
+                length=request.length,
+                cultural_context=request.cultural_context,
+                emotional_focus=request.emotional_focus,
+                language_style=request.language_style,
+                characters=request.characters,
+                setting=request.setting,
+                include_dialogue=request.include_dialogue,
+                include_cultural_references=request.include_cultural_references,
+                target_audience=request.target_audience,
+                moral_message=request.moral_message,
+                enable_expert_agents=request.enable_expert_agents,
+                collaboration_rounds=request.collaboration_rounds,
+                seed=request.seed,
+                cancel_token=cancel_token
+            )
         
         # Create response
         response = StoryResponse(
@@ -101,7 +138,9 @@ async def generate_story(
                 quality_score=story_result["metadata"].get("quality_score", 0.8),
                 generation_time=story_result["metadata"]["generation_time"],
                 agents_used=story_result["metadata"]["agents_used"],
-                collaboration_rounds=story_result["metadata"]["collaboration_rounds"]
+                collaboration_rounds=story_result["metadata"]["collaboration_rounds"],
+                phase_timings=story_result["metadata"].get("phase_timings"),
+                cached=story_result["metadata"].get("cached", False)
             ),
             structure_type=story_result["structure_type"],
             plot_outline=story_result["plot_outline"],
@@ -114,8 +153,7 @@ async def generate_story(
         )
         
         # Update tracking
-        active_generations[request_id]["status"] = "completed"
-        active_generations[request_id]["response"] = response
+        active_generations.update(request_id, status="completed", response=response)
         
         # Notify WebSocket clients
         await notify_websocket_clients({
@@ -127,22 +165,44 @@ async def generate_story(
         logger.info(f"Story generation completed: {request_id}")
         return response
         
+    except GenerationCancelled as e:
+        logger.info(f"Story generation cancelled for {request_id}: {e}")
+        
+        active_generations.update(request_id, status="timed_out" if ticket.timed_out else "cancelled")
+        
+        if ticket.timed_out:
+            raise HTTPException(status_code=504, detail="Story generation exceeded the request timeout")
+        
+        # Nobody reads this response; 499 marks it in access logs
+        raise HTTPException(status_code=499, detail="Client closed request")
+        
+    except asyncio.CancelledError:
+        # The server cancelled the handler, e.g. when the client disconnected
+        logger.info(f"Story generation handler cancelled for {request_id}")
+        
+        active_generations.update(request_id, status="cancelled")
+        
+        raise
+        
     except Exception as e:
         logger.error(f"Story generation failed for {request_id}: {e}")
         
         # Update tracking
-        if request_id in active_generations:
-            active_generations[request_id]["status"] = "failed"
-            active_generations[request_id]["error"] = str(e)
+        active_generations.update(request_id, status="failed", error=str(e))
         
         raise HTTPException(
             status_code=500,
             detail=f"Story generation failed: {str(e)}"
         )
+    
+    finally:
+        disconnect_watcher.cancel()
+        get_admission_controller().release(ticket)
 
 @router.post("/stories/generate/stream")
 async def generate_story_stream(
     request: StoryGenerationRequest,
+    http_request: Request,
     orchestrator: MultiAgentOrchestrator = Depends(get_orchestrator)
 ):
     """
@@ -150,17 +210,24 @@ async def generate_story_stream(
     """
     request_id = str(uuid.uuid4())
     
+    # Admit before the response starts so overload is still a plain 503
+    cancel_token = CancellationToken()
+    ticket = await admit("generate", cancel_token)
+    
+    def release_ticket():
+        # Called from every exit path; release() ignores tickets already released
+        cancel_token.cancel("stream closed")
+        get_admission_controller().release(ticket)
+    
     async def story_generator():
+        # Runs in the response's own task, ahead of queued batch jobs
+        set_priority("interactive")
+        disconnect_watcher = asyncio.create_task(watch_disconnect(http_request, cancel_token))
+        
         try:
-            # Stream story generation progress
-            async for chunk in orchestrator.generate_story_stream(
-                prompt=request.prompt,
-                story_type=request.story_type,
-                length=request.length,
-                cultural_context=request.cultural_context,
-                **request.dict()
-            ):
-                yield f"data: {json.dumps(chunk)}\n\n"
+            # Stream story generation progress and content tokens
+            async for chunk in orchestrator.generate_story_stream(cancel_token=cancel_token, **request.dict()):
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
                 
         except Exception as e:
             error_chunk = {
@@ -169,25 +236,39 @@ async def generate_story_stream(
                 "request_id": request_id
             }
             yield f"data: {json.dumps(error_chunk)}\n\n"
+        
+        finally:
+            disconnect_watcher.cancel()
+            # The response is closed early when the client goes away; stop
+            # whatever the orchestrator still has in flight
+            release_ticket()
     
-    return StreamingResponse(
-        story_generator(),
-        media_type="text/plain",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Request-ID": request_id
-        }
-    )
+    try:
+        # The body may never be iterated when the client leaves before the
+        # response starts; the background task still releases the ticket
+        return StreamingResponse(
+            story_generator(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+                "X-Request-ID": request_id
+            },
+            background=BackgroundTask(release_ticket)
+        )
+    except BaseException:
+        release_ticket()
+        raise
 
 @router.get("/stories/{story_id}", response_model=StoryResponse)
 async def get_story(story_id: str):
     """Get a specific story by ID"""
     # In production, this would query the database
     # For now, check active generations
-    for request_id, generation in active_generations.items():
-        if generation.get("response") and generation["response"].id == story_id:
-            return generation["response"]
+    generation = active_generations.get(story_id)
+    if generation and generation.get("response"):
+        return StoryResponse(**generation["response"])
     
     raise HTTPException(status_code=404, detail="Story not found")
 
@@ -201,22 +282,17 @@ async def list_stories(
     """List stories with filtering and pagination"""
     # In production, this would query the database
     # For now, return from active generations
-    stories = []
-    for generation in active_generations.values():
-        if generation.get("response"):
-            stories.append(generation["response"])
+    generations = [generation for _, generation in active_generations.items() if generation.get("response")]
     
     # Apply filters
     if story_type:
-        stories = [s for s in stories if s.request_id in active_generations and 
-                  active_generations[s.request_id]["request"].get("story_type") == story_type]
+        generations = [g for g in generations if g["request"].get("story_type") == story_type]
     
     if cultural_context:
-        stories = [s for s in stories if s.request_id in active_generations and 
-                  active_generations[s.request_id]["request"].get("cultural_context") == cultural_context]
+        generations = [g for g in generations if g["request"].get("cultural_context") == cultural_context]
     
     # Apply pagination
-    return stories[offset:offset + limit]
+    return [StoryResponse(**g["response"]) for g in generations[offset:offset + limit]]
 
 # Story Analysis Endpoints
 @router.post("/stories/analyze", response_model=StoryAnalysisResponse)
@@ -226,13 +302,17 @@ async def analyze_story(
 ):
     """Analyze an existing story"""
     analysis_id = str(uuid.uuid4())
+    ticket = await admit("analyze")
     
     try:
         # Perform story analysis using AI agents
-        analysis_result = await orchestrator.analyze_story(
-            content=request.story_content,
-            analysis_types=request.analysis_type,
-            include_suggestions=request.include_suggestions
+        analysis_result = await asyncio.wait_for(
+            orchestrator.analyze_story(
+                content=request.story_content,
+                analysis_types=request.analysis_type,
+                include_suggestions=request.include_suggestions
+            ),
+            timeout=get_config().request_timeout
         )
         
         return StoryAnalysisResponse(
@@ -252,9 +332,16 @@ async def analyze_story(
             analyzed_at=datetime.now()
         )
         
+    except asyncio.TimeoutError:
+        logger.error(f"Story analysis timed out: {analysis_id}")
+        raise HTTPException(status_code=504, detail="Story analysis exceeded the request timeout")
+        
     except Exception as e:
         logger.error(f"Story analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    
+    finally:
+        get_admission_controller().release(ticket)
 
 # Batch Processing Endpoints
 @router.post("/stories/batch", response_model=BatchStoryResponse)
@@ -357,12 +444,13 @@ async def get_models_info():
             result[name] = ModelInfo(
                 name=info.name,
                 type=info.model_type,
-                version="1.0.0",  # Mock version
+                version=info.revision or "1.0.0",
                 parameters=info.parameters or 0,
                 memory_usage=info.memory_usage or 0.0,
                 loaded=info.loaded,
                 load_time=info.load_time,
-                performance_metrics={}  # Mock metrics
+                performance_metrics={},  # Mock metrics
+                reload_status=info.reload_status
             )
         
         return result
@@ -371,14 +459,19 @@ async def get_models_info():
         logger.error(f"Failed to get model info: {e}")
         raise HTTPException(status_code=500, detail="Failed to get model information")
 
-@router.post("/models/reload")
-async def reload_models():
-    """Reload all models"""
+@router.post("/models/reload", status_code=202)
+async def reload_models(model_name: Optional[str] = None):
+    """
+    Hot reload one model, or all loaded models, in the background
+    Requests keep being served during the reload; poll /models/info for progress
+    """
     try:
         model_manager = get_model_manager()
-        await model_manager.initialize_models()
-        return {"message": "Models reloaded successfully"}
+        started = await model_manager.reload_models([model_name] if model_name else None)
+        return {"message": "Model reload started", "models": started}
         
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to reload models: {e}")
         raise HTTPException(status_code=500, detail="Failed to reload models")
@@ -529,8 +622,11 @@ async def notify_websocket_clients(message: Dict[str, Any]):
 
 async def process_batch_stories(batch_id: str, request: BatchStoryRequest):
     """Process batch story generation in background"""
+    # Batch stories yield the models to interactive requests
+    set_priority(request.priority)
+    
     try:
-        orchestrator = MultiAgentOrchestrator()
+        orchestrator = get_multi_agent_orchestrator()
         
         for i, story_request in enumerate(request.requests):
             try:
@@ -0,0 +1,192 @@
+"""
+Admission Control for Telugu Story Engine
+Bounds in-flight story work and sheds load before queues grow unbounded
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Any, Optional
+
+from .config import get_config
+from .cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+# Reason set on a request's cancellation token when it runs too long
+TIMEOUT_REASON = "request timeout"
+
+# Weight of the newest duration in each kind's moving average
+SERVICE_TIME_ALPHA = 0.2
+
+class AdmissionRejected(Exception):
+    """Raised when a request would wait longer than the queue allows"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+@dataclass
+class AdmissionTicket:
+    """An admitted request; pass it back to release() when done"""
+    kind: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    cancel_token: Optional[CancellationToken] = None
+    timeout_handle: Optional[asyncio.TimerHandle] = None
+    future: Optional[asyncio.Future] = None
+    timed_out: bool = False
+
+class AdmissionController:
+    """
+    Limits story generation and analysis to max_concurrent requests
+
+    Requests beyond the limit wait in a FIFO queue. The wait a new request
+    would face is estimated from a moving average of recent durations per
+    kind of request: the work queued ahead of it plus the remaining work in
+    flight, spread over the concurrency limit. Requests whose estimate
+    exceeds max_queue_wait are rejected at once with a Retry-After hint
+    instead of joining the queue. Admitted requests are marked timed out,
+    and their cancellation token cancelled, once they run longer than
+    request_timeout.
+
+    Limits apply per API worker process.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue_wait: float, request_timeout: Optional[float] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue_wait = max_queue_wait
+        self.request_timeout = request_timeout
+
+        self._in_flight: Dict[int, AdmissionTicket] = {}
+        self._queue: Deque[AdmissionTicket] = deque()
+        self._service_seconds: Dict[str, float] = {}
+
+        self.admitted: Dict[str, int] = {}
+        self.shed: Dict[str, int] = {}
+        self.timed_out: Dict[str, int] = {}
+
+    def _expected_seconds(self, kind: str) -> float:
+        return self._service_seconds.get(kind, 0.0)
+
+    def estimate_wait(self) -> float:
+        """Seconds a request arriving now would wait for a slot"""
+        if len(self._in_flight) < self.max_concurrent and not self._queue:
+            return 0.0
+
+        now = time.monotonic()
+        in_flight = sum(
+            max(0.0, self._expected_seconds(ticket.kind) - (now - ticket.started_at))
+            for ticket in self._in_flight.values()
+        )
+        queued = sum(self._expected_seconds(ticket.kind) for ticket in self._queue)
+        return (in_flight + queued) / self.max_concurrent
+
+    async def acquire(self, kind: str, cancel_token: Optional[CancellationToken] = None) -> AdmissionTicket:
+        """Admit a request, queueing it if every slot is busy"""
+        ticket = AdmissionTicket(kind=kind, cancel_token=cancel_token)
+
+        if len(self._in_flight) < self.max_concurrent and not self._queue:
+            self._start(ticket)
+            return ticket
+
+        estimated_wait = self.estimate_wait()
+        if estimated_wait > self.max_queue_wait:
+            self.shed[kind] = self.shed.get(kind, 0) + 1
+            retry_after = max(1, math.ceil(estimated_wait))
+            logger.warning(f"Shedding {kind} request: estimated wait {estimated_wait:.1f}s")
+            raise AdmissionRejected(f"Server overloaded, retry after {retry_after}s", retry_after)
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._queue.append(ticket)
+        try:
+            # The estimate can be wrong; never queue longer than allowed
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout=self.max_queue_wait or None)
+        except asyncio.TimeoutError:
+            if ticket.started_at is not None:
+                # Admitted just as the wait ran out; the slot is ours
+                return ticket
+            self._queue.remove(ticket)
+            self.shed[kind] = self.shed.get(kind, 0) + 1
+            raise AdmissionRejected(
+                "Server overloaded, queue wait exceeded",
+                max(1, math.ceil(self.estimate_wait()))
+            )
+        except asyncio.CancelledError:
+            if ticket.started_at is not None:
+                # Admitted just before the caller went away; hand the slot on
+                self.release(ticket)
+            else:
+                self._queue.remove(ticket)
+            raise
+        return ticket
+
+    def _start(self, ticket: AdmissionTicket) -> None:
+        ticket.started_at = time.monotonic()
+        self._in_flight[id(ticket)] = ticket
+        self.admitted[ticket.kind] = self.admitted.get(ticket.kind, 0) + 1
+
+        if self.request_timeout:
+            ticket.timeout_handle = asyncio.get_running_loop().call_later(
+                self.request_timeout, self._expire, ticket
+            )
+        if ticket.future is not None and not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _expire(self, ticket: AdmissionTicket) -> None:
+        """Timer callback once a request has run for request_timeout"""
+        ticket.timed_out = True
+        self.timed_out[ticket.kind] = self.timed_out.get(ticket.kind, 0) + 1
+        if ticket.cancel_token is not None:
+            ticket.cancel_token.cancel(TIMEOUT_REASON)
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Free a ticket's slot, record its duration and admit the next request"""
+        if self._in_flight.pop(id(ticket), None) is None:
+            return
+
+        if ticket.timeout_handle is not None:
+            ticket.timeout_handle.cancel()
+
+        duration = time.monotonic() - ticket.started_at
+        previous = self._service_seconds.get(ticket.kind)
+        self._service_seconds[ticket.kind] = (
+            duration if previous is None
+            else SERVICE_TIME_ALPHA * duration + (1 - SERVICE_TIME_ALPHA) * previous
+        )
+
+        while self._queue and len(self._in_flight) < self.max_concurrent:
+            self._start(self._queue.popleft())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission statistics"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": len(self._in_flight),
+            "queued": len(self._queue),
+            "estimated_wait_seconds": round(self.estimate_wait(), 2),
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+            "timed_out": dict(self.timed_out),
+            "average_service_seconds": {
+                kind: round(seconds, 2) for kind, seconds in self._service_seconds.items()
+            }
+        }
+
+# Global admission controller instance
+_admission_controller: Optional[AdmissionController] = None
+
+def get_admission_controller() -> AdmissionController:
+    """Get the global admission controller"""
+    global _admission_controller
+    if _admission_controller is None:
+        config = get_config()
+        _admission_controller = AdmissionController(
+            max_concurrent=config.max_concurrent_requests,
+            max_queue_wait=config.admission_max_queue_wait,
+            request_timeout=config.request_timeout
+        )
+    return _admission_controller
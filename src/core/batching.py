@@ -0,0 +1,212 @@
+"""
+Dynamic Batching for Telugu Story Engine
+Merges concurrent generation requests into batched forward passes
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, Hashable, Sequence, Set
+
+from .cancellation import CancellationToken, GenerationCancelled
+from .scheduler import PRIORITY_CLASSES, aged_rank, get_priority, set_priority
+
+logger = logging.getLogger(__name__)
+
+# Runs one merged batch: (model_name, prompts, generation_kwargs, cancel_tokens) -> texts
+BatchRunner = Callable[
+    [str, List[str], Dict[str, Any], List[Optional[CancellationToken]]],
+    Awaitable[List[str]]
+]
+
+@dataclass
+class PendingGeneration:
+    """A single queued generation request"""
+    prompt: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    cancel_token: Optional[CancellationToken] = None
+    priority: str = field(default_factory=get_priority)
+
+@dataclass
+class BatchStats:
+    """Batching statistics"""
+    requests_total: int = 0
+    batches_total: int = 0
+    largest_batch: int = 0
+    flushed_on_size: int = 0
+    flushed_on_timeout: int = 0
+    cancelled_dropped: int = 0
+
+    @property
+    def average_batch_size(self) -> float:
+        return self.requests_total / self.batches_total if self.batches_total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "requests_total": self.requests_total,
+            "batches_total": self.batches_total,
+            "largest_batch": self.largest_batch,
+            "average_batch_size": round(self.average_batch_size, 2),
+            "flushed_on_size": self.flushed_on_size,
+            "flushed_on_timeout": self.flushed_on_timeout,
+            "cancelled_dropped": self.cancelled_dropped
+        }
+
+def bucket_by_length(lengths: Sequence[int], max_batch_size: int, max_batch_tokens: int) -> List[List[int]]:
+    """
+    Group input indices into batches of similar length
+
+    Indices are sorted by length so each batch pads to a length close to
+    its shortest member. A batch closes when it reaches max_batch_size or
+    when padding every row to its longest member would exceed
+    max_batch_tokens.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        length = lengths[index]
+        if current and (
+            len(current) >= max_batch_size
+            or max(longest, length) * (len(current) + 1) > max_batch_tokens
+        ):
+            batches.append(current)
+            current, longest = [], 0
+        current.append(index)
+        longest = max(longest, length)
+
+    if current:
+        batches.append(current)
+    return batches
+
+class DynamicBatcher:
+    """
+    Queues concurrent generation requests that share a model and
+    generation parameters, and flushes them as one batch when either
+    the batch is full or the oldest request has waited max_wait_ms
+
+    When more requests are queued than fit in one batch, the most urgent
+    priority classes (after aging) go first, and the batch runs at the
+    priority of its most urgent member.
+    """
+
+    def __init__(
+        self,
+        runner: BatchRunner,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+        aging_seconds: float = 10.0
+    ):
+        self.runner = runner
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.aging_seconds = aging_seconds
+        self.stats = BatchStats()
+
+        self._pending: Dict[Hashable, List[PendingGeneration]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # The event loop only holds weak references to running batches
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        model_name: str,
+        prompt: str,
+        generation_kwargs: Dict[str, Any],
+        cancel_token: Optional[CancellationToken] = None
+    ) -> str:
+        """Queue a prompt and wait for its generated text"""
+        loop = asyncio.get_running_loop()
+        key = self._batch_key(model_name, generation_kwargs)
+
+        pending = PendingGeneration(prompt=prompt, future=loop.create_future(), cancel_token=cancel_token)
+        queue = self._pending.setdefault(key, [])
+        queue.append(pending)
+        self.stats.requests_total += 1
+
+        if len(queue) >= self.max_batch_size:
+            self.stats.flushed_on_size += 1
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush_on_timeout, key)
+
+        return await pending.future
+
+    def _batch_key(self, model_name: str, generation_kwargs: Dict[str, Any]) -> Tuple:
+        """Requests are only merged when model and sampling parameters match"""
+        return (model_name, tuple(sorted(generation_kwargs.items())))
+
+    def _flush_on_timeout(self, key: Hashable) -> None:
+        """Timer callback for the max wait window"""
+        self._timers.pop(key, None)
+        if self._pending.get(key):
+            self.stats.flushed_on_timeout += 1
+            self._flush(key)
+
+    def _flush(self, key: Hashable) -> None:
+        """Take up to max_batch_size requests off the queue and run them"""
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        # Requests cancelled while queued never reach the model
+        queue = [item for item in self._pending.get(key, []) if not self._drop_if_cancelled(item)]
+        now = time.monotonic()
+        queue.sort(key=lambda item: aged_rank(item.priority, now - item.enqueued_at, self.aging_seconds))
+        batch, remaining = queue[:self.max_batch_size], queue[self.max_batch_size:]
+        if remaining:
+            self._pending[key] = remaining
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(self.max_wait, self._flush_on_timeout, key)
+        else:
+            self._pending.pop(key, None)
+
+        if not batch:
+            return
+
+        self.stats.batches_total += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        task = asyncio.create_task(self._run_batch(key, batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    def _drop_if_cancelled(self, item: PendingGeneration) -> bool:
+        """Fail a queued request whose caller has gone away"""
+        if item.cancel_token is None or not item.cancel_token.cancelled:
+            return False
+        if not item.future.done():
+            item.future.set_exception(GenerationCancelled(item.cancel_token.reason or "cancelled"))
+        self.stats.cancelled_dropped += 1
+        return True
+
+    async def _run_batch(self, key: Tuple, batch: List[PendingGeneration]) -> None:
+        """Run a merged batch and split results back to each caller"""
+        model_name, kwargs_items = key
+        prompts = [item.prompt for item in batch]
+        # This task's context belongs to whichever request triggered the flush
+        set_priority(min((item.priority for item in batch), key=PRIORITY_CLASSES.__getitem__))
+
+        try:
+            results = await self.runner(
+                model_name, prompts, dict(kwargs_items), [item.cancel_token for item in batch]
+            )
+        except Exception as e:
+            logger.error(f"Batched generation failed for {model_name} ({len(batch)} requests): {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for item, text in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        stats = self.stats.to_dict()
+        stats["queued"] = sum(len(queue) for queue in self._pending.values())
+        return stats
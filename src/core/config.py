@@ -33,6 +33,70 @@ class ModelConfig(BaseSettings):
     mixed_precision: bool = True
     gradient_checkpointing: bool = True
     
+    # Lazy Loading
+    lazy_loading: bool = True
+    preload_models: List[str] = ["telugu_gpt", "telugu_bert"]
+    memory_budget_mb: Optional[float] = None  # Unload LRU idle models above this
+    
+    # Inference Executor
+    inference_workers: Optional[int] = None  # Defaults to cpu_count / torch intra-op threads
+    max_concurrent_inferences_per_model: int = 1
+    scheduler_aging_seconds: float = 10.0  # Waiting this long promotes a request by one priority class
+    
+    # Inference Server ("local" loads models in-process, "remote" uses the model host)
+    inference_mode: str = "local"
+    inference_socket: Path = Path("data/inference.sock")
+    inference_connect_timeout: float = 300.0  # seconds to wait for the model host
+    inference_status_refresh_interval: float = 5.0  # seconds
+    
+    # Dynamic Batching
+    batching_enabled: bool = True
+    max_batch_size: int = 8
+    batch_wait_ms: float = 20.0  # milliseconds
+    
+    # Prompt-Prefix KV Cache
+    prefix_cache_enabled: bool = True
+    prefix_cache_max_mb: float = 256.0
+    
+    # Embedding Cache (in-memory LRU plus float16 store under cache_dir/embeddings)
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_entries: int = 10000
+    embedding_cache_disk: bool = True
+    
+    # Bulk Encoding / Classification (length-bucketed batches)
+    encode_batch_size: int = 32
+    encode_max_batch_tokens: int = 16384
+    
+    # ONNX Runtime Backend (CPU only; exports are cached under cache_dir/onnx)
+    onnx_backend_enabled: bool = False
+    onnx_models: List[str] = ["telugu_bert", "emotion_model", "cultural_model"]
+    onnx_intra_op_threads: Optional[int] = None  # Defaults to torch intra-op threads
+    onnx_parity_tolerance: float = 1e-3
+    
+    # Assisted Decoding (a small draft model proposes tokens the target verifies)
+    draft_model: Optional[str] = None  # e.g. "distilgpt2"; must share the target's tokenizer
+    draft_target_model: str = "telugu_gpt"
+    draft_num_assistant_tokens: int = 5
+    
+    # Early Stopping (end generate() before max_new_tokens is spent)
+    early_stopping_enabled: bool = True
+    repetition_ngram_size: int = 4
+    repetition_max_repeats: int = 3  # Stop once the latest n-gram occurs this often
+    sentence_stop_budget_fraction: Optional[float] = 0.85  # Stop at a sentence end after this share of the budget
+    generation_timeout: Optional[float] = None  # Default per-call decode deadline in seconds
+    
+    # Fast-load Snapshots (memory-mapped safetensors under cache_dir/snapshots, CPU only).
+    # Opt-in: a snapshot is a second full copy of every model's weights on disk
+    snapshots_enabled: bool = False
+    
+    # CPU Precision per model: "fp32", "bf16" or "dynamic_int8"
+    precision: Dict[str, str] = {
+        "telugu_bert": "fp32",
+        "telugu_gpt": "fp32",
+        "emotion_model": "fp32",
+        "cultural_model": "fp32"
+    }
+    
     class Config:
         env_prefix = "MODEL_"
 
@@ -102,6 +166,10 @@ class AgentConfig(BaseSettings):
         }
     }
     
+    # Agent Pool (reusable agent instances per agent type)
+    pool_max_idle: int = 8
+    pool_prewarm: int = 1
+    
     # Collaboration Settings
     max_collaboration_rounds: int = 5
     consensus_threshold: float = 0.7
@@ -199,12 +267,22 @@ class ProductionConfig(BaseSettings):
     # Performance
     max_concurrent_requests: int = 100
     request_timeout: int = 300  # 5 minutes
+    admission_max_queue_wait: float = 30.0  # seconds; longer estimated waits are rejected with 503
     
     # Story Generation
     max_story_length: int = 10000
     min_story_length: int = 500
     default_story_length: int = 2000
     
+    # Long-form Generation (length * scene_tokens_per_word tokens spread over
+    # scene passes of at most scene_max_new_tokens, decoded in batches).
+    # Long-form decodes far more tokens than the single pass, so it is kept
+    # above default_story_length and only taken for explicitly long requests
+    long_form_min_length: int = 5000  # words; shorter stories are generated in one pass
+    long_form_max_scenes: int = 48  # Cap on scene passes; 10,000 words need 40 at the defaults
+    scene_tokens_per_word: float = 2.0
+    scene_max_new_tokens: int = 512  # Keeps prompt plus scene within a 1024-token context
+    
     # Cultural Settings
     default_cultural_context: str = "contemporary_telugu"
     supported_dialects: List[str] = [
@@ -219,6 +297,30 @@ class ProductionConfig(BaseSettings):
     cultural_authenticity_threshold: float = 0.75
     emotional_coherence_threshold: float = 0.8
     
+    # Emotional Arc Analysis
+    emotional_arc_max_segments: int = 256  # Longer stories are windowed down to this
+    emotional_arc_smoothing_window: int = 5  # segments
+    
+    # Result Cache (seeded requests only; disk tier under model.cache_dir/results)
+    result_cache_enabled: bool = True
+    result_cache_max_entries: int = 256
+    result_cache_disk_max_mb: float = 512.0  # 0 disables the disk tier
+    result_cache_ttl_seconds: float = 86400.0
+    
+    # Structure Plan Cache (unseeded requests; reuses plans of similar prompts)
+    plan_cache_enabled: bool = True
+    plan_cache_max_entries: int = 256
+    plan_cache_ttl_seconds: float = 3600.0
+    plan_cache_similarity_threshold: float = 0.92  # cosine similarity of prompt embeddings
+    plan_cache_length_bucket_words: int = 500
+    
+    # Session Store (orchestrator sessions and API generation records)
+    session_store_max_entries: int = 1000
+    session_store_max_mb: float = 64.0
+    session_store_ttl_seconds: float = 3600.0
+    session_store_live_ttl_seconds: float = 21600.0  # Backstop for in-progress records whose request died
+    session_store_sweep_interval: float = 60.0  # seconds
+    
     # Model Configuration
     model: ModelConfig = ModelConfig()
     agents: AgentConfig = AgentConfig()
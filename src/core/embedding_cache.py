@@ -0,0 +1,230 @@
+"""
+Embedding Cache for Telugu Story Engine
+Content-addressed two-tier cache for encode_text results
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 32  # sha256
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a text for cache keys"""
+    # Encoders ignore whitespace runs, and NFC makes visually identical
+    # Telugu strings with different code point orders hash the same
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def embedding_key(model_name: str, revision: str, text: str) -> bytes:
+    """Content address of a text embedded by one model revision"""
+    payload = "\0".join((model_name, revision, normalize_text(text)))
+    return hashlib.sha256(payload.encode("utf-8")).digest()
+
+class DiskEmbeddingStore:
+    """
+    Append-only float16 embedding store for one model revision
+
+    Row i of rows.f16 belongs to the i-th digest in index.bin. Rows are read
+    through a memory map, so only the pages of embeddings actually looked up
+    are brought into memory.
+    """
+
+    def __init__(self, directory: Path, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._data_path = directory / "rows.f16"
+        self._index_path = directory / "index.bin"
+        self._rows: Dict[bytes, int] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._mapped_rows = 0
+
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Read the digest index, ignoring a torn trailing write"""
+        digests = self._index_path.read_bytes() if self._index_path.exists() else b""
+        data_size = self._data_path.stat().st_size if self._data_path.exists() else 0
+        row_count = min(len(digests) // DIGEST_SIZE, data_size // (self.dim * 2))
+
+        for row in range(row_count):
+            self._rows[digests[row * DIGEST_SIZE:(row + 1) * DIGEST_SIZE]] = row
+
+        # Drop any partial record so later appends stay aligned
+        with open(self._index_path, "ab") as f:
+            f.truncate(row_count * DIGEST_SIZE)
+        with open(self._data_path, "ab") as f:
+            f.truncate(row_count * self.dim * 2)
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """Read embeddings, with None for keys that are not stored"""
+        rows = [self._rows.get(key) for key in keys]
+        stored = [row for row in rows if row is not None]
+        if not stored:
+            return [None] * len(keys)
+
+        if self._mmap is None or max(stored) >= self._mapped_rows:
+            self._mapped_rows = len(self._rows)
+            self._mmap = np.memmap(self._data_path, dtype=np.float16, mode="r", shape=(self._mapped_rows, self.dim))
+        return [None if row is None else np.asarray(self._mmap[row], dtype=np.float32) for row in rows]
+
+    def put_many(self, items: Sequence[Tuple[bytes, np.ndarray]]) -> None:
+        """Append embeddings with one write per file"""
+        new_items: Dict[bytes, np.ndarray] = {}
+        for key, embedding in items:
+            if key not in self._rows:
+                new_items[key] = embedding
+        if not new_items:
+            return
+
+        rows = np.stack([embedding.astype(np.float16) for embedding in new_items.values()])
+        with open(self._data_path, "ab") as f:
+            f.write(rows.tobytes())
+        with open(self._index_path, "ab") as f:
+            f.write(b"".join(new_items))
+        for key in new_items:
+            self._rows[key] = len(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+class EmbeddingCache:
+    """
+    In-memory LRU of embeddings backed by optional on-disk stores
+
+    Keys are sha256 digests of (model name, model revision, normalized text),
+    so a model upgrade never serves stale vectors. Disk hits are float16
+    precision and are promoted to the memory tier.
+
+    Lookups and stores work on whole batches of texts and may block on
+    disk, so async callers run them in a worker thread; a lock keeps
+    concurrent batches consistent.
+    """
+
+    def __init__(self, max_entries: int, disk_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._stores: Dict[Tuple[str, str], DiskEmbeddingStore] = {}
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, model_name: str, revision: str, text: str) -> Optional[np.ndarray]:
+        """Look up one embedding in memory, then on disk"""
+        return self.get_many(model_name, revision, [text])[0]
+
+    def get_many(self, model_name: str, revision: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up embeddings in memory, then on disk, with None for misses"""
+        keys = [embedding_key(model_name, revision, text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    results[i] = embedding.copy()
+
+            missing = [i for i, result in enumerate(results) if result is None]
+            store = self._get_store(model_name, revision) if missing else None
+            if store is not None:
+                try:
+                    stored = store.get_many([keys[i] for i in missing])
+                except Exception as e:
+                    logger.warning(f"Embedding store read failed for {model_name}: {e}")
+                    stored = [None] * len(missing)
+                for i, embedding in zip(missing, stored):
+                    if embedding is not None:
+                        self._remember(keys[i], embedding)
+                        self.disk_hits += 1
+                        results[i] = embedding.copy()
+
+            self.misses += sum(1 for result in results if result is None)
+        return results
+
+    def put(self, model_name: str, revision: str, text: str, embedding: np.ndarray) -> None:
+        """Store one embedding in both tiers"""
+        self.put_many(model_name, revision, [text], [embedding])
+
+    def put_many(self, model_name: str, revision: str, texts: Sequence[str], embeddings: Sequence[np.ndarray]) -> None:
+        """Store embeddings in both tiers, appending to disk once per batch"""
+        items = [
+            (embedding_key(model_name, revision, text), np.asarray(embedding, dtype=np.float32))
+            for text, embedding in zip(texts, embeddings)
+        ]
+        if not items:
+            return
+
+        with self._lock:
+            for key, embedding in items:
+                self._remember(key, embedding.copy())
+
+            store = self._get_store(model_name, revision, dim=items[0][1].shape[-1])
+            if store is not None:
+                try:
+                    store.put_many(items)
+                except Exception as e:
+                    logger.warning(f"Embedding store write failed for {model_name}: {e}")
+
+    def _remember(self, key: bytes, embedding: np.ndarray) -> None:
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _get_store(self, model_name: str, revision: str, dim: Optional[int] = None) -> Optional[DiskEmbeddingStore]:
+        """Open the disk store for a model revision, creating it when dim is known"""
+        if self.disk_dir is None:
+            return None
+
+        store = self._stores.get((model_name, revision))
+        if store is not None:
+            return store
+
+        directory = self.disk_dir / model_name / re.sub(r"[^A-Za-z0-9._-]", "_", revision)
+        meta_path = directory / "meta.json"
+        if meta_path.exists():
+            dim = json.loads(meta_path.read_text())["dim"]
+        elif dim is None:
+            return None
+        else:
+            directory.mkdir(parents=True, exist_ok=True)
+            meta_path.write_text(json.dumps({"model": model_name, "revision": revision, "dim": dim}))
+
+        try:
+            store = DiskEmbeddingStore(directory, dim)
+        except Exception as e:
+            logger.warning(f"Disabling embedding store for {model_name}: {e}")
+            return None
+
+        self._stores[(model_name, revision)] = store
+        logger.info(f"Opened embedding store for {model_name}@{revision} with {len(store)} entries")
+        return store
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "disk_entries": sum(len(store) for store in list(self._stores.values())),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+        }
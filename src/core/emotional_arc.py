@@ -0,0 +1,209 @@
+"""
+Emotional Arc Engine for Telugu Story Engine
+Sentence-level emotion trajectories from the emotion classifier
+"""
+
+import logging
+import re
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .config import get_config
+from .model_manager import get_model_manager
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends: Latin punctuation, Devanagari dandas (used in Telugu
+# prose too) and line breaks
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।॥])\s+|\n+")
+
+NEUTRAL_LABEL = "neutral"
+
+# Signed valence per emotion label; labels not listed count as 0
+EMOTION_VALENCE = {
+    "joy": 1.0, "love": 1.0, "optimism": 0.8, "hope": 0.8, "gratitude": 0.8,
+    "satisfaction": 0.7, "pride": 0.6, "trust": 0.6, "relief": 0.6,
+    "compassion": 0.5, "admiration": 0.7, "amusement": 0.8, "approval": 0.5,
+    "caring": 0.6, "excitement": 0.8, "surprise": 0.2, "curiosity": 0.2,
+    "anticipation": 0.2, "nostalgia": 0.1, "longing": -0.2,
+    "sadness": -1.0, "grief": -1.0, "anger": -0.9, "fear": -0.8,
+    "disgust": -0.8, "pessimism": -0.7, "shame": -0.7, "guilt": -0.7,
+    "envy": -0.6, "contempt": -0.7, "anxiety": -0.7, "disappointment": -0.7,
+    "confusion": -0.3, "remorse": -0.7, "nervousness": -0.6, "annoyance": -0.5
+}
+
+STAGES = ("beginning", "middle", "end")
+
+def segment_story(text: str, max_segments: int) -> List[str]:
+    """
+    Split a story into sentences, merging neighbours into windows so
+    that no more than max_segments are classified
+    """
+    sentences = [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence and sentence.strip()]
+    if len(sentences) <= max_segments:
+        return sentences
+
+    windows = np.array_split(np.arange(len(sentences)), max_segments)
+    return [" ".join(sentences[i] for i in window) for window in windows if len(window)]
+
+def rolling_mean(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Centered rolling mean over rows, edge-padded so the shape is kept"""
+    window = max(1, min(window, matrix.shape[0]))
+    if window == 1:
+        return matrix.copy()
+
+    left = window // 2
+    right = window - 1 - left
+    padded = np.pad(matrix, ((left, right), (0, 0)), mode="edge")
+    cumulative = np.cumsum(np.vstack([np.zeros((1, matrix.shape[1])), padded]), axis=0)
+    return (cumulative[window:] - cumulative[:-window]) / window
+
+def local_extrema(curve: np.ndarray, find_peaks: bool) -> np.ndarray:
+    """Indices of strict local maxima (or minima) of a 1-D curve, plateaus counted once"""
+    if curve.size < 3:
+        return np.array([], dtype=int)
+
+    signal = curve if find_peaks else -curve
+    rising = signal[1:-1] > signal[:-2]
+    not_falling_after = signal[1:-1] >= signal[2:]
+    return np.nonzero(rising & not_falling_after)[0] + 1
+
+class EmotionalArcAnalyzer:
+    """
+    Builds a story's emotional arc from sentence-level emotion scores
+
+    Segments are classified through the model manager's batched
+    classify_emotions, the (segments x emotions) probability matrix is
+    smoothed with a rolling mean, and the valence curve derived from it
+    gives the arc's peaks and valleys. The segment cap bounds the number
+    of classifier inputs regardless of story length.
+    """
+
+    def __init__(self, model_manager: Any, max_segments: int = 256, smoothing_window: int = 5, max_extrema: int = 5):
+        self.model_manager = model_manager
+        self.max_segments = max(1, max_segments)
+        self.smoothing_window = max(1, smoothing_window)
+        self.max_extrema = max_extrema
+
+    async def analyze(self, text: str) -> Dict[str, Any]:
+        """Analyze the emotional arc of a story"""
+        segments = segment_story(text, self.max_segments)
+        if not segments:
+            return self.empty_arc()
+
+        scores = await self.model_manager.classify_emotions(segments)
+        labels = list(scores[0].keys())
+        raw = np.array([[score.get(label, 0.0) for label in labels] for score in scores], dtype=np.float64)
+
+        return self._summarize(labels, raw)
+
+    def _summarize(self, labels: List[str], raw: np.ndarray) -> Dict[str, Any]:
+        """Turn per-segment emotion probabilities into arc statistics"""
+        segment_count = raw.shape[0]
+        smoothed = rolling_mean(raw, self.smoothing_window)
+
+        emotional = np.array([label != NEUTRAL_LABEL for label in labels])
+        if not emotional.any():
+            emotional[:] = True
+        valence_weights = np.array([EMOTION_VALENCE.get(label, 0.0) for label in labels])
+
+        intensity = smoothed[:, emotional].max(axis=1)
+        valence = smoothed @ valence_weights
+        dominant = np.where(emotional)[0][smoothed[:, emotional].argmax(axis=1)]
+        positions = (np.arange(segment_count) + 0.5) / segment_count
+
+        # Half the L1 distance between consecutive distributions is in [0, 1]
+        if segment_count > 1:
+            drift = 0.5 * np.abs(np.diff(smoothed, axis=0)).sum(axis=1)
+            consistency = float(1.0 - drift.mean())
+        else:
+            consistency = 1.0
+
+        mean_scores = raw.mean(axis=0)
+        ranked = [labels[i] for i in np.argsort(mean_scores)[::-1] if emotional[i]]
+
+        return {
+            "emotional_progression": [
+                {
+                    "stage": stage,
+                    "dominant_emotion": labels[np.where(emotional)[0][smoothed[part][:, emotional].mean(axis=0).argmax()]],
+                    "intensity": round(float(intensity[part].mean()), 3),
+                    "valence": round(float(valence[part].mean()), 3)
+                }
+                for stage, part in zip(STAGES, np.array_split(np.arange(segment_count), len(STAGES)))
+                if len(part)
+            ],
+            "dominant_emotions": ranked[:3],
+            "emotional_intensity": round(float(intensity.mean()), 3),
+            "emotional_consistency": round(consistency, 3),
+            "peaks": self._extrema(local_extrema(valence, True), positions, valence, intensity, dominant, labels, True),
+            "valleys": self._extrema(local_extrema(valence, False), positions, valence, intensity, dominant, labels, False),
+            "arc": [
+                {
+                    "position": round(float(positions[i]), 3),
+                    "dominant_emotion": labels[dominant[i]],
+                    "intensity": round(float(intensity[i]), 3),
+                    "valence": round(float(valence[i]), 3)
+                }
+                for i in range(segment_count)
+            ],
+            "emotion_distribution": {label: round(float(score), 4) for label, score in zip(labels, mean_scores)},
+            "segments_analyzed": segment_count
+        }
+
+    def _extrema(
+        self,
+        indices: np.ndarray,
+        positions: np.ndarray,
+        valence: np.ndarray,
+        intensity: np.ndarray,
+        dominant: np.ndarray,
+        labels: List[str],
+        peaks: bool
+    ) -> List[Dict[str, Any]]:
+        """Strongest extrema in story order"""
+        if indices.size == 0:
+            return []
+
+        strength = valence[indices] if peaks else -valence[indices]
+        strongest = np.sort(indices[np.argsort(strength)[::-1][:self.max_extrema]])
+        return [
+            {
+                "position": round(float(positions[i]), 3),
+                "dominant_emotion": labels[dominant[i]],
+                "intensity": round(float(intensity[i]), 3),
+                "valence": round(float(valence[i]), 3)
+            }
+            for i in strongest
+        ]
+
+    @staticmethod
+    def empty_arc() -> Dict[str, Any]:
+        """Arc for a story with nothing to analyze"""
+        return {
+            "emotional_progression": [],
+            "dominant_emotions": [],
+            "emotional_intensity": 0.0,
+            "emotional_consistency": 0.0,
+            "peaks": [],
+            "valleys": [],
+            "arc": [],
+            "emotion_distribution": {},
+            "segments_analyzed": 0
+        }
+
+# Global analyzer instance
+_emotional_arc_analyzer: Optional[EmotionalArcAnalyzer] = None
+
+def get_emotional_arc_analyzer() -> EmotionalArcAnalyzer:
+    """Get the global emotional arc analyzer"""
+    global _emotional_arc_analyzer
+    if _emotional_arc_analyzer is None:
+        config = get_config()
+        _emotional_arc_analyzer = EmotionalArcAnalyzer(
+            get_model_manager(),
+            max_segments=config.emotional_arc_max_segments,
+            smoothing_window=config.emotional_arc_smoothing_window
+        )
+    return _emotional_arc_analyzer
@@ -0,0 +1,113 @@
+"""
+Inference Executor for Telugu Story Engine
+Runs blocking model inference off the asyncio event loop
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, TypeVar
+
+import torch
+
+from .scheduler import PriorityScheduler, get_priority
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for model inference with per-model concurrency limits
+
+    torch releases the GIL inside its kernels, so running forward passes on
+    worker threads keeps the event loop free for health checks, WebSocket
+    pings and other requests while generation is in progress. Callers
+    waiting for a model are served by a PriorityScheduler rather than in
+    arrival order.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_concurrency_per_model: int = 1,
+        aging_seconds: float = 10.0
+    ):
+        if max_workers is None:
+            # Each forward pass already fans out over torch's intra-op
+            # threads, so more workers than that would oversubscribe the CPU
+            max_workers = max(1, (os.cpu_count() or 1) // max(1, torch.get_num_threads()))
+
+        self.max_workers = max_workers
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self.aging_seconds = aging_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._schedulers: Dict[str, PriorityScheduler] = {}
+        self._active: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+
+        logger.info(
+            f"Initialized InferenceExecutor with {max_workers} workers, "
+            f"{self.max_concurrency_per_model} concurrent inference(s) per model"
+        )
+
+    def _get_scheduler(self, model_name: str) -> PriorityScheduler:
+        """Get the concurrency limiter for a model"""
+        if model_name not in self._schedulers:
+            self._schedulers[model_name] = PriorityScheduler(self.max_concurrency_per_model, self.aging_seconds)
+        return self._schedulers[model_name]
+
+    async def run(self, model_name: str, fn: Callable[..., T], *args, cost: float = 0.0, **kwargs) -> T:
+        """
+        Run a blocking inference call on the executor and await its result
+
+        The call waits for a slot at the current task's priority class;
+        cost is its estimated size in decode steps (see
+        estimate_generation_cost) and orders waiters within a class.
+        """
+        loop = asyncio.get_running_loop()
+        scheduler = self._get_scheduler(model_name)
+
+        self._waiting[model_name] = self._waiting.get(model_name, 0) + 1
+        try:
+            await scheduler.acquire(get_priority(), cost)
+        finally:
+            self._waiting[model_name] -= 1
+
+        self._active[model_name] = self._active.get(model_name, 0) + 1
+
+        def _release(_):
+            self._active[model_name] -= 1
+            scheduler.release()
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            _release(None)
+            raise
+
+        # Release the slot when the worker thread finishes, not when the
+        # awaiting coroutine does - a cancelled caller must not let another
+        # inference start while this one is still running on the CPU
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(_release, f))
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics"""
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency_per_model": self.max_concurrency_per_model,
+            "active": dict(self._active),
+            "waiting": dict(self._waiting),
+            "scheduling": {
+                model_name: scheduler.get_stats()
+                for model_name, scheduler in self._schedulers.items()
+            }
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("InferenceExecutor shut down")
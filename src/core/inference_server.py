@@ -0,0 +1,575 @@
+"""
+Inference Server for Telugu Story Engine
+A single model-host process shared by all API workers over a Unix socket
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import struct
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union, AsyncGenerator, Awaitable, Callable, Set
+
+import numpy as np
+
+from .config import get_config
+from .model_manager import TeluguModelManager, ModelInfo
+from .cancellation import CancellationToken, GenerationCancelled
+from .scheduler import DEFAULT_PRIORITY, get_priority, set_priority
+
+logger = logging.getLogger(__name__)
+
+# Frames are a 4-byte big-endian length followed by a UTF-8 JSON body
+_HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one length-prefixed JSON frame"""
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds limit of {MAX_FRAME_SIZE}")
+    body = await reader.readexactly(length)
+    return json.loads(body.decode("utf-8"))
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encode one length-prefixed JSON frame"""
+    body = json.dumps(message, ensure_ascii=False, default=_json_default).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+def _json_default(value: Any) -> Any:
+    """JSON encoder for numpy and datetime values"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def error_from_message(message: Dict[str, Any]) -> Exception:
+    """Rebuild the exception carried by an error frame"""
+    error_cls = {
+        "ValueError": ValueError,
+        "GenerationCancelled": GenerationCancelled
+    }.get(message.get("error_type"), RuntimeError)
+    return error_cls(message["error"])
+
+def model_info_to_dict(info: ModelInfo) -> Dict[str, Any]:
+    """Serialize ModelInfo for the wire"""
+    return asdict(info)
+
+def model_info_from_dict(data: Dict[str, Any]) -> ModelInfo:
+    """Deserialize ModelInfo from the wire"""
+    data = dict(data)
+    for key in ("load_time", "load_started_at"):
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    return ModelInfo(**data)
+
+class InferenceServer:
+    """
+    Model host process endpoint
+    Owns the only TeluguModelManager so weights are loaded once per node
+    """
+
+    # Methods API workers may call on the model host
+    METHODS = (
+        "ping",
+        "generate_text",
+        "generate_texts",
+        "encode_text",
+        "encode_texts",
+        "classify_emotion",
+        "classify_emotions",
+        "get_model_info",
+        "get_model_revision",
+        "get_batching_stats",
+        "get_executor_stats",
+        "get_startup_report",
+        "get_prefix_cache_stats",
+        "get_embedding_cache_stats",
+        "get_generation_stats",
+        "register_prompt_prefix",
+        "reload_models",
+        "get_cancellation_stats"
+    )
+
+    # Methods that take a cancel_token; API workers cancel them with a
+    # {"id": ..., "cancel": true} frame
+    CANCELLABLE_METHODS = (
+        "generate_text",
+        "generate_texts",
+        "stream_text"
+    )
+
+    # Methods that answer with a sequence of chunk frames and a final frame
+    STREAMING_METHODS = (
+        "stream_text",
+    )
+
+    def __init__(self, model_manager: TeluguModelManager, socket_path: Union[str, Path]):
+        self.model_manager = model_manager
+        self.socket_path = Path(socket_path)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening on the Unix socket"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        # Only processes running as the same user may talk to the model host
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Inference server listening on {self.socket_path}")
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one API worker connection; requests on it run concurrently"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        cancel_tokens: Dict[Any, CancellationToken] = {}
+
+        try:
+            while True:
+                try:
+                    message = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                if message.get("cancel"):
+                    token = cancel_tokens.get(message.get("id"))
+                    if token is not None:
+                        token.cancel("cancelled by API worker")
+                    continue
+
+                if message.get("method") in self.CANCELLABLE_METHODS:
+                    token = CancellationToken()
+                    cancel_tokens[message.get("id")] = token
+                    message.setdefault("params", {})["cancel_token"] = token
+
+                task = asyncio.create_task(self._handle_request(message, writer, write_lock))
+                task.add_done_callback(lambda _, request_id=message.get("id"): cancel_tokens.pop(request_id, None))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except Exception as e:
+            logger.error(f"Inference server connection error: {e}")
+        finally:
+            # The API worker is gone, so nothing it asked for is still wanted
+            for token in cancel_tokens.values():
+                token.cancel("API worker disconnected")
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handle_request(
+        self,
+        message: Dict[str, Any],
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock
+    ) -> None:
+        """Dispatch a single request and write its response"""
+        request_id = message.get("id")
+        method = message.get("method")
+        params = message.get("params", {})
+
+        try:
+            # Each request runs in its own task, so this only affects it
+            set_priority(message.get("priority", DEFAULT_PRIORITY))
+            if method in self.STREAMING_METHODS:
+                async for chunk in getattr(self.model_manager, method)(**params):
+                    await self._write(writer, write_lock, {"id": request_id, "chunk": chunk})
+                response = {"id": request_id, "result": None}
+            elif method in self.METHODS:
+                result = await self._dispatch(method, params)
+                response = {"id": request_id, "result": result}
+            else:
+                raise ValueError(f"Unknown inference server method: {method}")
+        except Exception as e:
+            response = {"id": request_id, "error": str(e), "error_type": type(e).__name__}
+
+        await self._write(writer, write_lock, response)
+
+    async def _write(self, writer: asyncio.StreamWriter, write_lock: asyncio.Lock, message: Dict[str, Any]) -> None:
+        """Write one frame to a connection"""
+        async with write_lock:
+            writer.write(encode_frame(message))
+            await writer.drain()
+
+    async def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Call the model manager"""
+        if method == "ping":
+            return "pong"
+        if method == "get_model_info":
+            return {
+                name: model_info_to_dict(info)
+                for name, info in self.model_manager.get_model_info().items()
+            }
+        if method == "get_batching_stats":
+            return self.model_manager.get_batching_stats()
+        if method == "get_executor_stats":
+            return self.model_manager.get_executor_stats()
+        if method == "get_startup_report":
+            return self.model_manager.get_startup_report()
+        if method == "get_prefix_cache_stats":
+            return self.model_manager.get_prefix_cache_stats()
+        if method == "get_embedding_cache_stats":
+            return self.model_manager.get_embedding_cache_stats()
+        if method == "get_generation_stats":
+            return self.model_manager.get_generation_stats()
+        if method == "get_cancellation_stats":
+            return self.model_manager.get_cancellation_stats()
+        if method == "register_prompt_prefix":
+            return self.model_manager.register_prompt_prefix(**params)
+
+        return await getattr(self.model_manager, method)(**params)
+
+class RemoteModelManager:
+    """
+    Model manager proxy used by API workers in remote inference mode
+    Exposes the TeluguModelManager inference API over the model host socket
+    """
+
+    def __init__(self, socket_path: Optional[Union[str, Path]] = None):
+        self.config = get_config()
+        self.socket_path = Path(socket_path or self.config.model.inference_socket)
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._streams: Dict[int, asyncio.Queue] = {}
+        self._ids = itertools.count()
+        self._write_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        # Fire-and-forget sends; the event loop only holds weak references
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        # Snapshots for the synchronous status accessors
+        self.model_info: Dict[str, ModelInfo] = {}
+        self._batching_stats: Dict[str, Any] = {}
+        self._executor_stats: Dict[str, Any] = {}
+        self._startup_report: Dict[str, Any] = {}
+        self._prefix_cache_stats: Dict[str, Any] = {}
+        self._embedding_cache_stats: Dict[str, Any] = {}
+        self._generation_stats: Dict[str, Dict[str, Any]] = {}
+        self._cancellation_stats: Dict[str, int] = {}
+
+        # Prompt prefixes are replayed to the model host on every connect
+        self._prompt_prefixes: List[Tuple[str, str]] = []
+
+        logger.info(f"Initialized RemoteModelManager for {self.socket_path}")
+
+    async def initialize_models(self) -> None:
+        """Connect to the model host, waiting for it to finish loading"""
+        timeout = self.config.model.inference_connect_timeout
+        deadline = asyncio.get_running_loop().time() + timeout
+
+        while True:
+            try:
+                await self._ensure_connected()
+                await self._call("ping")
+                break
+            except (ConnectionError, FileNotFoundError, OSError) as e:
+                if asyncio.get_running_loop().time() >= deadline:
+                    raise RuntimeError(
+                        f"Inference server at {self.socket_path} not reachable after {timeout}s: {e}"
+                    )
+                await asyncio.sleep(1.0)
+
+        await self.refresh_status()
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+        logger.info(f"Connected to inference server with {len(self.model_info)} models")
+
+    async def _ensure_connected(self) -> None:
+        """Reconnect once, however many callers find the connection closed"""
+        async with self._connect_lock:
+            if self._writer is None:
+                await self._connect()
+
+    async def _connect(self) -> None:
+        """Open the socket, start the response reader and replay prompt prefixes"""
+        self._reader, self._writer = await asyncio.open_unix_connection(str(self.socket_path))
+        self._read_task = asyncio.create_task(self._read_loop())
+
+        # A restarted model host has an empty prefix cache. Replay sends on
+        # the new connection directly; _call would wait on the connect lock
+        for model_name, prefix_text in self._prompt_prefixes:
+            await self._request("register_prompt_prefix", model_name=model_name, prefix_text=prefix_text)
+
+    async def _read_loop(self) -> None:
+        """Resolve pending calls as responses arrive"""
+        try:
+            while True:
+                message = await read_frame(self._reader)
+                stream = self._streams.get(message.get("id"))
+                if stream is not None:
+                    stream.put_nowait(message)
+                    continue
+
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(error_from_message(message))
+                else:
+                    future.set_result(message.get("result"))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            logger.error(f"Lost connection to inference server: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Inference server connection closed"))
+            self._pending.clear()
+            for stream in self._streams.values():
+                stream.put_nowait({"error": "Inference server connection closed", "error_type": "ConnectionError"})
+            self._writer = None
+
+    async def _call(self, method: str, cancel_token: Optional[CancellationToken] = None, **params) -> Any:
+        """Send a request to the model host and await its response"""
+        if self._writer is None:
+            await self._ensure_connected()
+        return await self._request(method, cancel_token, **params)
+
+    async def _request(self, method: str, cancel_token: Optional[CancellationToken] = None, **params) -> Any:
+        """Send a request on the open connection and await its response"""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        async with self._write_lock:
+            if self._writer is None:
+                self._pending.pop(request_id, None)
+                raise ConnectionError("Inference server connection closed")
+            self._writer.write(encode_frame({"id": request_id, "method": method, "params": params, "priority": get_priority()}))
+            await self._writer.drain()
+
+        if cancel_token is None:
+            return await future
+
+        forward_cancel = self._cancel_forwarder(request_id)
+        cancel_token.add_callback(forward_cancel)
+        try:
+            return await future
+        finally:
+            cancel_token.remove_callback(forward_cancel)
+
+    def _cancel_forwarder(self, request_id: int) -> Callable[[], None]:
+        """Callback that tells the model host to cancel a request"""
+        loop = asyncio.get_running_loop()
+
+        async def send_cancel() -> None:
+            if self._writer is None:
+                return
+            async with self._write_lock:
+                self._writer.write(encode_frame({"id": request_id, "cancel": True}))
+                await self._writer.drain()
+
+        def forward() -> None:
+            # Tokens may be cancelled from any thread
+            loop.call_soon_threadsafe(self._spawn, send_cancel())
+        return forward
+
+    def _spawn(self, coro: Awaitable[Any]) -> None:
+        """Run a fire-and-forget coroutine, keeping its task alive until done"""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _call_stream(
+        self,
+        method: str,
+        cancel_token: Optional[CancellationToken] = None,
+        **params
+    ) -> AsyncGenerator[Any, None]:
+        """Send a streaming request and yield chunks as they arrive"""
+        if self._writer is None:
+            await self._ensure_connected()
+
+        request_id = next(self._ids)
+        stream: asyncio.Queue = asyncio.Queue()
+        self._streams[request_id] = stream
+        forward_cancel = self._cancel_forwarder(request_id)
+        finished = False
+
+        if cancel_token is not None:
+            cancel_token.add_callback(forward_cancel)
+
+        try:
+            async with self._write_lock:
+                if self._writer is None:
+                    finished = True
+                    raise ConnectionError("Inference server connection closed")
+                self._writer.write(encode_frame({"id": request_id, "method": method, "params": params, "priority": get_priority()}))
+                await self._writer.drain()
+
+            while True:
+                message = await stream.get()
+                if "chunk" in message:
+                    yield message["chunk"]
+                elif "error" in message:
+                    finished = True
+                    raise error_from_message(message)
+                else:
+                    finished = True
+                    break
+        finally:
+            self._streams.pop(request_id, None)
+            if cancel_token is not None:
+                cancel_token.remove_callback(forward_cancel)
+            # The consumer stopped reading early; stop the model host too
+            if not finished:
+                forward_cancel()
+
+    async def _refresh_loop(self) -> None:
+        """Keep status snapshots fresh for health and metrics endpoints"""
+        while True:
+            await asyncio.sleep(self.config.model.inference_status_refresh_interval)
+            try:
+                await self.refresh_status()
+            except Exception as e:
+                logger.warning(f"Failed to refresh inference server status: {e}")
+
+    async def refresh_status(self) -> None:
+        """Fetch model info and stats from the model host"""
+        info = await self._call("get_model_info")
+        self.model_info = {name: model_info_from_dict(data) for name, data in info.items()}
+        self._batching_stats = await self._call("get_batching_stats")
+        self._executor_stats = await self._call("get_executor_stats")
+        self._startup_report = await self._call("get_startup_report")
+        self._prefix_cache_stats = await self._call("get_prefix_cache_stats")
+        self._embedding_cache_stats = await self._call("get_embedding_cache_stats")
+        self._generation_stats = await self._call("get_generation_stats")
+        self._cancellation_stats = await self._call("get_cancellation_stats")
+
+    async def generate_text(self, model_name: str, prompt: str, **kwargs) -> str:
+        """Generate text on the model host"""
+        return await self._call("generate_text", model_name=model_name, prompt=prompt, **kwargs)
+
+    async def generate_texts(self, model_name: str, prompts: List[str], **kwargs) -> List[str]:
+        """Generate continuations of several prompts on the model host"""
+        return await self._call("generate_texts", model_name=model_name, prompts=prompts, **kwargs)
+
+    async def stream_text(self, model_name: str, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        """Stream generated text chunks from the model host"""
+        async for chunk in self._call_stream("stream_text", model_name=model_name, prompt=prompt, **kwargs):
+            yield chunk
+
+    def register_prompt_prefix(self, model_name: str, prefix_text: str) -> None:
+        """Register a fixed prompt preamble with the model host's prefix cache"""
+        if (model_name, prefix_text) in self._prompt_prefixes:
+            return
+        self._prompt_prefixes.append((model_name, prefix_text))
+
+        # Agents are created after startup, so forward late registrations now
+        if self._writer is not None:
+            self._spawn(self._call("register_prompt_prefix", model_name=model_name, prefix_text=prefix_text))
+
+    async def reload_models(self, model_names: Optional[List[str]] = None) -> List[str]:
+        """Start hot reloads on the model host"""
+        return await self._call("reload_models", model_names=model_names)
+
+    async def encode_text(self, model_name: str, text: str) -> np.ndarray:
+        """Encode text to embeddings on the model host"""
+        embedding = await self._call("encode_text", model_name=model_name, text=text)
+        return np.asarray(embedding, dtype=np.float32)
+
+    async def encode_texts(self, model_name: str, texts: List[str]) -> np.ndarray:
+        """Encode many texts to an embedding array on the model host"""
+        embeddings = await self._call("encode_texts", model_name=model_name, texts=texts)
+        return np.asarray(embeddings, dtype=np.float32)
+
+    async def get_model_revision(self, model_name: str) -> str:
+        """Revision of the weights a model on the model host serves"""
+        return await self._call("get_model_revision", model_name=model_name)
+
+    async def classify_emotion(self, text: str) -> Dict[str, float]:
+        """Classify emotions on the model host"""
+        return await self._call("classify_emotion", text=text)
+
+    async def classify_emotions(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Classify emotions in many texts on the model host"""
+        return await self._call("classify_emotions", texts=texts)
+
+    def get_model_info(self, model_name: Optional[str] = None) -> Union[ModelInfo, Dict[str, ModelInfo]]:
+        """Get information about models loaded on the model host"""
+        if model_name:
+            return self.model_info.get(model_name)
+        return self.model_info
+
+    def get_memory_usage(self) -> Dict[str, float]:
+        """Get memory usage for all models on the model host"""
+        return {
+            name: info.memory_usage
+            for name, info in self.model_info.items()
+            if info.memory_usage is not None
+        }
+
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Get dynamic batching statistics from the model host"""
+        return self._batching_stats
+
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Get inference executor statistics from the model host"""
+        return self._executor_stats
+
+    def get_startup_report(self) -> Dict[str, Any]:
+        """Get the model host's startup report"""
+        return self._startup_report
+
+    def get_prefix_cache_stats(self) -> Dict[str, Any]:
+        """Get prompt-prefix KV cache statistics from the model host"""
+        return self._prefix_cache_stats
+
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics from the model host"""
+        return self._embedding_cache_stats
+
+    def get_generation_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-model generation throughput from the model host"""
+        return self._generation_stats
+
+    def get_cancellation_stats(self) -> Dict[str, int]:
+        """Get counters of cancelled generation work from the model host"""
+        return self._cancellation_stats
+
+    def save_model_cache(self, cache_path: Optional[Path] = None) -> None:
+        """Model metadata is owned by the model host"""
+        pass
+
+    def shutdown(self) -> None:
+        """Close the connection to the model host"""
+        for task in (self._refresh_task, self._read_task):
+            if task:
+                task.cancel()
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+async def run_inference_server(socket_path: Optional[Union[str, Path]] = None) -> None:
+    """Load all models once and serve them to API workers"""
+    config = get_config()
+    socket_path = socket_path or config.model.inference_socket
+
+    model_manager = TeluguModelManager()
+    await model_manager.initialize_models()
+
+    server = InferenceServer(model_manager, socket_path)
+    try:
+        await server.serve_forever()
+    finally:
+        model_manager.save_model_cache()
+        model_manager.shutdown()
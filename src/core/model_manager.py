@@ -5,13 +5,17 @@ Real AI model loading and management - NO MOCKS, NO FALLBACKS
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Union
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager, AsyncExitStack
+from typing import Dict, Any, Optional, List, Union, Tuple, Callable, AsyncIterator, AsyncGenerator
 from pathlib import Path
 import torch
 from transformers import (
     AutoTokenizer, AutoModel, AutoModelForCausalLM,
     AutoModelForSequenceClassification, pipeline,
-    BitsAndBytesConfig, TrainingArguments
+    BitsAndBytesConfig, TrainingArguments, StoppingCriteriaList
 )
 from sentence_transformers import SentenceTransformer
 import numpy as np
@@ -21,9 +25,55 @@ import pickle
 from datetime import datetime
 
 from .config import get_config
+from .batching import DynamicBatcher, bucket_by_length
+from .inference_executor import InferenceExecutor
+from .embedding_cache import EmbeddingCache
+from .onnx_backend import OnnxBackend, OnnxModel
+from .precision import apply_precision, state_dict_nbytes
+from .snapshots import SnapshotStore
+from .model_revision import local_revision, resolve_source_revision
+from .prefix_cache import PrefixKVCache
+from .stopping import build_stopping_criteria, summarize_early_stops
+from .cancellation import CancellationToken, GenerationCancelled
+from .scheduler import estimate_generation_cost
+from .streaming import TeluguTextStreamer
 
 logger = logging.getLogger(__name__)
 
+# Registry name of the optional assisted-decoding draft model
+DRAFT_MODEL_NAME = "draft_model"
+
+# Models every deployment registers, with their model types
+CORE_MODELS = [
+    ("telugu_bert", "text_understanding"),
+    ("telugu_gpt", "text_generation"),
+    ("emotion_model", "emotion_classification"),
+    ("cultural_model", "cultural_adaptation")
+]
+
+# Fallback labels for emotion checkpoints that ship without an id2label map
+DEFAULT_EMOTION_LABELS = [
+    "joy", "sadness", "anger", "fear", "surprise", "disgust", "love",
+    "optimism", "pessimism", "trust", "anticipation", "shame", "guilt",
+    "pride", "envy", "gratitude", "hope", "compassion", "contempt",
+    "anxiety", "relief", "disappointment", "satisfaction", "confusion",
+    "curiosity", "nostalgia", "longing"
+]
+
+@contextmanager
+def seeded_rng(seed: Optional[int], device: torch.device):
+    """Sample from a private RNG stream seeded with seed, restoring the global state after"""
+    if seed is None:
+        yield
+        return
+    
+    devices = [device.index or 0] if device.type == "cuda" else []
+    # The torch RNG is process-wide, so runs are only reproducible when no
+    # other executor thread samples on the same device at the same time
+    with torch.random.fork_rng(devices=devices):
+        torch.manual_seed(seed)
+        yield
+
 @dataclass
 class ModelInfo:
     """Model information and metadata"""
@@ -35,6 +85,34 @@ class ModelInfo:
     load_time: Optional[datetime] = None
     memory_usage: Optional[float] = None
     parameters: Optional[int] = None
+    load_started_at: Optional[datetime] = None
+    load_duration: Optional[float] = None  # seconds
+    revision: Optional[str] = None
+    precision: Optional[str] = None
+    reload_status: Optional[Dict[str, Any]] = None
+
+class ForwardCounter:
+    """Counts a model's forward passes made by the current thread while active"""
+    
+    def __init__(self, model: Optional[torch.nn.Module]):
+        self.model = model
+        self.count = 0
+        self._thread_id = threading.get_ident()
+        self._handle = None
+    
+    def _hook(self, module, inputs, outputs) -> None:
+        # Other executor threads may run the same model concurrently
+        if threading.get_ident() == self._thread_id:
+            self.count += 1
+    
+    def __enter__(self) -> "ForwardCounter":
+        if self.model is not None:
+            self._handle = self.model.register_forward_hook(self._hook)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        if self._handle is not None:
+            self._handle.remove()
 
 class TeluguModelManager:
     """
@@ -48,8 +126,86 @@ class TeluguModelManager:
         self.tokenizers: Dict[str, Any] = {}
         self.model_info: Dict[str, ModelInfo] = {}
         self.device = torch.device(self.config.model.device)
+        
+        # Lazy loading state: registered models, LRU order and in-use counts
+        self.model_registry: Dict[str, str] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+        self._model_refs: Dict[str, int] = {}
+        
+        # Hot reload state: leases per model version (keyed by object id),
+        # replaced versions waiting for their leases to drain, reload tasks
+        self._version_refs: Dict[int, int] = {}
+        self._retired_versions: Dict[int, asyncio.Event] = {}
+        self._reload_tasks: Dict[str, asyncio.Task] = {}
+        self.startup_report: Dict[str, Any] = {}
+        
+        # Source revisions of models not in memory, for get_model_revision
+        self._source_revisions: Dict[str, str] = {}
+        
+        # Decode throughput per model, updated from executor threads
+        self._generation_stats: Dict[str, Dict[str, float]] = {}
+        self._generation_stats_lock = threading.Lock()
+        self._cancellation_stats: Dict[str, int] = {
+            "requests_cancelled": 0,
+            "batches_skipped": 0,
+            "tokens_wasted": 0
+        }
+        self._draft_compatible: Dict[str, bool] = {}
         self.quantization_config = self._setup_quantization()
         
+        # Blocking inference runs here, off the asyncio event loop
+        self.executor = InferenceExecutor(
+            max_workers=self.config.model.inference_workers,
+            max_concurrency_per_model=self.config.model.max_concurrent_inferences_per_model,
+            aging_seconds=self.config.model.scheduler_aging_seconds
+        )
+        
+        # Merge concurrent generate_text calls into batched forward passes
+        self.batcher: Optional[DynamicBatcher] = None
+        if self.config.model.batching_enabled:
+            self.batcher = DynamicBatcher(
+                self._generate_batch,
+                max_batch_size=self.config.model.max_batch_size,
+                max_wait_ms=self.config.model.batch_wait_ms,
+                aging_seconds=self.config.model.scheduler_aging_seconds
+            )
+        
+        # Reuse key/value states of registered prompt preambles
+        self.prefix_cache: Optional[PrefixKVCache] = None
+        if self.config.model.prefix_cache_enabled:
+            self.prefix_cache = PrefixKVCache(
+                max_bytes=int(self.config.model.prefix_cache_max_mb * 1024 * 1024)
+            )
+        
+        # Reuse embeddings of texts that were already encoded
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        if self.config.model.embedding_cache_enabled:
+            self.embedding_cache = EmbeddingCache(
+                max_entries=self.config.model.embedding_cache_max_entries,
+                disk_dir=(
+                    self.config.model.cache_dir / "embeddings"
+                    if self.config.model.embedding_cache_disk else None
+                )
+            )
+        
+        # Serve encoder and classifier models through ONNX Runtime on CPU
+        self.onnx_backend: Optional[OnnxBackend] = None
+        if self.config.model.onnx_backend_enabled and self.device.type == "cpu":
+            self.onnx_backend = OnnxBackend(
+                export_dir=self.config.model.cache_dir / "onnx",
+                intra_op_threads=self.config.model.onnx_intra_op_threads,
+                parity_tolerance=self.config.model.onnx_parity_tolerance
+            )
+        
+        # Map converted weights from disk instead of re-running from_pretrained
+        self.snapshots: Optional[SnapshotStore] = None
+        if self.config.model.snapshots_enabled and self.device.type == "cpu":
+            self.snapshots = SnapshotStore(
+                self.config.model.cache_dir / "snapshots",
+                source_cache_dir=self.config.model.cache_dir
+            )
+        
         # Ensure model directories exist
         self.config.model.models_dir.mkdir(parents=True, exist_ok=True)
         self.config.model.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -70,20 +226,31 @@ class TeluguModelManager:
     async def initialize_models(self) -> None:
         """Initialize all required models for Telugu story generation"""
         logger.info("Starting model initialization...")
+        startup_start = datetime.now()
         
         # Define models to load
-        models_to_load = [
-            ("telugu_bert", "text_understanding"),
-            ("telugu_gpt", "text_generation"),
-            ("emotion_model", "emotion_classification"),
-            ("cultural_model", "cultural_adaptation")
-        ]
+        models_to_load = list(CORE_MODELS)
+        
+        if self.config.model.draft_model:
+            models_to_load.append((DRAFT_MODEL_NAME, "text_generation"))
+        
+        for model_name, model_type in models_to_load:
+            self.register_model(model_name, model_type)
+        
+        # With lazy loading only the preload set is loaded up front;
+        # everything else is loaded on first use
+        if self.config.model.lazy_loading:
+            models_to_load = [
+                (model_name, model_type)
+                for model_name, model_type in models_to_load
+                if model_name in self.config.model.preload_models
+            ]
         
         # Load models concurrently where possible
         tasks = []
         for model_name, model_type in models_to_load:
             task = asyncio.create_task(
-                self._load_model_async(model_name, model_type)
+                self.ensure_model_loaded(model_name)
             )
             tasks.append(task)
         
@@ -97,10 +264,187 @@ class TeluguModelManager:
                 logger.error(f"Failed to load {model_name}: {result}")
                 raise result
         
-        logger.info("All models initialized successfully")
+        logger.info(
+            f"Model initialization complete: {len(self.models)} loaded, "
+            f"{len(self.model_registry) - len(self.models)} registered for lazy loading"
+        )
+        
+        self.startup_report = self._build_startup_report(
+            [model_name for model_name, _ in models_to_load],
+            (datetime.now() - startup_start).total_seconds()
+        )
+        self._log_startup_report(self.startup_report)
+    
+    def _build_startup_report(self, model_names: List[str], wall_time: float) -> Dict[str, Any]:
+        """Summarize per-model load timings for a startup"""
+        loads = sorted(
+            (
+                {
+                    "model": name,
+                    "duration": self.model_info[name].load_duration or 0.0,
+                    "started_at": self.model_info[name].load_started_at
+                }
+                for name in model_names
+                if name in self.model_info
+            ),
+            key=lambda load: load["duration"],
+            reverse=True
+        )
+        sequential_time = sum(load["duration"] for load in loads)
+        
+        # Loads are independent, so the slowest one is the critical path
+        critical_path = loads[0] if loads else None
+        
+        return {
+            "wall_time": round(wall_time, 3),
+            "sequential_time": round(sequential_time, 3),
+            "parallel_speedup": round(sequential_time / wall_time, 2) if wall_time > 0 else 0.0,
+            "critical_path": {
+                "model": critical_path["model"],
+                "duration": round(critical_path["duration"], 3),
+                "share_of_wall_time": round(critical_path["duration"] / wall_time, 3) if wall_time > 0 else 0.0
+            } if critical_path else None,
+            "loads": [
+                {"model": load["model"], "duration": round(load["duration"], 3)}
+                for load in loads
+            ]
+        }
+    
+    def _log_startup_report(self, report: Dict[str, Any]) -> None:
+        """Log the startup report"""
+        logger.info(
+            f"Startup report: {report['wall_time']:.2f}s wall time, "
+            f"{report['sequential_time']:.2f}s if loaded sequentially "
+            f"({report['parallel_speedup']:.2f}x)"
+        )
+        if report["critical_path"]:
+            logger.info(
+                f"Critical path: {report['critical_path']['model']} "
+                f"({report['critical_path']['duration']:.2f}s)"
+            )
+        for load in report["loads"]:
+            logger.info(f"  {load['model']}: {load['duration']:.2f}s")
+    
+    def get_startup_report(self) -> Dict[str, Any]:
+        """Get the model loading report from the last initialization"""
+        return self.startup_report
+    
+    def register_model(self, model_name: str, model_type: str) -> None:
+        """Register a model so it can be loaded on first use"""
+        self.model_registry[model_name] = model_type
+        if model_name not in self.model_info:
+            model_path = self._get_model_path(model_name)
+            self.model_info[model_name] = ModelInfo(
+                name=model_name,
+                model_type=model_type,
+                model_path=str(model_path),
+                tokenizer_path=str(model_path)
+            )
+    
+    async def ensure_model_loaded(self, model_name: str) -> None:
+        """Load a registered model if it is not already in memory"""
+        if model_name in self.models:
+            self._touch(model_name)
+            return
+        
+        if model_name not in self.model_registry:
+            raise ValueError(f"Model {model_name} not loaded")
+        
+        lock = self._load_locks.setdefault(model_name, asyncio.Lock())
+        async with lock:
+            # Another caller may have loaded it while we waited
+            if model_name in self.models:
+                self._touch(model_name)
+                return
+            
+            await self._load_model_async(model_name, self.model_registry[model_name])
+            self._touch(model_name)
+        
+        await self._enforce_memory_budget(keep=model_name)
+    
+    @asynccontextmanager
+    async def use_model(self, model_name: str) -> AsyncIterator[Tuple[Any, Any]]:
+        """
+        Lease a model and its tokenizer for the duration of an inference
+        Leased models are never evicted by the memory budget
+        """
+        await self.ensure_model_loaded(model_name)
+        
+        # A hot reload may swap in a new version while this lease is held;
+        # the lease keeps using the version it started with
+        model, tokenizer = self.models[model_name], self.tokenizers[model_name]
+        version = id(model)
+        
+        self._model_refs[model_name] = self._model_refs.get(model_name, 0) + 1
+        self._version_refs[version] = self._version_refs.get(version, 0) + 1
+        try:
+            yield model, tokenizer
+        finally:
+            self._model_refs[model_name] -= 1
+            self._version_refs[version] -= 1
+            if not self._version_refs[version]:
+                del self._version_refs[version]
+                drained = self._retired_versions.pop(version, None)
+                if drained is not None:
+                    drained.set()
+            self._touch(model_name)
+    
+    def _touch(self, model_name: str) -> None:
+        """Mark a model as most recently used"""
+        self._lru[model_name] = None
+        self._lru.move_to_end(model_name)
+    
+    async def _enforce_memory_budget(self, keep: Optional[str] = None) -> None:
+        """Unload least recently used idle models until within the memory budget"""
+        budget = self.config.model.memory_budget_mb
+        if budget is None:
+            return
+        
+        total = sum(self.get_memory_usage().get(name, 0.0) for name in self.models)
+        
+        for model_name in list(self._lru):
+            if total <= budget:
+                break
+            if model_name == keep or self._model_refs.get(model_name, 0) > 0:
+                continue
+            if model_name not in self.models:
+                continue
+            
+            freed = self.model_info[model_name].memory_usage or 0.0
+            logger.info(
+                f"Evicting {model_name} ({freed:.2f}MB) to stay within "
+                f"{budget:.2f}MB memory budget"
+            )
+            await self.unload_model(model_name)
+            total -= freed
+        
+        if total > budget:
+            logger.warning(
+                f"Loaded models use {total:.2f}MB, above the {budget:.2f}MB budget; "
+                f"remaining models are in use"
+            )
     
     async def _load_model_async(self, model_name: str, model_type: str) -> None:
-        """Load a specific model asynchronously"""
+        """Load a specific model on a worker thread so loads run in parallel"""
+        model, tokenizer, info = await self._build_model_async(model_name, model_type)
+        
+        previous = self.model_info.get(model_name)
+        if previous is not None:
+            info.reload_status = previous.reload_status
+        
+        # Store models
+        self.models[model_name] = model
+        self.tokenizers[model_name] = tokenizer
+        self.model_info[model_name] = info
+        self._source_revisions.pop(model_name, None)
+    
+    async def _build_model_async(
+        self,
+        model_name: str,
+        model_type: str,
+        use_snapshot: bool = True
+    ) -> Tuple[Any, Any, ModelInfo]:
+        """Load and convert a model without installing it, returning (model, tokenizer, info)"""
         try:
             start_time = datetime.now()
             logger.info(f"Loading {model_name} ({model_type})...")
@@ -108,28 +452,31 @@ class TeluguModelManager:
             # Get model configuration
             model_path = self._get_model_path(model_name)
             
-            # Load model based on type
-            if model_type == "text_understanding":
-                model, tokenizer = await self._load_bert_model(model_path)
-            elif model_type == "text_generation":
-                model, tokenizer = await self._load_gpt_model(model_path)
-            elif model_type == "emotion_classification":
-                model, tokenizer = await self._load_emotion_model(model_path)
-            elif model_type == "cultural_adaptation":
-                model, tokenizer = await self._load_cultural_model(model_path)
-            else:
-                raise ValueError(f"Unknown model type: {model_type}")
+            # from_pretrained blocks on disk I/O and weight materialization,
+            # so each load gets its own thread instead of the event loop
+            model, tokenizer, revision = await asyncio.to_thread(
+                self._load_model_sync, model_name, model_type, model_path, use_snapshot
+            )
             
-            # Store models
-            self.models[model_name] = model
-            self.tokenizers[model_name] = tokenizer
+            if self.onnx_backend is not None and model_name in self.config.model.onnx_models:
+                model = await asyncio.to_thread(
+                    self.onnx_backend.convert, model_name, model, tokenizer, revision
+                )
+            
+            # Quantization hides weights from parameters(), so count first
+            parameters = (
+                model.num_parameters() if hasattr(model, "num_parameters")
+                else sum(p.numel() for p in model.parameters())
+            )
+            
+            model, precision = await asyncio.to_thread(self._apply_precision, model_name, model)
             
             # Calculate memory usage
             memory_usage = self._calculate_memory_usage(model)
-            parameters = sum(p.numel() for p in model.parameters())
             
-            # Store model info
-            self.model_info[model_name] = ModelInfo(
+            load_duration = (datetime.now() - start_time).total_seconds()
+            
+            info = ModelInfo(
                 name=model_name,
                 model_type=model_type,
                 model_path=str(model_path),
@@ -137,30 +484,75 @@ class TeluguModelManager:
                 loaded=True,
                 load_time=datetime.now(),
                 memory_usage=memory_usage,
-                parameters=parameters
+                parameters=parameters,
+                load_started_at=start_time,
+                load_duration=load_duration,
+                revision=revision,
+                precision=precision
             )
             
-            load_duration = (datetime.now() - start_time).total_seconds()
             logger.info(
-                f"Loaded {model_name}: {parameters:,} parameters, "
+                f"Loaded {model_name}: {parameters:,} parameters, {precision}, "
                 f"{memory_usage:.2f}MB memory, {load_duration:.2f}s"
             )
             
+            return model, tokenizer, info
+            
         except Exception as e:
             logger.error(f"Error loading {model_name}: {e}")
             raise
     
+    def _load_model_sync(self, model_name: str, model_type: str, model_path: str, use_snapshot: bool = True) -> tuple:
+        """Blocking model load from a snapshot or from_pretrained - runs on a worker thread"""
+        # bf16 weights are snapshotted converted; int8 is re-quantized from
+        # fp32 on load because packed int8 weights are not safetensors
+        storage_precision = "bf16" if self.config.model.precision.get(model_name) == "bf16" else "fp32"
+        
+        # Reloads always read the source weights and refresh the snapshot
+        if self.snapshots is not None and use_snapshot:
+            snapshot = self.snapshots.load(model_name, model_type, model_path, storage_precision)
+            if snapshot is not None:
+                model, tokenizer, revision = snapshot
+                if model_type == "text_generation":
+                    self._prepare_generation_tokenizer(tokenizer)
+                return model, tokenizer, revision
+        
+        model, tokenizer = self._load_pretrained_sync(model_type, model_path)
+        revision = self._get_model_revision(model, model_path)
+        
+        if self.snapshots is not None:
+            if storage_precision == "bf16":
+                model = model.to(torch.bfloat16)
+            self.snapshots.save(model_name, model_type, model_path, storage_precision, revision, model, tokenizer)
+        
+        return model, tokenizer, revision
+    
+    def _load_pretrained_sync(self, model_type: str, model_path: str) -> tuple:
+        """Blocking from_pretrained load - runs on a worker thread"""
+        # Load model based on type
+        if model_type == "text_understanding":
+            return self._load_bert_model(model_path)
+        elif model_type == "text_generation":
+            return self._load_gpt_model(model_path)
+        elif model_type == "emotion_classification":
+            return self._load_emotion_model(model_path)
+        elif model_type == "cultural_adaptation":
+            return self._load_cultural_model(model_path)
+        else:
+            raise ValueError(f"Unknown model type: {model_type}")
+    
     def _get_model_path(self, model_name: str) -> str:
         """Get the path for a specific model"""
         model_paths = {
             "telugu_bert": self.config.model.telugu_bert_model,
             "telugu_gpt": self.config.model.telugu_gpt_model,
             "emotion_model": self.config.model.emotion_model,
-            "cultural_model": self.config.model.cultural_model
+            "cultural_model": self.config.model.cultural_model,
+            DRAFT_MODEL_NAME: self.config.model.draft_model
         }
         return model_paths.get(model_name, model_name)
     
-    async def _load_bert_model(self, model_path: str) -> tuple:
+    def _load_bert_model(self, model_path: str) -> tuple:
         """Load BERT-based model for text understanding"""
         tokenizer = AutoTokenizer.from_pretrained(
             model_path,
@@ -183,7 +575,7 @@ class TeluguModelManager:
         model.eval()
         return model, tokenizer
     
-    async def _load_gpt_model(self, model_path: str) -> tuple:
+    def _load_gpt_model(self, model_path: str) -> tuple:
         """Load GPT-based model for text generation"""
         tokenizer = AutoTokenizer.from_pretrained(
             model_path,
@@ -191,9 +583,7 @@ class TeluguModelManager:
             trust_remote_code=True
         )
         
-        # Add padding token if not present
-        if tokenizer.pad_token is None:
-            tokenizer.pad_token = tokenizer.eos_token
+        self._prepare_generation_tokenizer(tokenizer)
         
         model = AutoModelForCausalLM.from_pretrained(
             model_path,
@@ -210,7 +600,16 @@ class TeluguModelManager:
         model.eval()
         return model, tokenizer
     
-    async def _load_emotion_model(self, model_path: str) -> tuple:
+    def _prepare_generation_tokenizer(self, tokenizer: Any) -> None:
+        """Configure a causal LM tokenizer for batched generation"""
+        # Add padding token if not present
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        
+        # Decoder-only models need left padding for batched generation
+        tokenizer.padding_side = "left"
+    
+    def _load_emotion_model(self, model_path: str) -> tuple:
         """Load emotion classification model"""
         tokenizer = AutoTokenizer.from_pretrained(
             model_path,
@@ -233,7 +632,7 @@ class TeluguModelManager:
         model.eval()
         return model, tokenizer
     
-    async def _load_cultural_model(self, model_path: str) -> tuple:
+    def _load_cultural_model(self, model_path: str) -> tuple:
         """Load cultural adaptation model (sentence transformer)"""
         model = SentenceTransformer(
             model_path,
@@ -241,16 +640,98 @@ class TeluguModelManager:
             device=str(self.device)
         )
         
-        # Create a dummy tokenizer for consistency
-        tokenizer = AutoTokenizer.from_pretrained(
-            "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
-            cache_dir=self.config.model.cache_dir
-        )
+        # The configured model's own tokenizer, so encodings and ONNX
+        # exports always match the weights
+        tokenizer = model.tokenizer
         
         return model, tokenizer
     
+    def _get_model_revision(self, model: Any, model_path: str) -> str:
+        """Identify the exact weights a model was loaded from"""
+        if isinstance(model, SentenceTransformer):
+            model = model[0].auto_model
+        
+        # from_pretrained records the hub commit the files were resolved to
+        commit_hash = getattr(getattr(model, "config", None), "_commit_hash", None)
+        if commit_hash:
+            return commit_hash
+        
+        # Local checkpoints are told apart by file times, which the
+        # embedding cache and ONNX exports key on
+        if Path(model_path).is_dir():
+            return local_revision(model_path)
+        # Some loaders (sentence-transformers) do not record the commit
+        return resolve_source_revision(model_path, self.config.model.cache_dir) or str(model_path)
+    
+    async def get_model_revision(self, model_name: str) -> str:
+        """
+        Revision of the weights a model serves, or would serve once loaded
+        Models not in memory resolve it from their configured source, so
+        the answer does not depend on whether a lazy model has loaded yet
+        """
+        info = self.model_info.get(model_name)
+        if info is not None and info.loaded and info.revision:
+            return info.revision
+        
+        if model_name not in self._source_revisions:
+            model_path = self._get_model_path(model_name)
+            revision = await asyncio.to_thread(resolve_source_revision, model_path, self.config.model.cache_dir)
+            self._source_revisions[model_name] = revision or str(model_path)
+        return self._source_revisions[model_name]
+    
+    def check_onnx_parity(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export every model in onnx_models from its source weights and compare
+        ONNX Runtime outputs with PyTorch - blocking, for the check-onnx command
+        """
+        backend = self.onnx_backend or OnnxBackend(
+            export_dir=self.config.model.cache_dir / "onnx",
+            intra_op_threads=self.config.model.onnx_intra_op_threads,
+            parity_tolerance=self.config.model.onnx_parity_tolerance
+        )
+        model_types = dict(CORE_MODELS)
+        
+        report = {}
+        for model_name in self.config.model.onnx_models:
+            if model_name not in model_types:
+                report[model_name] = {"onnx": False, "max_error": None, "reason": "unknown model"}
+                continue
+            
+            model_path = self._get_model_path(model_name)
+            model, tokenizer = self._load_pretrained_sync(model_types[model_name], model_path)
+            revision = self._get_model_revision(model, model_path)
+            converted = backend.convert(model_name, model, tokenizer, revision)
+            
+            max_error = backend.parity_errors.get(model_name)
+            report[model_name] = {
+                "onnx": isinstance(converted, OnnxModel),
+                "max_error": max_error,
+                "reason": (
+                    "parity error above tolerance" if max_error is not None and max_error > backend.parity_tolerance
+                    else None if isinstance(converted, OnnxModel) else "conversion failed"
+                )
+            }
+        return report
+    
+    def _apply_precision(self, model_name: str, model: Any) -> Tuple[Any, str]:
+        """Convert a loaded model to its configured CPU precision - runs on a worker thread"""
+        if isinstance(model, OnnxModel):
+            return model, "onnx"
+        
+        if self.device.type == "cuda":
+            # CUDA loads already go through 4-bit bitsandbytes quantization
+            return model, "nf4" if self.quantization_config is not None else "fp16"
+        
+        precision = self.config.model.precision.get(model_name, "fp32")
+        return apply_precision(model, precision), precision
+    
     def _calculate_memory_usage(self, model) -> float:
         """Calculate model memory usage in MB"""
+        if isinstance(model, torch.nn.Module):
+            # The state dict also covers int8 packed weights that
+            # get_memory_footprint and parameters() do not see
+            return state_dict_nbytes(model) / (1024 * 1024)
+        
         if hasattr(model, 'get_memory_footprint'):
             return model.get_memory_footprint() / (1024 * 1024)
         
@@ -280,107 +761,549 @@ class TeluguModelManager:
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
         top_k: Optional[int] = None,
+        seed: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
         **kwargs
     ) -> str:
-        """Generate text using a specific model"""
-        model = self.get_model(model_name)
-        tokenizer = self.get_tokenizer(model_name)
+        """
+        Generate text using a specific model, reproducibly when a seed is given
+        Decoding stops early once timeout seconds have passed, and within a
+        token of cancel_token being cancelled, raising GenerationCancelled
+        """
+        generation_kwargs = self._build_generation_kwargs(
+            model_name, max_length, max_new_tokens, temperature, top_p, top_k, timeout, **kwargs
+        )
+        if seed is not None:
+            generation_kwargs["seed"] = seed
         
-        # Use config defaults if not specified
-        temperature = temperature or self.config.model.temperature
-        top_p = top_p or self.config.model.top_p
-        top_k = top_k or self.config.model.top_k
+        try:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            
+            # Extra generate() kwargs are request specific and seeded runs
+            # need their own RNG stream, so only plain sampling requests are
+            # merged with other callers
+            if self.batcher is not None and not kwargs and seed is None:
+                text = await self.batcher.submit(model_name, prompt, generation_kwargs, cancel_token)
+            else:
+                results = await self._generate_batch(model_name, [prompt], generation_kwargs, [cancel_token])
+                text = results[0]
+            
+            # A cancelled row comes back truncated; its caller is gone
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            return text
+            
+        except GenerationCancelled:
+            self._record_cancelled_request()
+            raise
+        except Exception as e:
+            logger.error(f"Text generation failed for model {model_name}: {e}")
+            return ""
+    
+    async def generate_texts(
+        self,
+        model_name: str,
+        prompts: List[str],
+        max_length: Optional[int] = None,
+        max_new_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        top_k: Optional[int] = None,
+        seed: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate continuations of several prompts as explicit batches
+        Prompts are split into max_batch_size batches whose rows decode in
+        lockstep. All batches are submitted at once, but the executor runs
+        at most max_concurrent_inferences_per_model of them per model, so
+        with the default of one they run back to back. With a seed, batch i
+        samples from seed + i and is reproducible
+        """
+        generation_kwargs = self._build_generation_kwargs(
+            model_name, max_length, max_new_tokens, temperature, top_p, top_k, timeout, **kwargs
+        )
+        batch_size = max(1, self.config.model.max_batch_size)
+        batches = [prompts[i:i + batch_size] for i in range(0, len(prompts), batch_size)]
         
-        # Tokenize input
-        inputs = tokenizer.encode(prompt, return_tensors="pt").to(self.device)
+        try:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            
+            results = await asyncio.gather(*(
+                self._generate_batch(
+                    model_name,
+                    batch,
+                    {**generation_kwargs, "seed": seed + index} if seed is not None else generation_kwargs,
+                    [cancel_token] * len(batch)
+                )
+                for index, batch in enumerate(batches)
+            ))
+            
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            return [text for batch_texts in results for text in batch_texts]
+            
+        except GenerationCancelled:
+            self._record_cancelled_request()
+            raise
+        except Exception as e:
+            logger.error(f"Batch text generation failed for model {model_name}: {e}")
+            return [""] * len(prompts)
+    
+    async def stream_text(
+        self,
+        model_name: str,
+        prompt: str,
+        max_length: Optional[int] = None,
+        max_new_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        top_k: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """
+        Generate text and yield decoded chunks as tokens are produced
+        Closing the generator early stops decoding within a token
+        """
+        generation_kwargs = self._build_generation_kwargs(
+            model_name, max_length, max_new_tokens, temperature, top_p, top_k, timeout, **kwargs
+        )
+        
+        # Closing the stream cancels this token, which also covers callers
+        # that did not pass one
+        cancel_token = cancel_token or CancellationToken()
+        cancel_token.raise_if_cancelled()
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async with self._use_generation_models(model_name, batch_size=1) as (model, tokenizer, draft):
+            streamer = TeluguTextStreamer(tokenizer, loop, queue)
+            generation = asyncio.ensure_future(self.executor.run(
+                model_name, self._generate_batch_sync,
+                model_name, model, tokenizer, [prompt],
+                {**generation_kwargs, "streamer": streamer}, draft, [cancel_token],
+                cost=estimate_generation_cost([prompt], generation_kwargs["max_new_tokens"])
+            ))
+            # Unblock the consumer even if generate() fails before end()
+            generation.add_done_callback(lambda _: queue.put_nowait(None))
+            
+            try:
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        break
+                    yield chunk
+                
+                # Surface generation errors to the caller
+                await generation
+                if cancel_token.cancelled:
+                    self._record_cancelled_request()
+                    cancel_token.raise_if_cancelled()
+            finally:
+                if not generation.done():
+                    # The consumer went away mid-stream; stop decoding for it
+                    cancel_token.cancel("stream closed")
+                    self._record_cancelled_request()
+                    generation.add_done_callback(lambda task: task.cancelled() or task.exception())
+                    # Hold the model lease until the executor thread leaves
+                    # generate(), so eviction and hot reload never free or
+                    # swap a model that is still decoding
+                    await asyncio.wait([generation])
+    
+    def _build_generation_kwargs(
+        self,
+        model_name: str,
+        max_length: Optional[int],
+        max_new_tokens: Optional[int],
+        temperature: Optional[float],
+        top_p: Optional[float],
+        top_k: Optional[int],
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Resolve generation parameters against config defaults"""
+        # Fail fast on unknown models; registered ones are loaded on demand
+        if model_name not in self.models and model_name not in self.model_registry:
+            raise ValueError(f"Model {model_name} not loaded")
         
         # Use max_new_tokens instead of max_length to avoid issues
         if max_new_tokens is None:
             max_new_tokens = max_length or 200  # Default to 200 new tokens
         
+        # Use config defaults if not specified
+        generation_kwargs = {
+            "max_new_tokens": max_new_tokens,
+            "temperature": temperature or self.config.model.temperature,
+            "top_p": top_p or self.config.model.top_p,
+            "top_k": top_k or self.config.model.top_k,
+            **kwargs
+        }
+        
+        # The deadline starts when decoding does, so equal timeouts still batch
+        timeout = timeout if timeout is not None else self.config.model.generation_timeout
+        if timeout is not None:
+            generation_kwargs["timeout"] = timeout
+        return generation_kwargs
+    
+    async def _generate_batch(
+        self,
+        model_name: str,
+        prompts: List[str],
+        generation_kwargs: Dict[str, Any],
+        cancel_tokens: Optional[List[Optional[CancellationToken]]] = None
+    ) -> List[str]:
+        """Generate continuations for a batch of prompts on the inference executor"""
+        async with self._use_generation_models(model_name, len(prompts)) as (model, tokenizer, draft):
+            return await self.executor.run(
+                model_name, self._generate_batch_sync,
+                model_name, model, tokenizer, prompts, generation_kwargs, draft, cancel_tokens,
+                cost=estimate_generation_cost(prompts, generation_kwargs["max_new_tokens"])
+            )
+    
+    @asynccontextmanager
+    async def _use_generation_models(
+        self,
+        model_name: str,
+        batch_size: int
+    ) -> AsyncIterator[Tuple[Any, Any, Optional[Tuple[Any, Any]]]]:
+        """Lease a generation model plus, when assisted decoding applies, its draft model"""
+        async with AsyncExitStack() as stack:
+            model, tokenizer = await stack.enter_async_context(self.use_model(model_name))
+            
+            # Assisted generation in transformers only supports batch size 1
+            draft = None
+            if (
+                batch_size == 1
+                and model_name == self.config.model.draft_target_model
+                and DRAFT_MODEL_NAME in self.model_registry
+                and self._draft_compatible.get(model_name, True)
+            ):
+                try:
+                    draft = await stack.enter_async_context(self.use_model(DRAFT_MODEL_NAME))
+                except Exception as e:
+                    # Do not retry a failing load on every request
+                    self._draft_compatible[model_name] = False
+                    logger.warning(f"Draft model unavailable, generating without it: {e}")
+            
+            yield model, tokenizer, draft
+    
+    def _generate_batch_sync(
+        self,
+        model_name: str,
+        model: Any,
+        tokenizer: Any,
+        prompts: List[str],
+        generation_kwargs: Dict[str, Any],
+        draft: Optional[Tuple[Any, Any]] = None,
+        cancel_tokens: Optional[List[Optional[CancellationToken]]] = None
+    ) -> List[str]:
+        """Blocking left-padded batch generation - runs on an executor thread"""
+        generation_kwargs = dict(generation_kwargs)
+        seed = generation_kwargs.pop("seed", None)
+        timeout = generation_kwargs.pop("timeout", None)
+        
+        # Every caller may have gone away while the batch waited for a worker
+        if cancel_tokens and all(token is not None and token.cancelled for token in cancel_tokens):
+            with self._generation_stats_lock:
+                self._cancellation_stats["batches_skipped"] += 1
+            raise GenerationCancelled("all requests in the batch were cancelled")
+        
+        # Tokenize input
+        inputs = tokenizer(prompts, return_tensors="pt", padding=True).to(self.device)
+        prompt_length = inputs["input_ids"].shape[1]
+        
+        # Stop rows whose caller went away, that loop, that reach a sentence
+        # end late in the budget or that run past the deadline instead of
+        # decoding every token
+        early_stopping = build_stopping_criteria(
+            tokenizer,
+            prompt_length,
+            generation_kwargs["max_new_tokens"],
+            timeout=timeout,
+            cancel_tokens=cancel_tokens,
+            quality_stops=self.config.model.early_stopping_enabled,
+            repetition_ngram_size=self.config.model.repetition_ngram_size,
+            repetition_max_repeats=self.config.model.repetition_max_repeats,
+            sentence_budget_fraction=self.config.model.sentence_stop_budget_fraction
+        )
+        if early_stopping:
+            generation_kwargs["stopping_criteria"] = StoppingCriteriaList(
+                list(generation_kwargs.get("stopping_criteria") or []) + early_stopping
+            )
+        
+        # Draft proposals keep their own cache, so assisted runs skip the
+        # prefix cache rather than mixing the two
+        assisted = (
+            draft is not None
+            and "past_key_values" not in generation_kwargs
+            and self._check_draft_compatible(model_name, tokenizer, draft[1])
+        )
+        if assisted:
+            draft[0].generation_config.num_assistant_tokens = self.config.model.draft_num_assistant_tokens
+            generation_kwargs = {**generation_kwargs, "assistant_model": draft[0]}
+        
+        # Left padding shifts every row by a different amount, so cached
+        # prefix states only line up for single-prompt batches
+        elif len(prompts) == 1 and "past_key_values" not in generation_kwargs:
+            past_key_values = self._get_prefix_past_key_values(model_name, model, tokenizer, inputs)
+            if past_key_values is not None:
+                generation_kwargs = {**generation_kwargs, "past_key_values": past_key_values}
+        
         # Generate
-        with torch.no_grad():
-            try:
-                outputs = model.generate(
-                    inputs,
-                    max_new_tokens=max_new_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    top_k=top_k,
-                    do_sample=True,
-                    pad_token_id=tokenizer.eos_token_id,
-                    **kwargs
+        start_time = time.perf_counter()
+        target_forwards = ForwardCounter(model if assisted else None)
+        draft_forwards = ForwardCounter(draft[0] if assisted else None)
+        with torch.no_grad(), target_forwards, draft_forwards, seeded_rng(seed, self.device):
+            outputs = model.generate(
+                **inputs,
+                do_sample=True,
+                pad_token_id=tokenizer.pad_token_id,
+                **generation_kwargs
+            )
+        elapsed = time.perf_counter() - start_time
+        
+        # Check if outputs is valid
+        if outputs is None or len(outputs) == 0:
+            logger.warning(f"Model {model_name} generated empty output")
+            return [""] * len(prompts)
+        
+        # Left padding aligns every prompt to the same length, so the
+        # generated continuation starts at the same offset in every row
+        new_tokens = int((outputs[:, prompt_length:] != tokenizer.pad_token_id).sum())
+        self._record_generation(model_name, new_tokens, elapsed)
+        if early_stopping:
+            stops, tokens_saved = summarize_early_stops(early_stopping, generation_kwargs["max_new_tokens"])
+            self._record_early_stops(model_name, stops, tokens_saved)
+        if cancel_tokens:
+            # Tokens decoded for callers that are gone by now were wasted
+            wasted = sum(
+                int((outputs[row, prompt_length:] != tokenizer.pad_token_id).sum())
+                for row, token in enumerate(cancel_tokens)
+                if token is not None and token.cancelled
+            )
+            if wasted:
+                with self._generation_stats_lock:
+                    self._cancellation_stats["tokens_wasted"] += wasted
+        if assisted:
+            self._record_assisted_generation(model_name, new_tokens, target_forwards.count, draft_forwards.count)
+        
+        generated_texts = tokenizer.batch_decode(
+            outputs[:, prompt_length:], skip_special_tokens=True
+        )
+        
+        return [text.strip() for text in generated_texts]
+    
+    def _check_draft_compatible(self, model_name: str, tokenizer: Any, draft_tokenizer: Any) -> bool:
+        """Whether the draft model proposes tokens in the target's vocabulary - checked once"""
+        compatible = self._draft_compatible.get(model_name)
+        if compatible is None:
+            compatible = tokenizer.get_vocab() == draft_tokenizer.get_vocab()
+            self._draft_compatible[model_name] = compatible
+            if compatible:
+                logger.info(f"Assisted decoding enabled for {model_name} with {self.config.model.draft_model}")
+            else:
+                logger.warning(
+                    f"Draft model {self.config.model.draft_model} does not share {model_name}'s "
+                    f"tokenizer; generating without assisted decoding"
                 )
-                
-                # Check if outputs is valid
-                if outputs is None or len(outputs) == 0:
-                    logger.warning(f"Model {model_name} generated empty output")
-                    return ""
-                
-                # Decode output
-                generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-                
-            except Exception as e:
-                logger.error(f"Text generation failed for model {model_name}: {e}")
-                return ""
+        return compatible
+    
+    def _record_assisted_generation(self, model_name: str, tokens: int, target_forwards: int, draft_forwards: int) -> None:
+        """
+        Accumulate speculative decoding counters for a model
         
-        # Remove the original prompt from the output
-        if generated_text.startswith(prompt):
-            generated_text = generated_text[len(prompt):].strip()
+        Each verification pass of the target accepts some draft tokens and
+        adds one token of its own, so accepted = tokens - target passes.
+        Every draft forward proposes one token.
+        """
+        with self._generation_stats_lock:
+            stats = self._generation_stats[model_name]
+            stats["assisted_requests"] = stats.get("assisted_requests", 0) + 1
+            stats["target_forwards"] = stats.get("target_forwards", 0) + target_forwards
+            stats["draft_tokens_proposed"] = stats.get("draft_tokens_proposed", 0) + draft_forwards
+            stats["draft_tokens_accepted"] = stats.get("draft_tokens_accepted", 0) + max(0, tokens - target_forwards)
+    
+    def _record_cancelled_request(self) -> None:
+        """Count a generation request abandoned by its caller"""
+        with self._generation_stats_lock:
+            self._cancellation_stats["requests_cancelled"] += 1
+    
+    def _record_early_stops(self, model_name: str, stops: Dict[str, int], tokens_saved: int) -> None:
+        """Accumulate early stops by reason and the decode tokens they saved"""
+        with self._generation_stats_lock:
+            stats = self._generation_stats[model_name]
+            stats["tokens_saved"] = stats.get("tokens_saved", 0) + tokens_saved
+            for reason, count in stops.items():
+                stats[f"stopped_{reason}"] = stats.get(f"stopped_{reason}", 0) + count
+    
+    def _record_generation(self, model_name: str, tokens: int, seconds: float) -> None:
+        """Accumulate decode throughput for a model"""
+        with self._generation_stats_lock:
+            stats = self._generation_stats.setdefault(
+                model_name, {"requests": 0, "tokens_generated": 0, "generation_seconds": 0.0}
+            )
+            stats["requests"] += 1
+            stats["tokens_generated"] += tokens
+            stats["generation_seconds"] += seconds
+    
+    def _get_prefix_past_key_values(self, model_name: str, model: Any, tokenizer: Any, inputs: Any) -> Any:
+        """Cached key/value states for a registered prefix of a single prompt"""
+        if self.prefix_cache is None:
+            return None
         
-        return generated_text
+        input_ids = inputs["input_ids"][0].tolist()
+        token_ids = self.prefix_cache.match(model_name, tokenizer, input_ids)
+        if token_ids is None:
+            return None
+        
+        try:
+            entry = self.prefix_cache.get_or_prefill(model_name, model, token_ids)
+        except Exception as e:
+            logger.warning(f"Prefix prefill failed for {model_name}, generating without it: {e}")
+            return None
+        return self.prefix_cache.as_past_key_values(entry)
+    
+    def register_prompt_prefix(self, model_name: str, prefix_text: str) -> None:
+        """Register a fixed prompt preamble whose key/value states should be cached"""
+        if self.prefix_cache is not None:
+            self.prefix_cache.register(model_name, prefix_text)
     
     async def encode_text(self, model_name: str, text: str) -> np.ndarray:
         """Encode text to embeddings using a specific model"""
-        model = self.get_model(model_name)
+        embeddings = await self.encode_texts(model_name, [text])
+        return embeddings[0]
+    
+    async def encode_texts(self, model_name: str, texts: List[str]) -> np.ndarray:
+        """Encode many texts into a (len(texts), dim) embedding array, in input order"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
         
-        if isinstance(model, SentenceTransformer):
-            # Sentence transformer model
-            embeddings = model.encode([text])
-            return embeddings[0]
-        else:
-            # BERT-like model
-            tokenizer = self.get_tokenizer(model_name)
-            inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True).to(self.device)
+        async with self.use_model(model_name) as (model, tokenizer):
+            revision = self.model_info[model_name].revision or ""
+            results: List[Optional[np.ndarray]] = [None] * len(texts)
             
-            with torch.no_grad():
-                outputs = model(**inputs)
-                # Use CLS token embedding or mean pooling
-                if hasattr(outputs, 'last_hidden_state'):
-                    embeddings = outputs.last_hidden_state.mean(dim=1)
-                else:
-                    embeddings = outputs.pooler_output
+            # Cache lookups and stores may touch disk; keep them off the event loop
+            if self.embedding_cache is not None:
+                results = await asyncio.to_thread(self.embedding_cache.get_many, model_name, revision, texts)
             
-            return embeddings.cpu().numpy()[0]
+            missing = [i for i, result in enumerate(results) if result is None]
+            if missing:
+                batch_results = await self._run_bucketed(
+                    model_name, model, tokenizer,
+                    [texts[i] for i in missing], self._encode_texts_sync
+                )
+                for i, embedding in zip(missing, batch_results):
+                    results[i] = embedding
+        
+        if missing and self.embedding_cache is not None:
+            await asyncio.to_thread(
+                self.embedding_cache.put_many, model_name, revision,
+                [texts[i] for i in missing], [results[i] for i in missing]
+            )
+        
+        return np.stack(results)
+    
+    async def _run_bucketed(
+        self,
+        model_name: str,
+        model: Any,
+        tokenizer: Any,
+        texts: List[str],
+        batch_fn: Callable[[Any, Any, List[str]], Any]
+    ) -> List[Any]:
+        """Run batch_fn over length-bucketed batches and restore input order"""
+        lengths = await self.executor.run(model_name, self._token_lengths, tokenizer, texts)
+        buckets = bucket_by_length(
+            lengths,
+            max_batch_size=self.config.model.encode_batch_size,
+            max_batch_tokens=self.config.model.encode_max_batch_tokens
+        )
+        
+        results: List[Any] = [None] * len(texts)
+        # One executor call per bucket lets other requests interleave
+        # between batches of a long input
+        for bucket in buckets:
+            outputs = await self.executor.run(
+                model_name, batch_fn, model, tokenizer, [texts[i] for i in bucket]
+            )
+            for i, output in zip(bucket, outputs):
+                results[i] = output
+        return results
+    
+    def _token_lengths(self, tokenizer: Any, texts: List[str]) -> List[int]:
+        """Truncated token counts - runs on an executor thread"""
+        encoded = tokenizer(texts, truncation=True)
+        return [len(ids) for ids in encoded["input_ids"]]
+    
+    def _encode_texts_sync(self, model: Any, tokenizer: Any, texts: List[str]) -> np.ndarray:
+        """Blocking batch text encoding - runs on an executor thread"""
+        if isinstance(model, SentenceTransformer):
+            # Sentence transformer model
+            return model.encode(texts, batch_size=len(texts))
+        
+        # BERT-like model
+        inputs = tokenizer(texts, return_tensors="pt", truncation=True, padding=True).to(self.device)
+        
+        with torch.no_grad():
+            outputs = model(**inputs)
+            # Use CLS token embedding or mean pooling
+            if hasattr(outputs, 'last_hidden_state'):
+                # Padding positions must not dilute the mean of shorter rows
+                mask = inputs["attention_mask"].unsqueeze(-1).to(outputs.last_hidden_state.dtype)
+                embeddings = (outputs.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            else:
+                embeddings = outputs.pooler_output
+        
+        return embeddings.float().cpu().numpy()
     
     async def classify_emotion(self, text: str) -> Dict[str, float]:
         """Classify emotions in text"""
-        model = self.get_model("emotion_model")
-        tokenizer = self.get_tokenizer("emotion_model")
+        results = await self.classify_emotions([text])
+        return results[0]
+    
+    async def classify_emotions(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Classify emotions in many texts, returning one score dict per text in input order"""
+        if not texts:
+            return []
         
-        inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True).to(self.device)
+        async with self.use_model("emotion_model") as (model, tokenizer):
+            return await self._run_bucketed(
+                "emotion_model", model, tokenizer, texts, self._classify_emotions_sync
+            )
+    
+    def _classify_emotions_sync(self, model: Any, tokenizer: Any, texts: List[str]) -> List[Dict[str, float]]:
+        """Blocking batch emotion classification - runs on an executor thread"""
+        inputs = tokenizer(texts, return_tensors="pt", truncation=True, padding=True).to(self.device)
         
         with torch.no_grad():
             outputs = model(**inputs)
-            probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        
-        # Get emotion labels (this would be model-specific)
-        emotion_labels = [
-            "joy", "sadness", "anger", "fear", "surprise", "disgust", "love",
-            "optimism", "pessimism", "trust", "anticipation", "shame", "guilt",
-            "pride", "envy", "gratitude", "hope", "compassion", "contempt",
-            "anxiety", "relief", "disappointment", "satisfaction", "confusion",
-            "curiosity", "nostalgia", "longing"
-        ]
+            probabilities = torch.nn.functional.softmax(outputs.logits.float(), dim=-1)
         
-        # Create emotion scores dictionary
-        emotion_scores = {}
-        probs = probabilities.cpu().numpy()[0]
+        emotion_labels = self._get_emotion_labels(model, probabilities.shape[-1])
         
-        for i, label in enumerate(emotion_labels[:len(probs)]):
-            emotion_scores[label] = float(probs[i])
+        # Create emotion scores dictionaries
+        return [
+            {label: float(prob) for label, prob in zip(emotion_labels, row)}
+            for row in probabilities.cpu().numpy()
+        ]
+    
+    def _get_emotion_labels(self, model: Any, num_labels: int) -> List[str]:
+        """Label names for the emotion classifier's outputs"""
+        id2label = getattr(getattr(model, "config", None), "id2label", None) or {}
+        labels = [str(id2label.get(i, "")) for i in range(num_labels)]
         
-        return emotion_scores
+        # Checkpoints without a label map only carry placeholder LABEL_<i> names
+        if all(label and not label.startswith("LABEL_") for label in labels):
+            return [label.lower() for label in labels]
+        return DEFAULT_EMOTION_LABELS[:num_labels]
     
     def get_model_info(self, model_name: Optional[str] = None) -> Union[ModelInfo, Dict[str, ModelInfo]]:
         """Get information about loaded models"""
@@ -396,12 +1319,71 @@ class TeluguModelManager:
             if info.memory_usage is not None
         }
     
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Get dynamic batching statistics"""
+        if self.batcher is None:
+            return {}
+        return self.batcher.get_stats()
+    
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Get inference executor statistics"""
+        return self.executor.get_stats()
+    
+    def get_generation_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-model generation throughput"""
+        with self._generation_stats_lock:
+            return {
+                model_name: {
+                    **stats,
+                    "generation_seconds": round(stats["generation_seconds"], 3),
+                    "tokens_per_second": round(
+                        stats["tokens_generated"] / stats["generation_seconds"], 2
+                    ) if stats["generation_seconds"] > 0 else 0.0,
+                    "precision": self.model_info[model_name].precision if model_name in self.model_info else None,
+                    **(
+                        {
+                            "acceptance_rate": round(
+                                stats["draft_tokens_accepted"] / stats["draft_tokens_proposed"], 3
+                            ) if stats["draft_tokens_proposed"] else 0.0
+                        }
+                        if "assisted_requests" in stats else {}
+                    )
+                }
+                for model_name, stats in self._generation_stats.items()
+            }
+    
+    def get_cancellation_stats(self) -> Dict[str, int]:
+        """Get counters of cancelled generation work"""
+        with self._generation_stats_lock:
+            stats = dict(self._cancellation_stats)
+        stats["queued_dropped"] = self.batcher.stats.cancelled_dropped if self.batcher is not None else 0
+        return stats
+    
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics"""
+        if self.embedding_cache is None:
+            return {}
+        return self.embedding_cache.get_stats()
+    
+    def get_prefix_cache_stats(self) -> Dict[str, Any]:
+        """Get prompt-prefix KV cache statistics"""
+        if self.prefix_cache is None:
+            return {}
+        return self.prefix_cache.get_stats()
+    
+    def shutdown(self) -> None:
+        """Release inference worker threads"""
+        self.executor.shutdown(wait=False)
+    
     async def unload_model(self, model_name: str) -> None:
         """Unload a specific model to free memory"""
         if model_name in self.models:
             del self.models[model_name]
             del self.tokenizers[model_name]
+            self._lru.pop(model_name, None)
             self.model_info[model_name].loaded = False
+            if self.prefix_cache is not None:
+                self.prefix_cache.clear(model_name)
             
             # Force garbage collection
             import gc
@@ -411,13 +1393,122 @@ class TeluguModelManager:
             
             logger.info(f"Unloaded model: {model_name}")
     
+    async def reload_models(self, model_names: Optional[List[str]] = None) -> List[str]:
+        """
+        Start background hot reloads of the given models (default: all loaded)
+        Returns the models whose reload was started; progress is reported in
+        each model's reload_status
+        """
+        if model_names is None:
+            model_names = list(self.models)
+        
+        unknown = [name for name in model_names if name not in self.model_registry]
+        if unknown:
+            raise ValueError(f"Unknown models: {', '.join(unknown)}")
+        
+        started = []
+        for model_name in model_names:
+            task = self._reload_tasks.get(model_name)
+            if task is not None and not task.done():
+                logger.info(f"Reload of {model_name} already in progress")
+                continue
+            
+            task = asyncio.create_task(self.reload_model(model_name))
+            # Failures are logged and recorded in reload_status
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._reload_tasks[model_name] = task
+            started.append(model_name)
+        return started
+    
     async def reload_model(self, model_name: str) -> None:
-        """Reload a specific model"""
-        if model_name in self.model_info:
-            model_type = self.model_info[model_name].model_type
-            await self.unload_model(model_name)
-            await self._load_model_async(model_name, model_type)
-            logger.info(f"Reloaded model: {model_name}")
+        """
+        Replace a model with a freshly loaded copy without interrupting requests
+        
+        The new version is loaded and warmed up next to the serving one, then
+        swapped in atomically. Requests already holding the old version finish
+        on it, and it is released once the last of them completes.
+        """
+        if model_name not in self.model_registry:
+            raise ValueError(f"Model {model_name} not registered")
+        
+        if model_name not in self.models:
+            # Nothing is serving it, so a plain load is enough
+            await self.ensure_model_loaded(model_name)
+            return
+        
+        model_type = self.model_registry[model_name]
+        status: Dict[str, Any] = {
+            "state": "loading",
+            "started_at": datetime.now().isoformat(),
+            "previous_revision": self.model_info[model_name].revision
+        }
+        self.model_info[model_name].reload_status = status
+        logger.info(f"Hot reloading {model_name}...")
+        
+        try:
+            model, tokenizer, info = await self._build_model_async(model_name, model_type, use_snapshot=False)
+            
+            # One inference before the swap pays one-time setup costs and
+            # catches a broken checkpoint while the old version still serves
+            status["state"] = "warming"
+            await self.executor.run(model_name, self._warm_up_sync, model_type, model, tokenizer)
+        except Exception as e:
+            status.update(state="failed", error=str(e), finished_at=datetime.now().isoformat())
+            logger.error(f"Hot reload of {model_name} failed, keeping the current version: {e}")
+            raise
+        
+        # Swap without awaiting so no request sees a half-installed version
+        old_model = self.models.get(model_name)
+        self.models[model_name] = model
+        self.tokenizers[model_name] = tokenizer
+        info.reload_status = status
+        self.model_info[model_name] = info
+        self._source_revisions.pop(model_name, None)
+        self._touch(model_name)
+        self._reset_version_state(model_name)
+        
+        status["revision"] = info.revision
+        status["swapped_at"] = datetime.now().isoformat()
+        
+        old_version = id(old_model)
+        in_flight = self._version_refs.get(old_version, 0)
+        if in_flight:
+            status["state"] = "draining"
+            status["draining_requests"] = in_flight
+            logger.info(f"Swapped in new {model_name}; waiting for {in_flight} requests on the old version")
+            drained = self._retired_versions.setdefault(old_version, asyncio.Event())
+            await drained.wait()
+            # Requests on the old version may have cached its prefix states
+            self._reset_version_state(model_name)
+        
+        del old_model
+        import gc
+        gc.collect()
+        if self.device.type == "cuda":
+            torch.cuda.empty_cache()
+        
+        status["state"] = "completed"
+        status["finished_at"] = datetime.now().isoformat()
+        logger.info(f"Reloaded model: {model_name} ({status['previous_revision']} -> {info.revision})")
+    
+    def _reset_version_state(self, model_name: str) -> None:
+        """Drop state derived from a replaced model version"""
+        if self.prefix_cache is not None:
+            self.prefix_cache.clear(model_name)
+        if model_name in (DRAFT_MODEL_NAME, self.config.model.draft_target_model):
+            self._draft_compatible.pop(self.config.model.draft_target_model, None)
+    
+    def _warm_up_sync(self, model_type: str, model: Any, tokenizer: Any) -> None:
+        """Run one small inference on a model - runs on an executor thread"""
+        text = "తెలుగు కథ"
+        if model_type == "text_generation":
+            inputs = tokenizer([text], return_tensors="pt").to(self.device)
+            with torch.no_grad():
+                model.generate(**inputs, max_new_tokens=1, do_sample=False, pad_token_id=tokenizer.pad_token_id)
+        elif model_type == "emotion_classification":
+            self._classify_emotions_sync(model, tokenizer, [text])
+        else:
+            self._encode_texts_sync(model, tokenizer, [text])
     
     def save_model_cache(self, cache_path: Optional[Path] = None) -> None:
         """Save model information to cache"""
@@ -431,7 +1522,9 @@ class TeluguModelManager:
                 "tokenizer_path": info.tokenizer_path,
                 "loaded": info.loaded,
                 "parameters": info.parameters,
-                "memory_usage": info.memory_usage
+                "memory_usage": info.memory_usage,
+                "revision": info.revision,
+                "precision": info.precision
             }
             for name, info in self.model_info.items()
         }
@@ -464,7 +1557,12 @@ def get_model_manager() -> TeluguModelManager:
     """Get the global model manager instance"""
     global _model_manager
     if _model_manager is None:
-        _model_manager = TeluguModelManager()
+        if get_config().model.inference_mode == "remote":
+            # API workers share one model host instead of loading their own copies
+            from .inference_server import RemoteModelManager
+            _model_manager = RemoteModelManager()
+        else:
+            _model_manager = TeluguModelManager()
     return _model_manager
 
 async def initialize_models() -> None:
@@ -0,0 +1,50 @@
+"""
+Model Revisions for Telugu Story Engine
+Identifies the exact source weights of a configured model without loading it
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the hub before falling back to the local cache
+HUB_TIMEOUT = 10.0
+
+def local_revision(model_path: str) -> str:
+    """Revision of a local checkpoint directory: its newest file time"""
+    # Local checkpoints have no commit, so the newest file time tells
+    # updated weights apart
+    mtime = max((f.stat().st_mtime for f in Path(model_path).rglob("*") if f.is_file()), default=0)
+    return f"{model_path}@{int(mtime)}"
+
+def cached_hub_revision(model_path: str, cache_dir: Path) -> Optional[str]:
+    """Commit of a hub model that from_pretrained would load from cache_dir"""
+    ref = cache_dir / f"models--{model_path.replace('/', '--')}" / "refs" / "main"
+    try:
+        return ref.read_text().strip() or None
+    except OSError:
+        return None
+
+def resolve_source_revision(model_path: str, cache_dir: Path) -> Optional[str]:
+    """
+    Revision of the weights a model would be loaded from right now
+
+    Local checkpoints are identified by their newest file time, hub models
+    by the commit the hub currently serves, or the cached commit when the
+    hub is unreachable or HF_HUB_OFFLINE is set. Returns None when the
+    revision cannot be determined.
+    """
+    if Path(model_path).is_dir():
+        return local_revision(model_path)
+
+    if os.environ.get("HF_HUB_OFFLINE", "0") not in ("1", "true", "True"):
+        try:
+            from huggingface_hub import HfApi
+            return HfApi().model_info(model_path, timeout=HUB_TIMEOUT).sha
+        except Exception as e:
+            logger.debug(f"Hub revision lookup failed for {model_path}: {e}")
+
+    return cached_hub_revision(model_path, cache_dir)
@@ -0,0 +1,244 @@
+"""
+ONNX Runtime Backend for Telugu Story Engine
+Serves encoder and classifier models through ONNX Runtime on CPU
+"""
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+from transformers.modeling_outputs import BaseModelOutput, SequenceClassifierOutput
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Optional dependency; models stay on PyTorch without it
+    ort = None
+
+logger = logging.getLogger(__name__)
+
+ONNX_OPSET = 17
+
+# Texts used to export and to check ONNX outputs against PyTorch
+PARITY_TEXTS = [
+    "తెలుగు కథ రచన పరీక్ష",
+    "ఒక చిన్న గ్రామంలో రాము అనే రైతు ఉండేవాడు. అతను చాలా కష్టపడి పని చేసేవాడు.",
+    "The festival brought the whole family together after many years."
+]
+
+def tokenizer_fingerprint(tokenizer: Any) -> str:
+    """Short digest of the tokenizer an export was traced and checked with"""
+    payload = "\0".join((
+        str(getattr(tokenizer, "name_or_path", "")),
+        type(tokenizer).__name__,
+        str(len(tokenizer)),
+        str(getattr(tokenizer, "model_max_length", ""))
+    ))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+class _ExportWrapper(torch.nn.Module):
+    """Positional-argument wrapper so torch.onnx.export can trace a HF model"""
+
+    def __init__(self, model: torch.nn.Module, input_names: List[str], output_name: str):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+        self.output_name = output_name
+
+    def forward(self, *args):
+        outputs = self.model(**dict(zip(self.input_names, args)), return_dict=True)
+        return outputs[self.output_name]
+
+class OnnxModel:
+    """
+    Drop-in replacement for a HF encoder or classifier on the inference path
+
+    Calling it with tokenizer outputs returns a BaseModelOutput or
+    SequenceClassifierOutput holding torch tensors, so the model manager's
+    encode and classify code runs unchanged. InferenceSession.run is
+    thread-safe, so executor workers can share one session.
+    """
+
+    def __init__(self, session: Any, model_path: Path, output_name: str, config: Any, num_parameters: int):
+        self.session = session
+        self.model_path = model_path
+        self.output_name = output_name
+        self.config = config
+        self._num_parameters = num_parameters
+        self._input_names = [node.name for node in session.get_inputs()]
+
+    def __call__(self, **inputs) -> Any:
+        feeds = {
+            name: inputs[name].cpu().numpy().astype(np.int64)
+            for name in self._input_names
+            if name in inputs
+        }
+        output = torch.from_numpy(self.session.run([self.output_name], feeds)[0])
+
+        if self.output_name == "logits":
+            return SequenceClassifierOutput(logits=output)
+        return BaseModelOutput(last_hidden_state=output)
+
+    def num_parameters(self) -> int:
+        """Parameter count of the exported model"""
+        return self._num_parameters
+
+    def get_memory_footprint(self) -> int:
+        """Bytes of the ONNX graph and weights"""
+        return self.model_path.stat().st_size
+
+    def eval(self) -> "OnnxModel":
+        return self
+
+class OnnxBackend:
+    """
+    Exports encoder and classifier models to ONNX once and serves them
+    through tuned CPU InferenceSessions
+
+    Exports live under cache_dir/onnx/<model>/<revision>/<tokenizer>/model.onnx,
+    keyed on the weights' revision and the configured tokenizer, and are
+    reused on later starts. Every load, fresh export or not, compares ONNX
+    and PyTorch outputs on a few Telugu and English texts and keeps the
+    PyTorch model if they differ by more than the parity tolerance.
+    """
+
+    def __init__(
+        self,
+        export_dir: Path,
+        intra_op_threads: Optional[int] = None,
+        parity_tolerance: float = 1e-3
+    ):
+        self.export_dir = export_dir
+        self.intra_op_threads = intra_op_threads
+        self.parity_tolerance = parity_tolerance
+
+        # Largest parity error of each model's most recent conversion
+        self.parity_errors: Dict[str, float] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        """Whether onnxruntime is installed"""
+        return ort is not None
+
+    def export_path(self, model_name: str, revision: str, tokenizer: Any) -> Path:
+        """Where the export of a model revision traced with a tokenizer lives"""
+        return (
+            self.export_dir / model_name / re.sub(r"[^A-Za-z0-9._-]", "_", revision)
+            / f"tokenizer-{tokenizer_fingerprint(tokenizer)}" / "model.onnx"
+        )
+
+    def convert(self, model_name: str, model: Any, tokenizer: Any, revision: str) -> Any:
+        """Return an ONNX-backed model, or the original model if conversion is not possible"""
+        if ort is None:
+            logger.warning(f"onnxruntime is not installed; serving {model_name} with PyTorch")
+            return model
+
+        try:
+            torch_model, output_name = self._resolve_exportable(model, tokenizer)
+        except ValueError as e:
+            logger.warning(f"Serving {model_name} with PyTorch: {e}")
+            return model
+
+        # Resolved after _resolve_exportable, which may set the truncation length
+        onnx_path = self.export_path(model_name, revision, tokenizer)
+        try:
+            if not onnx_path.exists():
+                self._export(torch_model, tokenizer, output_name, onnx_path)
+                logger.info(f"Exported {model_name} to {onnx_path}")
+
+            onnx_model = OnnxModel(
+                self._create_session(onnx_path),
+                onnx_path,
+                output_name,
+                torch_model.config,
+                torch_model.num_parameters()
+            )
+            max_error = self.check_parity(torch_model, onnx_model, tokenizer, output_name)
+            self.parity_errors[model_name] = max_error
+        except Exception as e:
+            logger.warning(f"ONNX conversion failed for {model_name}, serving with PyTorch: {e}")
+            return model
+
+        if max_error > self.parity_tolerance:
+            logger.warning(
+                f"ONNX output for {model_name} differs from PyTorch by {max_error:.2e} "
+                f"(tolerance {self.parity_tolerance:.0e}); serving with PyTorch"
+            )
+            return model
+
+        logger.info(f"Serving {model_name} with ONNX Runtime (max parity error {max_error:.2e})")
+        return onnx_model
+
+    def _resolve_exportable(self, model: Any, tokenizer: Any) -> tuple:
+        """Find the torch module to export and the output the manager reads"""
+        # Imported here so the backend does not require sentence-transformers
+        from sentence_transformers import SentenceTransformer
+
+        if isinstance(model, SentenceTransformer):
+            modules = list(model)
+            pooling = modules[1] if len(modules) > 1 else None
+            # The manager's masked mean pooling reproduces exactly this pipeline
+            if len(modules) != 2 or not getattr(pooling, "pooling_mode_mean_tokens", False):
+                raise ValueError("only Transformer + mean Pooling sentence transformers can be exported")
+            # Truncate like the sentence transformer does
+            tokenizer.model_max_length = model.max_seq_length
+            return modules[0].auto_model, "last_hidden_state"
+
+        if type(model).__name__.endswith("ForSequenceClassification"):
+            return model, "logits"
+        if hasattr(model, "config"):
+            return model, "last_hidden_state"
+        raise ValueError(f"unsupported model type {type(model).__name__}")
+
+    def _export(self, model: torch.nn.Module, tokenizer: Any, output_name: str, onnx_path: Path) -> None:
+        """Trace a model to ONNX with dynamic batch and sequence axes"""
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        sample = tokenizer(PARITY_TEXTS, return_tensors="pt", padding=True, truncation=True)
+        input_names = list(sample.keys())
+
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes[output_name] = {0: "batch", 1: "sequence"} if output_name == "last_hidden_state" else {0: "batch"}
+
+        # Write to a temporary name so a crash never leaves a partial export
+        tmp_path = onnx_path.with_suffix(".onnx.tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                _ExportWrapper(model, input_names, output_name).eval(),
+                tuple(sample[name] for name in input_names),
+                str(tmp_path),
+                input_names=input_names,
+                output_names=[output_name],
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+                do_constant_folding=True
+            )
+        tmp_path.replace(onnx_path)
+
+    def _create_session(self, onnx_path: Path) -> Any:
+        """Create a CPU InferenceSession tuned for the inference executor"""
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Executor workers already run requests in parallel, so each session
+        # runs its operators sequentially on the intra-op pool
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = self.intra_op_threads or torch.get_num_threads()
+        options.inter_op_num_threads = 1
+
+        return ort.InferenceSession(str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"])
+
+    def check_parity(self, torch_model: Any, onnx_model: OnnxModel, tokenizer: Any, output_name: str) -> float:
+        """Largest absolute difference between PyTorch and ONNX outputs on the parity texts"""
+        inputs = tokenizer(PARITY_TEXTS, return_tensors="pt", padding=True, truncation=True)
+
+        with torch.no_grad():
+            expected = torch_model(**inputs, return_dict=True)[output_name].float()
+        actual = getattr(onnx_model(**inputs), output_name).float()
+
+        if output_name == "last_hidden_state":
+            # Hidden states at padding positions are never read
+            mask = inputs["attention_mask"].unsqueeze(-1).bool()
+            return float((expected - actual).abs().masked_select(mask).max())
+        return float((expected - actual).abs().max())
@@ -0,0 +1,128 @@
+"""
+Phase Graph for Telugu Story Engine
+Runs declared pipeline phases concurrently as their dependencies finish
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from .cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Phase:
+    """
+    One step of a pipeline
+
+    run receives the results of the finished phases by name and may be a
+    plain function or a coroutine function.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+
+class PhaseGraph:
+    """
+    Dependency graph of phases run with asyncio
+
+    Every phase starts as soon as all of its dependencies have finished,
+    so independent phases overlap and the end-to-end time approaches the
+    graph's critical path. The first failing phase cancels the phases
+    still running and its exception propagates.
+    """
+
+    def __init__(self, phases: List[Phase]):
+        self.phases = {phase.name: phase for phase in phases}
+        if len(self.phases) != len(phases):
+            raise ValueError("Phase names must be unique")
+        self.order = self._topological_order()
+
+        self.results: Dict[str, Any] = {}
+        # Seconds since the graph started
+        self.started: Dict[str, float] = {}
+        self.finished: Dict[str, float] = {}
+
+    def _topological_order(self) -> List[str]:
+        """Phase names with every phase after its dependencies"""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Phase dependency cycle: {' -> '.join(path + (name,))}")
+            if name not in self.phases:
+                raise ValueError(f"Phase {path[-1]} depends on unknown phase {name}")
+
+            state[name] = "visiting"
+            for dependency in self.phases[name].depends_on:
+                visit(dependency, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.phases:
+            visit(name, ())
+        return order
+
+    async def run(self, cancel_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
+        """Run every phase and return their results by name"""
+        graph_start = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_phase(phase: Phase) -> Any:
+            if phase.depends_on:
+                await asyncio.gather(*(tasks[name] for name in phase.depends_on))
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+
+            self.started[phase.name] = time.perf_counter() - graph_start
+            result = phase.run(self.results)
+            if inspect.isawaitable(result):
+                result = await result
+            self.finished[phase.name] = time.perf_counter() - graph_start
+            self.results[phase.name] = result
+            return result
+
+        for name in self.order:
+            tasks[name] = asyncio.ensure_future(run_phase(self.phases[name]))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            # Let cancelled phases unwind before the caller moves on
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return self.results
+
+    def critical_path(self) -> List[str]:
+        """Chain of phases that determined the end-to-end time"""
+        if not self.finished:
+            return []
+
+        path = [max(self.finished, key=self.finished.get)]
+        while True:
+            dependencies = [name for name in self.phases[path[-1]].depends_on if name in self.finished]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=self.finished.get))
+        return list(reversed(path))
+
+    def get_timings(self) -> Dict[str, Any]:
+        """Per-phase durations, total time and critical path in milliseconds"""
+        return {
+            "phases_ms": {
+                name: round((self.finished[name] - self.started[name]) * 1000, 2)
+                for name in self.order if name in self.finished
+            },
+            "total_ms": round(max(self.finished.values(), default=0.0) * 1000, 2),
+            "critical_path": self.critical_path()
+        }
@@ -0,0 +1,131 @@
+"""
+Structure Plan Cache for Telugu Story Engine
+Reuses story-structure plans of similar recent requests
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+# (story_type, cultural_context, length bucket)
+PlanFeatures = Tuple[str, str, int]
+
+@dataclass
+class _PlanEntry:
+    features: PlanFeatures
+    embedding: np.ndarray  # unit length
+    plan: Dict[str, str]
+    stored_at: float
+
+class StructurePlanCache:
+    """
+    LRU of structure plans matched by request features and prompt similarity
+
+    A request can reuse a plan only if its story type, cultural context
+    and length bucket match exactly. Among those plans it takes the one
+    whose prompt embedding is most similar, provided the cosine
+    similarity reaches similarity_threshold. Entries expire ttl_seconds
+    after they were stored. A plan holds the model-written texts only;
+    callers derive everything else from the new request.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        similarity_threshold: float,
+        length_bucket_words: int
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.length_bucket_words = max(1, length_bucket_words)
+
+        self._entries: "OrderedDict[int, _PlanEntry]" = OrderedDict()
+        self._next_id = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.similarity_sum = 0.0
+
+    def features(self, story_type: str, cultural_context: str, length: int) -> PlanFeatures:
+        """Exact-match part of a request's cache key"""
+        return (story_type, cultural_context, int(length) // self.length_bucket_words)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(embedding))
+        return embedding / norm if norm > 0 else embedding
+
+    def get(self, features: PlanFeatures, embedding: np.ndarray) -> Optional[Dict[str, str]]:
+        """Most similar unexpired plan with the same features, if similar enough"""
+        query = self._normalize(embedding)
+        now = time.time()
+
+        best_id, best_similarity = None, self.similarity_threshold
+        for entry_id, entry in list(self._entries.items()):
+            if now - entry.stored_at > self.ttl_seconds:
+                del self._entries[entry_id]
+                continue
+            if entry.features != features or entry.embedding.shape != query.shape:
+                continue
+            similarity = float(np.dot(entry.embedding, query))
+            if similarity >= best_similarity:
+                best_id, best_similarity = entry_id, similarity
+
+        if best_id is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(best_id)
+        self.hits += 1
+        self.similarity_sum += best_similarity
+        return dict(self._entries[best_id].plan)
+
+    def put(self, features: PlanFeatures, embedding: np.ndarray, plan: Dict[str, str]) -> None:
+        """Store a plan, evicting the least recently used one when full"""
+        self._entries[self._next_id] = _PlanEntry(
+            features=features,
+            embedding=self._normalize(embedding),
+            plan=dict(plan),
+            stored_at=time.time()
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get structure plan cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "average_hit_similarity": round(self.similarity_sum / self.hits, 3) if self.hits else 0.0
+        }
+
+# Global structure plan cache instance
+_plan_cache: Optional[StructurePlanCache] = None
+
+def get_plan_cache() -> Optional[StructurePlanCache]:
+    """Get the global structure plan cache, or None when it is disabled"""
+    global _plan_cache
+    config = get_config()
+    if _plan_cache is None and config.plan_cache_enabled:
+        _plan_cache = StructurePlanCache(
+            max_entries=config.plan_cache_max_entries,
+            ttl_seconds=config.plan_cache_ttl_seconds,
+            similarity_threshold=config.plan_cache_similarity_threshold,
+            length_bucket_words=config.plan_cache_length_bucket_words
+        )
+    return _plan_cache
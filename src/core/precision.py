@@ -0,0 +1,85 @@
+"""
+CPU Precision Modes for Telugu Story Engine
+fp32, bf16 and dynamic int8 conversion of loaded models
+"""
+
+import logging
+from typing import Any
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("fp32", "bf16", "dynamic_int8")
+
+def conv1d_to_linear(module: torch.nn.Module) -> int:
+    """
+    Replace GPT-2 style Conv1D layers with equivalent nn.Linear layers
+
+    Conv1D stores its weight as (in_features, out_features) and is not
+    recognized by dynamic quantization, which only targets nn.Linear.
+    Returns the number of layers replaced.
+    """
+    from transformers.pytorch_utils import Conv1D
+
+    replaced = 0
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, dtype=child.weight.dtype)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+            replaced += 1
+        else:
+            replaced += conv1d_to_linear(child)
+    return replaced
+
+def apply_precision(model: Any, precision: str) -> Any:
+    """Convert a loaded CPU model to the requested precision"""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision}; expected one of {', '.join(PRECISIONS)}")
+
+    if precision == "fp32":
+        return model
+
+    if precision == "bf16":
+        return model.to(torch.bfloat16)
+
+    replaced = conv1d_to_linear(model)
+    if replaced:
+        logger.info(f"Converted {replaced} Conv1D layers to Linear for quantization")
+
+    # Weights are stored as int8 and activations quantized on the fly per
+    # batch, so no calibration data is needed
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized.eval()
+    return quantized
+
+def state_dict_nbytes(model: Any) -> int:
+    """
+    Real in-memory size of a model's weights
+
+    Dynamically quantized Linear layers keep their int8 weights in packed
+    params rather than parameters(), so the size is taken from the state
+    dict, which contains both.
+    """
+    def nbytes(value: Any) -> int:
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(nbytes(item) for item in value)
+        return 0
+
+    seen = set()
+    total = 0
+    for value in model.state_dict().values():
+        # Tied weights (e.g. GPT-2 wte / lm_head) appear under several keys
+        if isinstance(value, torch.Tensor):
+            key = (value.data_ptr(), value.numel())
+            if key in seen:
+                continue
+            seen.add(key)
+        total += nbytes(value)
+    return total
@@ -0,0 +1,169 @@
+"""
+Prompt-Prefix KV Cache for Telugu Story Engine
+Reuses attention key/value states for fixed prompt preambles
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import torch
+
+try:
+    from transformers import DynamicCache
+except ImportError:  # Older transformers take the legacy tuple format directly
+    DynamicCache = None
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PrefixEntry:
+    """Cached key/value states for one tokenized prefix"""
+    token_ids: Tuple[int, ...]
+    past_key_values: Tuple[Tuple[torch.Tensor, torch.Tensor], ...]
+    size_bytes: int
+    hits: int = 0
+
+def to_legacy_cache(past_key_values: Any) -> Tuple[Tuple[torch.Tensor, torch.Tensor], ...]:
+    """Normalize a model's past_key_values to the immutable legacy tuple format"""
+    if hasattr(past_key_values, "to_legacy_cache"):
+        return past_key_values.to_legacy_cache()
+    return tuple(tuple(layer) for layer in past_key_values)
+
+def legacy_cache_nbytes(legacy_cache: Tuple[Tuple[torch.Tensor, torch.Tensor], ...]) -> int:
+    """Memory held by a legacy key/value cache"""
+    return sum(t.numel() * t.element_size() for layer in legacy_cache for t in layer)
+
+class PrefixKVCache:
+    """
+    LRU cache of past_key_values for registered prompt prefixes
+
+    Agents register the fixed instruction preamble of their prompt
+    templates. When a prompt starts with the tokens of a registered prefix,
+    the prefix is prefilled once and its key/value states are reused by
+    every later generation, so only the request-specific tail is prefilled.
+    Entries are stored as tensors that generate() never mutates in place,
+    so one entry can seed any number of generations.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._prefixes: Dict[str, List[str]] = {}
+        self._prefix_tokens: Dict[Tuple[str, str], Tuple[int, ...]] = {}
+        self._entries: "OrderedDict[Tuple[str, Tuple[int, ...]], PrefixEntry]" = OrderedDict()
+        self._size_bytes = 0
+        # Lookups and stores happen on inference executor threads
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefill_tokens_saved = 0
+
+    def register(self, model_name: str, prefix_text: str) -> None:
+        """Register a fixed prompt preamble for a model"""
+        with self._lock:
+            prefixes = self._prefixes.setdefault(model_name, [])
+            if prefix_text not in prefixes:
+                prefixes.append(prefix_text)
+                logger.info(f"Registered {len(prefix_text)}-character prompt prefix for {model_name}")
+
+    def match(self, model_name: str, tokenizer: Any, input_ids: Sequence[int]) -> Optional[Tuple[int, ...]]:
+        """Find the longest registered prefix whose tokens start input_ids"""
+        with self._lock:
+            prefixes = list(self._prefixes.get(model_name, []))
+
+        best: Optional[Tuple[int, ...]] = None
+        for prefix_text in prefixes:
+            token_ids = self._tokenize_prefix(model_name, tokenizer, prefix_text)
+            # At least one token must remain for generate() to prefill
+            if len(token_ids) >= len(input_ids):
+                continue
+            if tuple(input_ids[:len(token_ids)]) != token_ids:
+                continue
+            if best is None or len(token_ids) > len(best):
+                best = token_ids
+        return best
+
+    def _tokenize_prefix(self, model_name: str, tokenizer: Any, prefix_text: str) -> Tuple[int, ...]:
+        """Tokenize a registered prefix once per model"""
+        key = (model_name, prefix_text)
+        token_ids = self._prefix_tokens.get(key)
+        if token_ids is None:
+            token_ids = tuple(tokenizer(prefix_text)["input_ids"])
+            self._prefix_tokens[key] = token_ids
+        return token_ids
+
+    def get_or_prefill(self, model_name: str, model: Any, token_ids: Tuple[int, ...]) -> PrefixEntry:
+        """Get cached states for a prefix, prefilling them on a miss"""
+        key = (model_name, token_ids)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                self.hits += 1
+                self.prefill_tokens_saved += len(token_ids)
+                return entry
+            self.misses += 1
+
+        input_ids = torch.tensor([token_ids], device=model.device)
+        with torch.no_grad():
+            outputs = model(input_ids=input_ids, use_cache=True)
+
+        legacy_cache = to_legacy_cache(outputs.past_key_values)
+        entry = PrefixEntry(
+            token_ids=token_ids,
+            past_key_values=legacy_cache,
+            size_bytes=legacy_cache_nbytes(legacy_cache)
+        )
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key: Tuple[str, Tuple[int, ...]], entry: PrefixEntry) -> None:
+        """Insert an entry, evicting least recently used ones over the byte budget"""
+        if entry.size_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self._size_bytes += entry.size_bytes
+
+            while self._size_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+                self.evictions += 1
+
+    @staticmethod
+    def as_past_key_values(entry: PrefixEntry) -> Any:
+        """Build a fresh cache object for one generate() call"""
+        if DynamicCache is not None and hasattr(DynamicCache, "from_legacy_cache"):
+            return DynamicCache.from_legacy_cache(entry.past_key_values)
+        return entry.past_key_values
+
+    def clear(self, model_name: Optional[str] = None) -> None:
+        """Drop cached states, e.g. after a model is unloaded or reloaded"""
+        with self._lock:
+            for key in [key for key in self._entries if model_name is None or key[0] == model_name]:
+                self._size_bytes -= self._entries.pop(key).size_bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefix cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "registered_prefixes": sum(len(p) for p in self._prefixes.values()),
+                "size_mb": round(self._size_bytes / (1024 * 1024), 2),
+                "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "prefill_tokens_saved": self.prefill_tokens_saved
+            }
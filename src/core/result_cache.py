@@ -0,0 +1,224 @@
+"""
+Result Cache for Telugu Story Engine
+Two-tier cache of seeded story generation results
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+def _json_default(value: Any) -> Any:
+    """Serialize pydantic models and other request values"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "dict"):
+        return value.dict()
+    return str(value)
+
+def result_key(params: Dict[str, Any], seed: int, model_revisions: Dict[str, str]) -> str:
+    """
+    Cache key of a seeded generation request
+
+    The prompt is NFC-normalized so visually identical Telugu prompts with
+    different code point orders share an entry; every other parameter is
+    part of the key as given.
+    """
+    params = dict(params)
+    if isinstance(params.get("prompt"), str):
+        params["prompt"] = unicodedata.normalize("NFC", params["prompt"])
+
+    payload = json.dumps(
+        {"params": params, "seed": seed, "models": model_revisions},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=_json_default
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    In-process LRU of generation results backed by a size-bounded disk tier
+
+    Entries expire ttl_seconds after they were stored, in both tiers. The
+    disk tier keeps one JSON file per key under disk_dir and evicts the
+    oldest files once it grows past max_disk_bytes. Results are stored
+    serialized, so callers always get an independent copy. get and put may
+    block on disk, so async callers run them in a worker thread; a lock
+    keeps concurrent calls consistent.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        disk_dir: Optional[Path] = None,
+        max_disk_bytes: int = 0
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # key -> (stored_at, size in bytes), oldest first
+        self._disk_index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir is not None:
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        """Index existing disk entries, dropping expired ones"""
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+
+        entries = []
+        for path in self.disk_dir.glob("*.json"):
+            stat = path.stat()
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for stored_at, key, size in sorted(entries):
+            self._disk_index[key] = (stored_at, size)
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a result in memory, then on disk"""
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, payload = entry
+            if not self._expired(stored_at):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(payload)
+            del self._memory[key]
+
+        payload = self._read_disk(key)
+        if payload is not None:
+            self._remember(key, self._disk_index[key][0], payload)
+            self.disk_hits += 1
+            return json.loads(payload)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result in both tiers"""
+        payload = json.dumps(result, ensure_ascii=False, default=_json_default)
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, payload)
+            self._write_disk(key, stored_at, payload)
+
+    def _remember(self, key: str, stored_at: float, payload: str) -> None:
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (stored_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Read an unexpired disk entry"""
+        if self.disk_dir is None or key not in self._disk_index:
+            return None
+
+        stored_at, _ = self._disk_index[key]
+        if self._expired(stored_at):
+            self._drop_disk(key)
+            return None
+
+        try:
+            return (self.disk_dir / f"{key}.json").read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Result cache read failed for {key}: {e}")
+            self._drop_disk(key)
+            return None
+
+    def _write_disk(self, key: str, stored_at: float, payload: str) -> None:
+        """Write a disk entry atomically and enforce the size bound"""
+        if self.disk_dir is None:
+            return
+
+        data = payload.encode("utf-8")
+        if len(data) > self.max_disk_bytes:
+            return
+
+        path = self.disk_dir / f"{key}.json"
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Result cache write failed for {key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        if key in self._disk_index:
+            self._disk_bytes -= self._disk_index.pop(key)[1]
+        self._disk_index[key] = (stored_at, len(data))
+        self._disk_bytes += len(data)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Remove the oldest disk entries until within the size bound"""
+        while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+            self._drop_disk(next(iter(self._disk_index)))
+
+    def _drop_disk(self, key: str) -> None:
+        _, size = self._disk_index.pop(key)
+        self._disk_bytes -= size
+        (self.disk_dir / f"{key}.json").unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get result cache statistics"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk_index),
+            "disk_size_mb": round(self._disk_bytes / (1024 * 1024), 2),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+        }
+
+# Global result cache instance
+_result_cache: Optional[ResultCache] = None
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the global result cache, or None when it is disabled"""
+    global _result_cache
+    config = get_config()
+    if _result_cache is None and config.result_cache_enabled:
+        _result_cache = ResultCache(
+            max_entries=config.result_cache_max_entries,
+            ttl_seconds=config.result_cache_ttl_seconds,
+            disk_dir=config.model.cache_dir / "results" if config.result_cache_disk_max_mb > 0 else None,
+            max_disk_bytes=int(config.result_cache_disk_max_mb * 1024 * 1024)
+        )
+    return _result_cache
@@ -0,0 +1,179 @@
+"""
+Request Scheduling for Telugu Story Engine
+Priority classes and shortest-job-first ordering of model inference slots
+"""
+
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Lower rank is served first. Interactive story requests outrank every
+# batch job; batch jobs choose among the remaining classes
+PRIORITY_CLASSES = {
+    "interactive": 0,
+    "high": 1,
+    "normal": 2,
+    "low": 3
+}
+DEFAULT_PRIORITY = "normal"
+
+# Prefill runs the whole prompt through one forward pass, so a prompt
+# character costs a small fraction of a sequential decode step
+PREFILL_COST_PER_CHAR = 0.05
+
+# Priority of the inference work started by the current task. asyncio
+# tasks copy the context they are created in, so agents fanning out with
+# gather() inherit their request's priority
+_current_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "inference_priority", default=DEFAULT_PRIORITY
+)
+
+def validate_priority(priority: str) -> str:
+    """Return priority if it names a known class"""
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority {priority}; expected one of {', '.join(PRIORITY_CLASSES)}")
+    return priority
+
+def get_priority() -> str:
+    """Priority class of the current task"""
+    return _current_priority.get()
+
+def set_priority(priority: str) -> None:
+    """Set the priority class for the rest of the current task"""
+    _current_priority.set(validate_priority(priority))
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[None]:
+    """Run a block of inference calls at the given priority class"""
+    token = _current_priority.set(validate_priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def estimate_generation_cost(prompts: Sequence[str], max_new_tokens: int) -> float:
+    """
+    Rough cost of a generate() call in decode steps
+
+    Rows of a batch decode in lockstep, so the decode part is paid once
+    per batch while prefill grows with the total prompt length.
+    """
+    return max_new_tokens + PREFILL_COST_PER_CHAR * sum(len(prompt) for prompt in prompts)
+
+def aged_rank(priority: str, waited: float, aging_seconds: float) -> int:
+    """Priority rank after promoting one class per aging_seconds waited"""
+    rank = PRIORITY_CLASSES.get(priority, PRIORITY_CLASSES[DEFAULT_PRIORITY])
+    if aging_seconds <= 0:
+        return rank
+    return max(0, rank - int(waited // aging_seconds))
+
+@dataclass
+class _Waiter:
+    """A caller waiting for an inference slot"""
+    priority: str
+    cost: float
+    enqueued_at: float
+    sequence: int
+    future: asyncio.Future
+
+class PriorityScheduler:
+    """
+    Hands out a fixed number of concurrent inference slots
+
+    Waiters are served by priority class, then shortest estimated job
+    first. Aging keeps long and low-priority jobs from starving: every
+    aging_seconds waited promotes a waiter by one class, and its cost
+    within the class is divided by 1 + waited / aging_seconds. Ties fall
+    back to arrival order.
+    """
+
+    def __init__(self, slots: int = 1, aging_seconds: float = 10.0):
+        self.slots = max(1, slots)
+        self.aging_seconds = aging_seconds
+
+        self._active = 0
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+
+        self._granted: Dict[str, int] = {}
+        self._wait_seconds: Dict[str, float] = {}
+        self._max_wait_seconds: Dict[str, float] = {}
+
+    async def acquire(self, priority: str = DEFAULT_PRIORITY, cost: float = 0.0) -> None:
+        """Wait for a slot; release() must be called once the work is done"""
+        if self._active < self.slots and not self._waiters:
+            self._active += 1
+            self._record_grant(priority, 0.0)
+            return
+
+        waiter = _Waiter(
+            priority=priority,
+            cost=max(0.0, cost),
+            enqueued_at=time.monotonic(),
+            sequence=next(self._sequence),
+            future=asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append(waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just before the caller was cancelled; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot and hand it to the best waiter"""
+        self._active -= 1
+        self._grant_waiting()
+
+    def _score(self, waiter: _Waiter, now: float) -> tuple:
+        waited = now - waiter.enqueued_at
+        aging = 1.0 + waited / self.aging_seconds if self.aging_seconds > 0 else 1.0
+        return (aged_rank(waiter.priority, waited, self.aging_seconds), waiter.cost / aging, waiter.sequence)
+
+    def _grant_waiting(self) -> None:
+        now = time.monotonic()
+        while self._active < self.slots and self._waiters:
+            waiter = min(self._waiters, key=lambda w: self._score(w, now))
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+            self._active += 1
+            self._record_grant(waiter.priority, now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _record_grant(self, priority: str, waited: float) -> None:
+        self._granted[priority] = self._granted.get(priority, 0) + 1
+        self._wait_seconds[priority] = self._wait_seconds.get(priority, 0.0) + waited
+        self._max_wait_seconds[priority] = max(self._max_wait_seconds.get(priority, 0.0), waited)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-class scheduling statistics"""
+        waiting: Dict[str, int] = {}
+        for waiter in self._waiters:
+            waiting[waiter.priority] = waiting.get(waiter.priority, 0) + 1
+
+        return {
+            "active": self._active,
+            "waiting": waiting,
+            "granted": dict(self._granted),
+            "average_wait_ms": {
+                priority: round(self._wait_seconds[priority] / count * 1000, 2)
+                for priority, count in self._granted.items()
+            },
+            "max_wait_ms": {
+                priority: round(seconds * 1000, 2)
+                for priority, seconds in self._max_wait_seconds.items()
+            }
+        }
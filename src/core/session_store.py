@@ -0,0 +1,246 @@
+"""
+Session Store for Telugu Story Engine
+Bounded, TTL-evicting storage for orchestrator sessions and API generation records
+"""
+
+import asyncio
+import json
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Records in these states no longer change and are stored compressed
+TERMINAL_STATUSES = ("completed", "failed", "cancelled", "timed_out")
+
+def _json_default(value: Any) -> Any:
+    """Serialize pydantic models, datetimes and other record values"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "dict"):
+        return value.dict()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+@dataclass
+class _Entry:
+    """A stored record: live while in progress, compressed once finished"""
+    updated_at: float
+    size: int
+    record: Optional[Dict[str, Any]] = None
+    payload: Optional[bytes] = None
+
+    @property
+    def live(self) -> bool:
+        return self.record is not None
+
+class SessionStore:
+    """
+    Bounded key-value store for per-request state
+
+    Records in progress are kept as live dicts and returned by reference
+    so callers can update them in place. Once update() gives a record a
+    terminal status it is serialized and zlib-compressed, and get() returns
+    a fresh copy. Finished records are evicted least recently updated
+    first when the store holds more than max_entries records or max_bytes
+    bytes, and finished records expire ttl_seconds after their last update.
+    A background task started with the first put() sweeps expired records.
+    Records in progress are never evicted to meet the bounds, since their
+    requests still use them; as a backstop against requests that died
+    without finishing them, they expire live_ttl_seconds after their last
+    update.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        live_ttl_seconds: float = 6 * 3600.0,
+        sweep_interval: float = 60.0
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.live_ttl_seconds = live_ttl_seconds
+        self.sweep_interval = sweep_interval
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.evictions: Dict[str, int] = {"ttl": 0, "stale": 0, "entries": 0, "bytes": 0}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """Store a new record, compressing it if it is already finished"""
+        self._ensure_sweeper()
+        self.remove(key)
+        entry = _Entry(updated_at=time.monotonic(), size=0, record=record)
+        self._entries[key] = entry
+        self._store(entry)
+        self._enforce_limits()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a record; finished records are returned as copies"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.live:
+            return entry.record
+        return json.loads(zlib.decompress(entry.payload))
+
+    def update(self, key: str, **fields) -> None:
+        """Update a record's fields; a terminal status compresses it"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        record = entry.record if entry.live else self.get(key)
+        record.update(fields)
+        entry.record = record
+        entry.payload = None
+        entry.updated_at = time.monotonic()
+        self._entries.move_to_end(key)
+        self._store(entry)
+        self._enforce_limits()
+
+    def remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over (key, record) pairs, oldest update first"""
+        for key in list(self._entries):
+            record = self.get(key)
+            if record is not None:
+                yield key, record
+
+    def live_items(self) -> Dict[str, Dict[str, Any]]:
+        """Records still in progress"""
+        return {key: entry.record for key, entry in self._entries.items() if entry.live}
+
+    def _store(self, entry: _Entry) -> None:
+        """Compress a finished record and account for its size"""
+        self._bytes -= entry.size
+        data = json.dumps(entry.record, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+        if entry.record.get("status") in TERMINAL_STATUSES:
+            entry.payload = zlib.compress(data, 1)
+            entry.record = None
+            entry.size = len(entry.payload)
+        else:
+            # Live records change in place; their size is as of the last update
+            entry.size = len(data)
+        self._bytes += entry.size
+
+    def _enforce_limits(self) -> None:
+        """Evict finished records, least recently updated first, until within bounds"""
+        if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+
+        for key in [key for key, entry in self._entries.items() if not entry.live]:
+            if len(self._entries) > self.max_entries:
+                reason = "entries"
+            elif self._bytes > self.max_bytes:
+                reason = "bytes"
+            else:
+                break
+            self.remove(key)
+            self.evictions[reason] += 1
+
+    def sweep(self, max_age_seconds: Optional[float] = None) -> int:
+        """
+        Evict finished records not updated for max_age_seconds (default
+        ttl_seconds) and records in progress not updated for live_ttl_seconds
+        """
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        now = time.monotonic()
+        cutoff = now - max_age
+        live_cutoff = now - max(max_age, self.live_ttl_seconds)
+
+        expired = [
+            key for key, entry in self._entries.items()
+            if not entry.live and entry.updated_at < cutoff
+        ]
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.live and entry.updated_at < live_cutoff
+        ]
+        for key in expired + stale:
+            self.remove(key)
+        self.evictions["ttl"] += len(expired)
+        self.evictions["stale"] += len(stale)
+
+        if stale:
+            logger.warning(f"Evicted {len(stale)} abandoned in-progress records from session store {self.name}")
+        if expired:
+            logger.info(f"Evicted {len(expired)} expired records from session store {self.name}")
+        return len(expired) + len(stale)
+
+    def _ensure_sweeper(self) -> None:
+        """Start the TTL sweep task once an event loop is running"""
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._sweeper = loop.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Session store {self.name} sweep failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session store statistics"""
+        live = sum(1 for entry in self._entries.values() if entry.live)
+        return {
+            "entries": len(self._entries),
+            "live_entries": live,
+            "compressed_entries": len(self._entries) - live,
+            "size_mb": round(self._bytes / (1024 * 1024), 3),
+            "max_entries": self.max_entries,
+            "max_mb": round(self.max_bytes / (1024 * 1024), 3),
+            "evictions": dict(self.evictions)
+        }
+
+# Global session stores by name
+_session_stores: Dict[str, SessionStore] = {}
+
+def get_session_store(name: str) -> SessionStore:
+    """Get the global session store with the given name"""
+    if name not in _session_stores:
+        config = get_config()
+        _session_stores[name] = SessionStore(
+            name,
+            max_entries=config.session_store_max_entries,
+            max_bytes=int(config.session_store_max_mb * 1024 * 1024),
+            ttl_seconds=config.session_store_ttl_seconds,
+            live_ttl_seconds=config.session_store_live_ttl_seconds,
+            sweep_interval=config.session_store_sweep_interval
+        )
+    return _session_stores[name]
+
+def get_session_stores() -> Dict[str, SessionStore]:
+    """All session stores created so far, by name"""
+    return dict(_session_stores)
@@ -0,0 +1,234 @@
+"""
+Model Snapshots for Telugu Story Engine
+Memory-mappable safetensors snapshots of loaded models for fast cold starts
+"""
+
+import json
+import logging
+import shutil
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import torch
+import transformers
+from transformers import (
+    AutoConfig, AutoTokenizer, AutoModel, AutoModelForCausalLM,
+    AutoModelForSequenceClassification
+)
+
+from .model_revision import resolve_source_revision
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Model classes rebuilt from a snapshot's config, by model type
+SNAPSHOT_MODEL_CLASSES = {
+    "text_understanding": AutoModel,
+    "text_generation": AutoModelForCausalLM,
+    "emotion_classification": AutoModelForSequenceClassification
+}
+
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool
+}
+
+def mmap_safetensors(path: Path) -> Dict[str, torch.Tensor]:
+    """
+    Open a safetensors file as tensors backed by a private file mapping
+
+    Pages are read on first touch and stay in the shared page cache, so
+    several worker processes mapping the same snapshot hold one copy of
+    the weights in RAM.
+    """
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+
+    data_start = 8 + header_size
+    storage = torch.UntypedStorage.from_file(str(path), shared=False, nbytes=path.stat().st_size)
+
+    tensors = {}
+    for name, info in header.items():
+        dtype = SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        element_size = torch.empty(0, dtype=dtype).element_size()
+        byte_offset = data_start + start
+        shape = tuple(info["shape"])
+
+        if byte_offset % element_size:
+            # Misaligned tensors cannot be viewed in place; copy just these
+            raw = torch.empty(0, dtype=torch.uint8).set_(storage, byte_offset, (end - start,))
+            tensors[name] = raw.clone().view(dtype).reshape(shape)
+            continue
+
+        tensor = torch.empty(0, dtype=dtype)
+        tensor.set_(storage, byte_offset // element_size, shape)
+        if tensor.numel() * element_size != end - start:
+            raise ValueError(f"Tensor {name} in {path} has inconsistent size")
+        tensors[name] = tensor
+    return tensors
+
+class SnapshotStore:
+    """
+    Snapshots of loaded models under cache_dir/snapshots/<model>/
+
+    A snapshot holds the model config, tokenizer and weights as a single
+    safetensors file, plus a manifest recording the source model path,
+    model type, storage precision, library versions and the revision of the
+    source weights. A snapshot is only used when its manifest matches the
+    current configuration and the source's current revision (hub commit or
+    local file times, resolved from source_cache_dir for cached hub models);
+    otherwise the model is loaded with from_pretrained and the snapshot is
+    rewritten.
+    """
+
+    def __init__(self, root: Path, source_cache_dir: Path):
+        self.root = root
+        self.source_cache_dir = source_cache_dir
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _manifest_for(self, model_type: str, model_path: str, precision: str) -> Dict[str, Any]:
+        """Fields a snapshot must match to be reused"""
+        return {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "model_type": model_type,
+            "model_path": str(model_path),
+            "precision": precision,
+            "torch_version": torch.__version__,
+            "transformers_version": transformers.__version__
+        }
+
+    def load(self, model_name: str, model_type: str, model_path: str, precision: str) -> Optional[Tuple[Any, Any, str]]:
+        """Map a matching snapshot, returning (model, tokenizer, revision) or None"""
+        directory = self.root / model_name
+        manifest_path = directory / "manifest.json"
+        if not manifest_path.exists():
+            return None
+
+        manifest = json.loads(manifest_path.read_text())
+        expected = self._manifest_for(model_type, model_path, precision)
+        stale = [key for key, value in expected.items() if manifest.get(key) != value]
+        if stale:
+            logger.info(f"Ignoring stale snapshot for {model_name} ({', '.join(stale)} changed)")
+            return None
+
+        # The source may have been updated in place since the snapshot was taken
+        source_revision = resolve_source_revision(model_path, self.source_cache_dir)
+        if source_revision is None or source_revision != manifest.get("revision"):
+            logger.info(
+                f"Ignoring stale snapshot for {model_name} "
+                f"(source revision {source_revision or 'unknown'}, snapshot {manifest.get('revision')})"
+            )
+            return None
+
+        try:
+            tokenizer = AutoTokenizer.from_pretrained(directory / "tokenizer")
+
+            if model_type == "cultural_adaptation":
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(str(directory / "model"), device="cpu")
+            else:
+                model = self._map_model(directory, model_type, precision)
+        except Exception as e:
+            logger.warning(f"Failed to load snapshot for {model_name}, falling back to from_pretrained: {e}")
+            return None
+
+        logger.info(f"Mapped snapshot for {model_name} from {directory}")
+        return model, tokenizer, source_revision
+
+    def _map_model(self, directory: Path, model_type: str, precision: str) -> Any:
+        """Rebuild a transformers model around memory-mapped weights"""
+        from transformers.modeling_utils import no_init_weights
+
+        config = AutoConfig.from_pretrained(directory / "model")
+        dtype = torch.bfloat16 if precision == "bf16" else torch.float32
+
+        # Skip random initialization; every persistent tensor is replaced below
+        with no_init_weights():
+            model = SNAPSHOT_MODEL_CLASSES[model_type].from_config(config, torch_dtype=dtype)
+
+        state_dict = mmap_safetensors(directory / "model" / "model.safetensors")
+        # assign=True keeps the mapped tensors instead of copying into fresh
+        # parameters; tied weights were deduplicated on save and are re-tied
+        missing, unexpected = model.load_state_dict(state_dict, strict=False, assign=True)
+        model.tie_weights()
+
+        if unexpected:
+            raise ValueError(f"unexpected tensors in snapshot: {unexpected[:5]}")
+        untied = [name for name in missing if not self._is_tied(model, name)]
+        if untied:
+            raise ValueError(f"snapshot is missing tensors: {untied[:5]}")
+
+        model.eval()
+        return model
+
+    @staticmethod
+    def _is_tied(model: Any, name: str) -> bool:
+        """Whether a state dict entry shares storage with another entry"""
+        state = model.state_dict()
+        tensor = state.get(name)
+        if tensor is None:
+            return False
+        return any(
+            other_name != name and other.data_ptr() == tensor.data_ptr()
+            for other_name, other in state.items()
+        )
+
+    def save(
+        self,
+        model_name: str,
+        model_type: str,
+        model_path: str,
+        precision: str,
+        revision: str,
+        model: Any,
+        tokenizer: Any
+    ) -> None:
+        """Write a snapshot of a freshly loaded model"""
+        directory = self.root / model_name
+        tmp_directory = self.root / f".{model_name}.tmp"
+        if tmp_directory.exists():
+            shutil.rmtree(tmp_directory)
+
+        try:
+            tokenizer.save_pretrained(tmp_directory / "tokenizer")
+
+            if model_type == "cultural_adaptation":
+                model.save(str(tmp_directory / "model"))
+            else:
+                from safetensors.torch import save_model
+                (tmp_directory / "model").mkdir(parents=True)
+                model.config.save_pretrained(tmp_directory / "model")
+                # save_model drops duplicate tied tensors that save_file rejects
+                save_model(model, str(tmp_directory / "model" / "model.safetensors"))
+
+            manifest = {
+                **self._manifest_for(model_type, model_path, precision),
+                "model_name": model_name,
+                "revision": revision,
+                "created_at": datetime.now().isoformat()
+            }
+            (tmp_directory / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+            # Swap in the complete snapshot so readers never see a partial one
+            if directory.exists():
+                shutil.rmtree(directory)
+            tmp_directory.rename(directory)
+            logger.info(f"Saved snapshot for {model_name} to {directory}")
+
+        except Exception as e:
+            logger.warning(f"Failed to save snapshot for {model_name}: {e}")
+            shutil.rmtree(tmp_directory, ignore_errors=True)
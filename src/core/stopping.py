@@ -0,0 +1,177 @@
+"""
+Early Stopping for Telugu Story Engine
+Stopping criteria that end generation before the token budget is spent
+"""
+
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from transformers import StoppingCriteria
+
+logger = logging.getLogger(__name__)
+
+# Text ending a Telugu or English sentence: Latin punctuation or Devanagari
+# dandas, optionally followed by closing quotes or brackets
+SENTENCE_END = re.compile(r"[.!?।॥][\"'”’)\]]*\s*$")
+
+# Tokens decoded to look for a sentence end; byte-level BPE can split a
+# danda across tokens
+SENTENCE_END_WINDOW = 4
+
+class EarlyStoppingCriteria(StoppingCriteria, ABC):
+    """
+    Base class for criteria that stop individual rows of a batch
+
+    Records, per row, how many new tokens had been generated when the
+    criterion first fired so the manager can attribute saved tokens.
+    Rows that already ended with a pad or EOS token are not checked.
+
+    Returning a per-row BoolTensor requires transformers>=4.39; older
+    versions reduce the result with any() and fail on batches.
+    """
+
+    reason = "early_stop"
+
+    def __init__(self, prompt_length: int, pad_token_ids: Tuple[int, ...]):
+        self.prompt_length = prompt_length
+        self.pad_token_ids = torch.tensor([i for i in pad_token_ids if i is not None], dtype=torch.long)
+        self.stopped_at: Dict[int, int] = {}
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        done = torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+        active = ~torch.isin(input_ids[:, -1], self.pad_token_ids.to(input_ids.device))
+
+        generated = input_ids.shape[1] - self.prompt_length
+        for row in active.nonzero().flatten().tolist():
+            if row in self.stopped_at or self.should_stop(row, input_ids[row, self.prompt_length:]):
+                self.stopped_at.setdefault(row, generated)
+                done[row] = True
+        return done
+
+    @abstractmethod
+    def should_stop(self, row: int, generated_ids: torch.LongTensor) -> bool:
+        """Whether a still-active row should stop now"""
+
+class RepetitionStoppingCriteria(EarlyStoppingCriteria):
+    """Stops a row once its latest n-gram has occurred max_repeats times"""
+
+    reason = "repetition"
+
+    def __init__(self, prompt_length: int, pad_token_ids: Tuple[int, ...], ngram_size: int = 4, max_repeats: int = 3):
+        super().__init__(prompt_length, pad_token_ids)
+        self.ngram_size = max(1, ngram_size)
+        self.max_repeats = max(2, max_repeats)
+
+    def should_stop(self, row: int, generated_ids: torch.LongTensor) -> bool:
+        if generated_ids.numel() < self.ngram_size * self.max_repeats:
+            return False
+
+        ngrams = generated_ids.unfold(0, self.ngram_size, 1)
+        occurrences = int((ngrams == ngrams[-1]).all(dim=1).sum())
+        return occurrences >= self.max_repeats
+
+class SentenceBoundaryStoppingCriteria(EarlyStoppingCriteria):
+    """
+    Stops a row at the first sentence end after min_new_tokens
+
+    Near the end of the budget a finished sentence is a better place to
+    stop than the partial one post-processing would cut off anyway.
+    """
+
+    reason = "sentence_boundary"
+
+    def __init__(self, prompt_length: int, pad_token_ids: Tuple[int, ...], tokenizer: Any, min_new_tokens: int):
+        super().__init__(prompt_length, pad_token_ids)
+        self.tokenizer = tokenizer
+        self.min_new_tokens = min_new_tokens
+
+    def should_stop(self, row: int, generated_ids: torch.LongTensor) -> bool:
+        if generated_ids.numel() < self.min_new_tokens:
+            return False
+
+        tail = self.tokenizer.decode(generated_ids[-SENTENCE_END_WINDOW:], skip_special_tokens=True)
+        return bool(SENTENCE_END.search(tail))
+
+class DeadlineStoppingCriteria(EarlyStoppingCriteria):
+    """Stops every row once a time.monotonic() deadline has passed"""
+
+    reason = "deadline"
+
+    def __init__(self, prompt_length: int, pad_token_ids: Tuple[int, ...], deadline: float):
+        super().__init__(prompt_length, pad_token_ids)
+        self.deadline = deadline
+
+    def should_stop(self, row: int, generated_ids: torch.LongTensor) -> bool:
+        return time.monotonic() >= self.deadline
+
+class CancellationStoppingCriteria(EarlyStoppingCriteria):
+    """Stops each row as soon as its request's cancellation token is set"""
+
+    reason = "cancelled"
+
+    def __init__(self, prompt_length: int, pad_token_ids: Tuple[int, ...], cancel_tokens: List[Optional[Any]]):
+        super().__init__(prompt_length, pad_token_ids)
+        self.cancel_tokens = cancel_tokens
+
+    def should_stop(self, row: int, generated_ids: torch.LongTensor) -> bool:
+        token = self.cancel_tokens[row] if row < len(self.cancel_tokens) else None
+        return token is not None and token.cancelled
+
+def build_stopping_criteria(
+    tokenizer: Any,
+    prompt_length: int,
+    max_new_tokens: int,
+    timeout: Optional[float] = None,
+    cancel_tokens: Optional[List[Optional[Any]]] = None,
+    quality_stops: bool = True,
+    repetition_ngram_size: int = 4,
+    repetition_max_repeats: int = 3,
+    sentence_budget_fraction: Optional[float] = 0.85
+) -> List[EarlyStoppingCriteria]:
+    """
+    Criteria for one generate() call
+
+    Cancellation comes first so a cancelled row is always attributed to it.
+    quality_stops=False keeps only cancellation and the deadline; a
+    fraction or timeout of None disables that criterion.
+    """
+    pad_token_ids = (tokenizer.pad_token_id, tokenizer.eos_token_id)
+
+    criteria: List[EarlyStoppingCriteria] = []
+    if cancel_tokens and any(token is not None for token in cancel_tokens):
+        criteria.append(CancellationStoppingCriteria(prompt_length, pad_token_ids, cancel_tokens))
+    if quality_stops:
+        criteria.append(RepetitionStoppingCriteria(
+            prompt_length, pad_token_ids, repetition_ngram_size, repetition_max_repeats
+        ))
+    if quality_stops and sentence_budget_fraction is not None:
+        criteria.append(SentenceBoundaryStoppingCriteria(
+            prompt_length, pad_token_ids, tokenizer, int(max_new_tokens * sentence_budget_fraction)
+        ))
+    if timeout is not None:
+        criteria.append(DeadlineStoppingCriteria(prompt_length, pad_token_ids, time.monotonic() + timeout))
+    return criteria
+
+def summarize_early_stops(criteria: List[EarlyStoppingCriteria], max_new_tokens: int) -> Tuple[Dict[str, int], int]:
+    """
+    Count early-stopped rows by reason and the decode tokens they saved
+
+    A row stopped by several criteria is attributed to the first one in
+    list order.
+    """
+    stops: Dict[str, int] = {}
+    tokens_saved = 0
+    seen = set()
+
+    for criterion in criteria:
+        for row, stopped_at in criterion.stopped_at.items():
+            if row in seen:
+                continue
+            seen.add(row)
+            stops[criterion.reason] = stops.get(criterion.reason, 0) + 1
+            tokens_saved += max(0, max_new_tokens - stopped_at)
+    return stops, tokens_saved
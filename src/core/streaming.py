@@ -0,0 +1,123 @@
+"""
+Token Streaming for Telugu Story Engine
+Incremental decoding that never splits a Telugu grapheme cluster
+"""
+
+import asyncio
+import logging
+import unicodedata
+from typing import Any, Optional
+
+from transformers.generation.streamers import BaseStreamer
+
+logger = logging.getLogger(__name__)
+
+# Telugu virama joins the next consonant into a conjunct, and ZWJ/ZWNJ
+# change how the neighbouring consonants render
+VIRAMA = "\u0c4d"
+JOINERS = {"\u200c", "\u200d"}
+
+# Byte-level BPE can end on part of a multi-byte UTF-8 sequence
+REPLACEMENT_CHARACTER = "\ufffd"
+
+def is_grapheme_extender(char: str) -> bool:
+    """Whether a character attaches to the preceding character"""
+    return unicodedata.category(char).startswith("M") or char in JOINERS
+
+def stable_prefix_length(text: str) -> int:
+    """
+    Length of the prefix of decoded text that can be emitted safely
+
+    The last grapheme cluster is held back because the next token may still
+    add a vowel sign, virama or conjunct consonant to it. Trailing
+    replacement characters from incomplete UTF-8 byte sequences are never
+    emitted.
+    """
+    end = len(text)
+    while end > 0 and text[end - 1] == REPLACEMENT_CHARACTER:
+        end -= 1
+
+    # Whitespace never combines with what follows it
+    if end > 0 and text[end - 1].isspace():
+        return end
+
+    # Walk back to the start of the last grapheme cluster
+    index = end
+    while index > 0:
+        index -= 1
+        char = text[index]
+        if is_grapheme_extender(char):
+            continue
+        if index > 0 and (text[index - 1] == VIRAMA or text[index - 1] in JOINERS):
+            continue
+        return index
+    return 0
+
+class TeluguTextStreamer(BaseStreamer):
+    """
+    Streamer for model.generate that forwards decoded text to an asyncio queue
+
+    generate() calls put()/end() from the inference executor thread, so
+    chunks are handed to the event loop with call_soon_threadsafe. A None
+    item marks the end of the stream.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Any,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        skip_prompt: bool = True
+    ):
+        self.tokenizer = tokenizer
+        self.loop = loop
+        self.queue = queue
+        self.skip_prompt = skip_prompt
+
+        self._next_tokens_are_prompt = True
+        self._token_cache = []
+        self._emitted = 0
+        self.tokens_streamed = 0
+
+    def put(self, value) -> None:
+        """Receive new token ids from generate()"""
+        if len(value.shape) > 1:
+            if value.shape[0] > 1:
+                raise ValueError("TeluguTextStreamer only supports batch size 1")
+            value = value[0]
+
+        if self.skip_prompt and self._next_tokens_are_prompt:
+            self._next_tokens_are_prompt = False
+            return
+
+        self._token_cache.extend(value.tolist())
+        self.tokens_streamed += len(value)
+
+        text = self.tokenizer.decode(self._token_cache, skip_special_tokens=True)
+        boundary = stable_prefix_length(text)
+
+        if boundary > self._emitted:
+            self._emit(text[self._emitted:boundary])
+            self._emitted = boundary
+
+        # Decoding restarts after each line break to keep per-token cost flat
+        if self._emitted == len(text) and text.endswith("\n"):
+            self._token_cache = []
+            self._emitted = 0
+
+    def end(self) -> None:
+        """Flush the held-back tail and close the stream"""
+        if self._token_cache:
+            text = self.tokenizer.decode(self._token_cache, skip_special_tokens=True)
+            if len(text) > self._emitted:
+                self._emit(text[self._emitted:])
+
+        self._token_cache = []
+        self._emitted = 0
+        self._next_tokens_are_prompt = True
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+    def _emit(self, chunk: str) -> None:
+        """Hand a text chunk to the event loop"""
+        if chunk:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, chunk)